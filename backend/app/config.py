@@ -2,14 +2,23 @@
 Application configuration using Pydantic settings.
 """
 
-from typing import List, Optional
-from pydantic import Field, validator
-from pydantic_settings import BaseSettings
+import json
+from dataclasses import make_dataclass
+from functools import lru_cache
+from typing import Any, List, Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings."""
     
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        extra="ignore",
+        case_sensitive=False,
+    )
+    
     # Database
     database_url: str = Field(..., env="DATABASE_URL")
     postgres_host: str = Field(default="localhost", env="POSTGRES_HOST")
@@ -17,9 +26,18 @@ class Settings(BaseSettings):
     postgres_db: str = Field(default="climate_risk", env="POSTGRES_DB")
     postgres_user: str = Field(default="postgres", env="POSTGRES_USER")
     postgres_password: str = Field(default="postgres", env="POSTGRES_PASSWORD")
+    db_pool_size: int = Field(default=20, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=40, env="DB_MAX_OVERFLOW")
+    db_pool_recycle_seconds: int = Field(default=1800, env="DB_POOL_RECYCLE_SECONDS")
+    db_pool_pre_ping: bool = Field(default=False, env="DB_POOL_PRE_PING")
+    db_prepared_statement_cache_size: int = Field(default=512, env="DB_PREPARED_STATEMENT_CACHE_SIZE")
+    db_query_log_detect_n1: bool = Field(default=False, env="DB_QUERY_LOG_DETECT_N1")
+    db_query_log_n1_threshold: int = Field(default=3, env="DB_QUERY_LOG_N1_THRESHOLD")
     
     # Redis
     redis_url: str = Field(..., env="REDIS_URL")
+    redis_max_connections: int = Field(default=64, env="REDIS_MAX_CONNECTIONS")
+    redis_pool_timeout_seconds: int = Field(default=5, env="REDIS_POOL_TIMEOUT_SECONDS")
     celery_broker_url: str = Field(..., env="CELERY_BROKER_URL")
     celery_result_backend: str = Field(..., env="CELERY_RESULT_BACKEND")
     
@@ -48,14 +66,18 @@ class Settings(BaseSettings):
     jwt_secret: str = Field(..., env="JWT_SECRET")
     jwt_algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
     jwt_access_token_expire_minutes: int = Field(default=30, env="JWT_ACCESS_TOKEN_EXPIRE_MINUTES")
+    # Per-process verified-token cache; bounds how long other workers and
+    # services' user changes (deactivation, role) can go unnoticed
+    auth_token_cache_ttl_seconds: int = Field(default=5, env="AUTH_TOKEN_CACHE_TTL_SECONDS")
     
     # CORS
-    cors_origins: List[str] = Field(default=["http://localhost:3000"], env="CORS_ORIGINS")
+    cors_origins: str = Field(default="http://localhost:3000", env="CORS_ORIGINS")
     
     # Application
     debug: bool = Field(default=False, env="DEBUG")
     demo_mode: bool = Field(default=True, env="DEMO_MODE")
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    api_workers: int = Field(default=0, env="API_WORKERS")  # 0 = one per CPU core
     
     # Feature Flags
     enable_a_b_testing: bool = Field(default=True, env="ENABLE_A_B_TESTING")
@@ -84,7 +106,7 @@ class Settings(BaseSettings):
     
     # Model Configuration
     model_cache_ttl_seconds: int = Field(default=3600, env="MODEL_CACHE_TTL_SECONDS")
-    prediction_cache_ttl_seconds: int = Field(default=900, env="PREDICTION_CACHE_TTL_SECONDS")
+    prediction_cache_ttl_seconds: int = Field(default=3600, env="PREDICTION_CACHE_TTL_SECONDS")
     tile_cache_ttl_seconds: int = Field(default=1800, env="TILE_CACHE_TTL_SECONDS")
     
     # Grid Configuration
@@ -92,25 +114,75 @@ class Settings(BaseSettings):
     grid_epsg: int = Field(default=4326, env="GRID_EPSG")
     prediction_horizon_hours: int = Field(default=72, env="PREDICTION_HORIZON_HOURS")
     
+    # Hazard Partitions
+    hazard_retention_days: int = Field(default=30, env="HAZARD_RETENTION_DAYS")
+    hazard_partition_premake_days: int = Field(default=3, env="HAZARD_PARTITION_PREMAKE_DAYS")
+    
     # Alert Thresholds
     flood_risk_threshold: float = Field(default=0.3, env="FLOOD_RISK_THRESHOLD")
     heat_risk_threshold: float = Field(default=0.4, env="HEAT_RISK_THRESHOLD")
     smoke_risk_threshold: float = Field(default=0.5, env="SMOKE_RISK_THRESHOLD")
     pm25_risk_threshold: float = Field(default=0.6, env="PM25_RISK_THRESHOLD")
     
-    @validator("cors_origins", pre=True)
-    def parse_cors_origins(cls, v):
-        if isinstance(v, str):
-            import json
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [v]
-        return v
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    def get_cors_origins_list(self) -> List[str]:
+        """
+        Get the configured CORS origins as a list.
+        
+        Returns:
+            List of allowed origins
+        """
+        return list(_parse_cors_origins(self.cors_origins))
+
+
+@lru_cache(maxsize=8)
+def _parse_cors_origins(value: str) -> tuple:
+    """
+    Parse a CORS_ORIGINS value given as a JSON list or comma-separated string.
+    
+    Args:
+        value: Raw CORS_ORIGINS value
+        
+    Returns:
+        Tuple of origins
+    """
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        parsed = value.split(",")
+    if isinstance(parsed, str):
+        parsed = [parsed]
+    return tuple(s.strip() for s in parsed if s.strip())
+
+
+# Immutable, slotted snapshot of Settings used at runtime. Pydantic is only
+# needed for the initial environment parse; afterwards attribute access is a
+# plain slot load.
+FrozenSettings = make_dataclass(
+    "FrozenSettings",
+    [(name, field.annotation) for name, field in Settings.model_fields.items()],
+    namespace={"get_cors_origins_list": Settings.get_cors_origins_list},
+    frozen=True,
+    slots=True,
+)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> "FrozenSettings":
+    """
+    Get the validated application settings.
+    
+    Settings are parsed and validated once per process, then frozen;
+    subsequent calls return the cached snapshot.
+    
+    Returns:
+        Application settings
+    """
+    return FrozenSettings(**Settings().model_dump())
 
 
-settings = Settings()
+def __getattr__(name: str) -> Any:
+    # Keep `from app.config import settings` working without validating
+    # the environment at import time.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
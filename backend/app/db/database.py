@@ -2,15 +2,33 @@
 Database connection and session management.
 """
 
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from app.config import settings
+from app.config import get_settings
+
+settings = get_settings()
 
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    future=True
+    future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    connect_args={
+        # Short OLTP queries never benefit from JIT compilation
+        "server_settings": {"jit": "off"},
+        # SQLAlchemy-level prepared statement cache; asyncpg's own cache is
+        # disabled so the two do not hold duplicate plans per connection
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        "statement_cache_size": 0,
+    },
 )
 
 # Create async session factory
@@ -21,15 +39,83 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def get_db() -> AsyncSession:
+# SQL issued during the current request, when N+1 detection is enabled
+_query_log: ContextVar[Optional[List[str]]] = ContextVar("query_log", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _log_query(conn, cursor, statement, parameters, context, executemany):
+    log = _query_log.get()
+    if log is not None:
+        log.append(statement)
+
+
+def start_query_log() -> Token:
+    """
+    Start recording SQL statements for the current request.
+    
+    Returns:
+        Token to pass to stop_query_log
+    """
+    return _query_log.set([])
+
+
+def stop_query_log(token: Token, threshold: int) -> Dict[str, int]:
+    """
+    Stop recording and report statements repeated within the request.
+    
+    Statements are compared by their parameterized SQL text, so the same
+    query issued with different bind values counts as a repeat.
+    
+    Args:
+        token: Token returned by start_query_log
+        threshold: Minimum number of executions to report
+        
+    Returns:
+        Dict mapping repeated statements to their execution counts
+    """
+    log = _query_log.get() or []
+    _query_log.reset(token)
+    return {
+        statement: count for statement, count in Counter(log).items()
+        if count >= threshold
+    }
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
     Get database session.
     
     Yields:
         Database session
     """
+    # The context manager closes the session when the request finishes
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
+
+
+async def copy_records_to_table(
+    session: AsyncSession,
+    table_name: str,
+    records: Iterable[Sequence[Any]],
+    columns: Sequence[str],
+    schema_name: Optional[str] = None,
+) -> None:
+    """
+    Bulk load rows with PostgreSQL COPY through the session's asyncpg connection.
+    
+    Args:
+        session: Database session
+        table_name: Target table name
+        records: Row tuples in column order
+        columns: Column names
+        schema_name: Optional schema name
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table_name,
+        records=records,
+        columns=list(columns),
+        schema_name=schema_name,
+    )
@@ -4,12 +4,14 @@ Database models for Climate Risk Lens.
 
 import uuid
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import Column, String, Float, Integer, DateTime, Boolean, Text, JSON, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID
+from typing import Any, Dict, Optional, List
+from sqlalchemy import Column, String, Float, Integer, BigInteger, DateTime, Boolean, Text, ForeignKey, Index, insert, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geometry
+from app.utils.ids import uuid7
 
 Base = declarative_base()
 
@@ -30,8 +32,8 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    organization = relationship("Organization", back_populates="users")
-    feedback = relationship("Feedback", back_populates="user")
+    organization = relationship("Organization", back_populates="users", lazy="raise_on_sql")
+    feedback = relationship("Feedback", back_populates="user", lazy="raise_on_sql")
 
 
 class Organization(Base):
@@ -47,9 +49,9 @@ class Organization(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    users = relationship("User", back_populates="organization")
-    sites = relationship("Site", back_populates="organization")
-    alerts = relationship("Alert", back_populates="organization")
+    users = relationship("User", back_populates="organization", lazy="raise_on_sql")
+    sites = relationship("Site", back_populates="organization", lazy="raise_on_sql")
+    alerts = relationship("Alert", back_populates="organization", lazy="raise_on_sql")
 
 
 class Site(Base):
@@ -61,14 +63,14 @@ class Site(Base):
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
     name = Column(String(255), nullable=False)
     geom = Column(Geometry("POINT", srid=4326), nullable=False)
-    metadata = Column(JSON, nullable=True)
+    meta = Column("metadata", JSONB, nullable=True)  # "metadata" is reserved on declarative models
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    organization = relationship("Organization", back_populates="sites")
-    alerts = relationship("Alert", back_populates="site")
+    organization = relationship("Organization", back_populates="sites", lazy="raise_on_sql")
+    alerts = relationship("Alert", back_populates="site", lazy="raise_on_sql")
     
     # Indexes
     __table_args__ = (
@@ -82,11 +84,13 @@ class HazardPrediction(Base):
     
     __tablename__ = "hazards"
     
-    hazard_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Partitioned tables need the partition key in the primary key.
+    # UUIDv7 keys sort by creation time, so hazard_id also tracks issue order.
+    hazard_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     type = Column(String(50), nullable=False)  # flood, heat, smoke, pm25
-    issued_at = Column(DateTime, nullable=False, index=True)
+    issued_at = Column(DateTime, primary_key=True, nullable=False)
     horizon_minutes = Column(Integer, nullable=False)  # Prediction horizon in minutes
-    grid_id = Column(String(50), nullable=False, index=True)
+    grid_id = Column(BigInteger, nullable=False)  # Packed lat/lon grid indices
     p_risk = Column(Float, nullable=False)  # Risk probability
     q10 = Column(Float, nullable=True)  # 10th percentile
     q50 = Column(Float, nullable=True)  # 50th percentile (median)
@@ -97,10 +101,52 @@ class HazardPrediction(Base):
     
     # Indexes
     __table_args__ = (
-        Index("idx_hazards_type_issued", "type", "issued_at"),
-        Index("idx_hazards_grid_id", "grid_id"),
-        Index("idx_hazards_type_grid_issued", "type", "grid_id", "issued_at"),
+        # issued_at is append-ordered, so BRIN covers time-range scans at a fraction of B-tree size
+        Index("idx_hazards_issued_brin", "issued_at", postgresql_using="brin"),
+        # Latest-per-type lookups for a grid cell (DISTINCT ON type) stay
+        # index-only; the grid_id prefix also serves plain grid filters
+        Index(
+            "idx_hazards_grid_type_issued_cov", "grid_id", "type", text("issued_at DESC"),
+            postgresql_include=["horizon_minutes", "p_risk", "q10", "q50", "q90", "model_version"],
+        ),
+        # Daily range partitions, see app.db.partitions
+        {"postgresql_partition_by": "RANGE (issued_at)"},
     )
+    
+    # Batches at least this large are loaded with COPY instead of executemany
+    COPY_THRESHOLD = 1000
+    
+    @classmethod
+    async def bulk_insert(cls, session: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many predictions in one round-trip.
+        
+        Args:
+            session: Database session
+            rows: Prediction dicts keyed by column name
+            
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        
+        if len(rows) < cls.COPY_THRESHOLD:
+            # Single executemany; Python-side defaults are applied per row
+            await session.execute(insert(cls), rows)
+            return len(rows)
+        
+        from app.db.database import copy_records_to_table
+        
+        columns = [c.name for c in cls.__table__.columns]
+        now = datetime.utcnow()
+        records = []
+        for row in rows:
+            # COPY bypasses column defaults, so fill them in here
+            row = {"hazard_id": uuid7(), "created_at": now, **row}
+            records.append(tuple(row.get(name) for name in columns))
+        await copy_records_to_table(session, cls.__tablename__, records, columns)
+        return len(records)
 
 
 class Alert(Base):
@@ -108,7 +154,7 @@ class Alert(Base):
     
     __tablename__ = "alerts"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
     site_id = Column(UUID(as_uuid=True), ForeignKey("sites.id"), nullable=True)
     hazard_type = Column(String(50), nullable=False)
@@ -121,8 +167,8 @@ class Alert(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    organization = relationship("Organization", back_populates="alerts")
-    site = relationship("Site", back_populates="alerts")
+    organization = relationship("Organization", back_populates="alerts", lazy="raise_on_sql")
+    site = relationship("Site", back_populates="alerts", lazy="raise_on_sql")
     
     # Indexes
     __table_args__ = (
@@ -137,11 +183,11 @@ class Telemetry(Base):
     
     __tablename__ = "telemetry"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     source = Column(String(100), nullable=False, index=True)
     ts = Column(DateTime, nullable=False, index=True)
     geom = Column(Geometry("POINT", srid=4326), nullable=True)
-    payload_json = Column(JSON, nullable=True)
+    payload_json = Column(JSONB, nullable=True)
     data_latency_ms = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -149,6 +195,7 @@ class Telemetry(Base):
     __table_args__ = (
         Index("idx_telemetry_source_ts", "source", "ts"),
         Index("idx_telemetry_geom", "geom", postgresql_using="gist"),
+        Index("idx_telemetry_payload_gin", "payload_json", postgresql_using="gin"),
     )
 
 
@@ -162,7 +209,7 @@ class Experiment(Base):
     variant = Column(String(50), nullable=False)  # A, B, control
     start_at = Column(DateTime, nullable=False)
     stop_at = Column(DateTime, nullable=True)
-    config_json = Column(JSON, nullable=True)
+    config_json = Column(JSONB, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -180,20 +227,26 @@ class Feedback(Base):
     __tablename__ = "feedback"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    hazard_id = Column(UUID(as_uuid=True), ForeignKey("hazards.hazard_id"), nullable=False)
+    # No FK: hazard_id alone is not unique across hazards partitions
+    hazard_id = Column(UUID(as_uuid=True), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     label = Column(String(10), nullable=False)  # TP, FP, FN, TN
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    hazard = relationship("HazardPrediction")
-    user = relationship("User", back_populates="feedback")
+    hazard = relationship(
+        "HazardPrediction",
+        primaryjoin="foreign(Feedback.hazard_id) == HazardPrediction.hazard_id",
+        lazy="raise_on_sql",
+    )
+    user = relationship("User", back_populates="feedback", lazy="raise_on_sql")
     
     # Indexes
     __table_args__ = (
         Index("idx_feedback_hazard_id", "hazard_id"),
-        Index("idx_feedback_user_id", "user_id"),
+        # Keyset pagination of a user's feedback, newest first
+        Index("idx_feedback_user_created", "user_id", text("created_at DESC"), text("id DESC")),
         Index("idx_feedback_label", "label"),
     )
 
@@ -0,0 +1,119 @@
+"""
+Daily range partition maintenance for the hazards table.
+
+The DEFAULT partition is kept as a catch-all for rows whose issued_at falls
+outside the provisioned days (late or early data). Retention deletes expired
+rows from it along with dropping expired daily partitions, and provisioning a
+day moves that day's rows out of it first, since Postgres refuses to add a
+partition whose range still has rows in DEFAULT.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARENT_TABLE = "hazards"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+
+def hazard_partition_name(day: date) -> str:
+    """
+    Get the partition table name for a day.
+    
+    Args:
+        day: Partition day
+        
+    Returns:
+        Partition table name
+    """
+    return f"{PARENT_TABLE}_{day:%Y%m%d}"
+
+
+async def ensure_hazard_partitions(session: AsyncSession, start: date, days: int) -> List[str]:
+    """
+    Create daily hazards partitions for [start, start + days) if missing.
+    
+    Args:
+        session: Database session
+        start: First partition day
+        days: Number of daily partitions to provision
+        
+    Returns:
+        List of partition names provisioned
+    """
+    await session.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"
+    ))
+    
+    names = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        name = hazard_partition_name(day)
+        names.append(name)
+        
+        exists = await session.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+        if exists:
+            continue
+        
+        # Build the day as a standalone table, move in any of its rows that
+        # landed in DEFAULT, then attach it (indexes are created on attach)
+        lower, upper = day.isoformat(), (day + timedelta(days=1)).isoformat()
+        await session.execute(text(
+            f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await session.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE issued_at >= '{lower}' AND issued_at < '{upper}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ))
+        await session.execute(text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+    
+    await session.commit()
+    return names
+
+
+async def drop_hazard_partitions_before(session: AsyncSession, cutoff: date) -> List[str]:
+    """
+    Detach and drop daily hazards partitions that end on or before cutoff.
+    
+    Rows older than cutoff are also deleted from the DEFAULT partition,
+    which is never dropped itself.
+    
+    Args:
+        session: Database session
+        cutoff: First day to keep
+        
+    Returns:
+        List of partition names dropped
+    """
+    result = await session.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": PARENT_TABLE})
+    
+    partitions = sorted(result.scalars())
+    dropped = []
+    for name in partitions:
+        try:
+            day = datetime.strptime(name[len(PARENT_TABLE) + 1:], "%Y%m%d").date()
+        except ValueError:
+            continue  # Default or manually created partition
+        
+        if day < cutoff:
+            await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            await session.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    
+    if DEFAULT_PARTITION in partitions:
+        await session.execute(text(
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE issued_at < '{cutoff.isoformat()}'"
+        ))
+    
+    await session.commit()
+    return dropped
@@ -3,11 +3,80 @@ Geospatial grid utilities for 1km grid system.
 """
 
 import math
-from typing import Tuple, List, Optional
-from shapely.geometry import Point, Polygon
-from shapely.ops import transform
-import pyproj
-from functools import partial
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Iterator, Tuple, List, Optional
+import numpy as np
+
+if TYPE_CHECKING:
+    from shapely.geometry import Polygon
+
+
+# Above this many cells, bounds queries are streamed instead of materialized
+MAX_MATERIALIZED_GRIDS = 250_000
+
+# Grid IDs pack the signed latitude index into the high 32 bits and the
+# longitude index (two's complement) into the low 32 bits of an int64.
+_LON_MASK = 0xFFFFFFFF
+_LON_SIGN = 0x80000000
+
+# Earth's radius in km
+EARTH_RADIUS_KM = 6371.0
+
+
+def _haversine_np(lat1: np.ndarray, lon1: np.ndarray,
+                  lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """
+    Vectorized haversine distance in km between points given in degrees.
+    
+    Args:
+        lat1: Origin latitudes
+        lon1: Origin longitudes
+        lat2: Destination latitudes
+        lon2: Destination longitudes
+        
+    Returns:
+        Distances in kilometers
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+@lru_cache(maxsize=4096)
+def _grid_polygon(grid_id: int, lat_size: float, lon_size: float) -> "Polygon":
+    """
+    Build (and cache) the Shapely polygon of a grid cell.
+    
+    Keyed on the cell size rather than a GridSystem instance, so the cache
+    holds no references to grid systems and is shared between equal ones.
+    
+    Args:
+        grid_id: Grid ID
+        lat_size: Cell height in degrees
+        lon_size: Cell width in degrees
+        
+    Returns:
+        Shapely polygon
+    """
+    from shapely.geometry import Polygon
+    
+    grid_lat, grid_lon = GridSystem.decode(grid_id)
+    
+    min_lat = grid_lat * lat_size
+    min_lon = grid_lon * lon_size
+    max_lat = min_lat + lat_size
+    max_lon = min_lon + lon_size
+    
+    return Polygon([
+        (min_lon, min_lat),
+        (max_lon, min_lat),
+        (max_lon, max_lat),
+        (min_lon, max_lat),
+        (min_lon, min_lat)
+    ])
 
 
 class GridSystem:
@@ -23,7 +92,66 @@ class GridSystem:
         self.grid_size_deg_lat = grid_size_km / 111.0
         self.grid_size_deg_lon = grid_size_km / 111.0  # Simplified for demo
     
-    def point_to_grid_id(self, lat: float, lon: float) -> str:
+    @staticmethod
+    def encode(lat_idx: int, lon_idx: int) -> int:
+        """
+        Pack grid indices into a single int64 grid ID.
+        
+        Args:
+            lat_idx: Latitude grid index
+            lon_idx: Longitude grid index
+            
+        Returns:
+            Grid ID
+        """
+        return (lat_idx << 32) | (lon_idx & _LON_MASK)
+    
+    @staticmethod
+    def decode(grid_id: int) -> Tuple[int, int]:
+        """
+        Unpack an int64 grid ID into grid indices.
+        
+        Args:
+            grid_id: Grid ID
+            
+        Returns:
+            Tuple of (lat_idx, lon_idx)
+        """
+        lon_idx = grid_id & _LON_MASK
+        if lon_idx & _LON_SIGN:
+            lon_idx -= 1 << 32
+        return grid_id >> 32, lon_idx
+    
+    def format(self, grid_id: int) -> str:
+        """
+        Format a grid ID as the legacy "{lat}_{lon}" string for JSON output.
+        
+        Args:
+            grid_id: Grid ID
+            
+        Returns:
+            Grid ID string
+        """
+        lat_idx, lon_idx = self.decode(grid_id)
+        return f"{lat_idx}_{lon_idx}"
+    
+    def parse(self, grid_id: str) -> int:
+        """
+        Parse a legacy "{lat}_{lon}" grid ID string.
+        
+        Args:
+            grid_id: Grid ID string
+            
+        Returns:
+            Grid ID
+        """
+        try:
+            lat_idx, lon_idx = map(int, grid_id.split("_"))
+        except ValueError:
+            raise ValueError(f"Invalid grid ID format: {grid_id}")
+        return self.encode(lat_idx, lon_idx)
+    
+    def point_to_grid_id(self, lat: float, lon: float) -> int:
         """
         Convert lat/lon point to grid ID.
         
@@ -32,28 +160,25 @@ class GridSystem:
             lon: Longitude in degrees
             
         Returns:
-            Grid ID string
+            Grid ID
         """
         # Calculate grid indices
         grid_lat = math.floor(lat / self.grid_size_deg_lat)
         grid_lon = math.floor(lon / self.grid_size_deg_lon)
         
-        return f"{grid_lat}_{grid_lon}"
+        return self.encode(grid_lat, grid_lon)
     
-    def grid_id_to_bounds(self, grid_id: str) -> Tuple[float, float, float, float]:
+    def grid_id_to_bounds(self, grid_id: int) -> Tuple[float, float, float, float]:
         """
         Convert grid ID to bounding box (min_lon, min_lat, max_lon, max_lat).
         
         Args:
-            grid_id: Grid ID string
+            grid_id: Grid ID
             
         Returns:
             Bounding box tuple
         """
-        try:
-            grid_lat, grid_lon = map(int, grid_id.split("_"))
-        except ValueError:
-            raise ValueError(f"Invalid grid ID format: {grid_id}")
+        grid_lat, grid_lon = self.decode(grid_id)
         
         min_lat = grid_lat * self.grid_size_deg_lat
         min_lon = grid_lon * self.grid_size_deg_lon
@@ -62,27 +187,19 @@ class GridSystem:
         
         return (min_lon, min_lat, max_lon, max_lat)
     
-    def grid_id_to_polygon(self, grid_id: str) -> Polygon:
+    def grid_id_to_polygon(self, grid_id: int) -> "Polygon":
         """
         Convert grid ID to Shapely polygon.
         
         Args:
-            grid_id: Grid ID string
+            grid_id: Grid ID
             
         Returns:
             Shapely polygon
         """
-        min_lon, min_lat, max_lon, max_lat = self.grid_id_to_bounds(grid_id)
-        
-        return Polygon([
-            (min_lon, min_lat),
-            (max_lon, min_lat),
-            (max_lon, max_lat),
-            (min_lon, max_lat),
-            (min_lon, min_lat)
-        ])
+        return _grid_polygon(grid_id, self.grid_size_deg_lat, self.grid_size_deg_lon)
     
-    def get_neighboring_grids(self, grid_id: str, radius: int = 1) -> List[str]:
+    def get_neighboring_grids(self, grid_id: int, radius: int = 1) -> List[int]:
         """
         Get neighboring grid IDs within radius.
         
@@ -93,10 +210,7 @@ class GridSystem:
         Returns:
             List of neighboring grid IDs
         """
-        try:
-            center_lat, center_lon = map(int, grid_id.split("_"))
-        except ValueError:
-            raise ValueError(f"Invalid grid ID format: {grid_id}")
+        center_lat, center_lon = self.decode(grid_id)
         
         neighbors = []
         for lat_offset in range(-radius, radius + 1):
@@ -106,11 +220,11 @@ class GridSystem:
                 
                 neighbor_lat = center_lat + lat_offset
                 neighbor_lon = center_lon + lon_offset
-                neighbors.append(f"{neighbor_lat}_{neighbor_lon}")
+                neighbors.append(self.encode(neighbor_lat, neighbor_lon))
         
         return neighbors
     
-    def point_in_grid(self, lat: float, lon: float, grid_id: str) -> bool:
+    def point_in_grid(self, lat: float, lon: float, grid_id: int) -> bool:
         """
         Check if point is within grid cell.
         
@@ -122,15 +236,27 @@ class GridSystem:
         Returns:
             True if point is in grid
         """
-        polygon = self.grid_id_to_polygon(grid_id)
-        point = Point(lon, lat)
-        return polygon.contains(point)
+        # Grid cells are axis-aligned, so a half-open bbox test suffices
+        min_lon, min_lat, max_lon, max_lat = self.grid_id_to_bounds(grid_id)
+        return min_lon <= lon < max_lon and min_lat <= lat < max_lat
+    
+    def _grid_index_ranges(self, min_lon: float, min_lat: float,
+                           max_lon: float, max_lat: float) -> Tuple[int, int, int, int]:
+        """Calculate inclusive grid index ranges covering a bounding box."""
+        min_grid_lat = math.floor(min_lat / self.grid_size_deg_lat)
+        max_grid_lat = math.ceil(max_lat / self.grid_size_deg_lat)
+        min_grid_lon = math.floor(min_lon / self.grid_size_deg_lon)
+        max_grid_lon = math.ceil(max_lon / self.grid_size_deg_lon)
+        return min_grid_lat, max_grid_lat, min_grid_lon, max_grid_lon
     
     def get_grids_for_bounds(self, min_lon: float, min_lat: float, 
-                           max_lon: float, max_lat: float) -> List[str]:
+                           max_lon: float, max_lat: float) -> Iterable[int]:
         """
         Get all grid IDs that intersect with bounding box.
         
+        Bounds covering more than MAX_MATERIALIZED_GRIDS cells return a
+        generator instead of a list.
+        
         Args:
             min_lon: Minimum longitude
             min_lat: Minimum latitude
@@ -138,23 +264,46 @@ class GridSystem:
             max_lat: Maximum latitude
             
         Returns:
-            List of intersecting grid IDs
+            Intersecting grid IDs
         """
-        grids = []
-        
         # Calculate grid indices for bounds
-        min_grid_lat = math.floor(min_lat / self.grid_size_deg_lat)
-        max_grid_lat = math.ceil(max_lat / self.grid_size_deg_lat)
-        min_grid_lon = math.floor(min_lon / self.grid_size_deg_lon)
-        max_grid_lon = math.ceil(max_lon / self.grid_size_deg_lon)
+        min_grid_lat, max_grid_lat, min_grid_lon, max_grid_lon = self._grid_index_ranges(
+            min_lon, min_lat, max_lon, max_lat
+        )
+        
+        n_cells = (max_grid_lat - min_grid_lat + 1) * (max_grid_lon - min_grid_lon + 1)
+        if n_cells > MAX_MATERIALIZED_GRIDS:
+            return self.iter_grids_for_bounds(min_lon, min_lat, max_lon, max_lat)
+        
+        lats = np.arange(min_grid_lat, max_grid_lat + 1, dtype=np.int64)
+        lons = np.arange(min_grid_lon, max_grid_lon + 1, dtype=np.int64)
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing="ij")
+        
+        return ((lat_grid.ravel() << 32) | (lon_grid.ravel() & _LON_MASK)).tolist()
+    
+    def iter_grids_for_bounds(self, min_lon: float, min_lat: float,
+                              max_lon: float, max_lat: float) -> Iterator[int]:
+        """
+        Lazily yield all grid IDs that intersect with bounding box.
+        
+        Args:
+            min_lon: Minimum longitude
+            min_lat: Minimum latitude
+            max_lon: Maximum longitude
+            max_lat: Maximum latitude
+            
+        Yields:
+            Intersecting grid IDs
+        """
+        min_grid_lat, max_grid_lat, min_grid_lon, max_grid_lon = self._grid_index_ranges(
+            min_lon, min_lat, max_lon, max_lat
+        )
         
         for grid_lat in range(min_grid_lat, max_grid_lat + 1):
             for grid_lon in range(min_grid_lon, max_grid_lon + 1):
-                grids.append(f"{grid_lat}_{grid_lon}")
-        
-        return grids
+                yield self.encode(grid_lat, grid_lon)
     
-    def distance_between_grids(self, grid_id1: str, grid_id2: str) -> float:
+    def distance_between_grids(self, grid_id1: int, grid_id2: int) -> float:
         """
         Calculate distance between two grid centers in km.
         
@@ -165,11 +314,8 @@ class GridSystem:
         Returns:
             Distance in kilometers
         """
-        try:
-            lat1, lon1 = map(int, grid_id1.split("_"))
-            lat2, lon2 = map(int, grid_id2.split("_"))
-        except ValueError:
-            raise ValueError(f"Invalid grid ID format: {grid_id1} or {grid_id2}")
+        lat1, lon1 = self.decode(grid_id1)
+        lat2, lon2 = self.decode(grid_id2)
         
         # Convert to center coordinates
         center_lat1 = (lat1 + 0.5) * self.grid_size_deg_lat
@@ -178,7 +324,7 @@ class GridSystem:
         center_lon2 = (lon2 + 0.5) * self.grid_size_deg_lon
         
         # Haversine formula for distance
-        R = 6371  # Earth's radius in km
+        R = EARTH_RADIUS_KM
         
         dlat = math.radians(center_lat2 - center_lat1)
         dlon = math.radians(center_lon2 - center_lon1)
@@ -192,6 +338,34 @@ class GridSystem:
         
         return distance
 
+    
+    def distances_to(self, origin_grid_id: int, grid_ids: np.ndarray) -> np.ndarray:
+        """
+        Calculate distances from one grid center to many grid centers in km.
+        
+        Args:
+            origin_grid_id: Origin grid ID
+            grid_ids: Array of grid IDs
+            
+        Returns:
+            Array of distances in kilometers
+        """
+        grid_ids = np.asarray(grid_ids, dtype=np.int64)
+        
+        # Decode packed grid IDs (arithmetic shift keeps the latitude sign)
+        lats = (grid_ids >> 32).astype(np.float64)
+        lons = (grid_ids & _LON_MASK).astype(np.int64)
+        lons = np.where(lons & _LON_SIGN, lons - (1 << 32), lons).astype(np.float64)
+        
+        origin_lat, origin_lon = self.decode(origin_grid_id)
+        
+        return _haversine_np(
+            (origin_lat + 0.5) * self.grid_size_deg_lat,
+            (origin_lon + 0.5) * self.grid_size_deg_lon,
+            (lats + 0.5) * self.grid_size_deg_lat,
+            (lons + 0.5) * self.grid_size_deg_lon,
+        )
+
 
 # Global grid system instance
 grid_system = GridSystem()
@@ -2,17 +2,22 @@
 Map tile utilities for vector tile generation.
 """
 
-import json
 import math
-from typing import Dict, List, Any, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Tuple, Union
 from dataclasses import dataclass
-from shapely.geometry import Point, Polygon
-from shapely.ops import transform
-import pyproj
-from functools import partial
+import numpy as np
+import mapbox_vector_tile
 
+if TYPE_CHECKING:
+    from shapely.geometry import Polygon
 
-@dataclass
+
+# MVT tile-local coordinate extent
+MVT_EXTENT = 4096
+
+
+@dataclass(frozen=True, slots=True)
 class TileCoord:
     """Tile coordinate representation."""
     z: int  # Zoom level
@@ -20,6 +25,17 @@ class TileCoord:
     y: int  # Y coordinate
 
 
+@lru_cache(maxsize=1 << 16)
+def _tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Compute (min_lon, min_lat, max_lon, max_lat) for a tile."""
+    n = 2.0 ** z
+    min_lon = x / n * 360.0 - 180.0
+    max_lon = (x + 1) / n * 360.0 - 180.0
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    return (min_lon, min_lat, max_lon, max_lat)
+
+
 class TileSystem:
     """Map tile system utilities."""
     
@@ -44,6 +60,26 @@ class TileSystem:
         y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
         return (x, y)
     
+    def deg2num_batch(self, lats: np.ndarray, lons: np.ndarray,
+                      zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of lat/lon to tile coordinates.
+        
+        Args:
+            lats: Latitudes in degrees
+            lons: Longitudes in degrees
+            zoom: Zoom level
+            
+        Returns:
+            (x, y) tile coordinate arrays
+        """
+        n = 2.0 ** zoom
+        x = np.floor((np.asarray(lons, dtype=np.float64) + 180.0) / 360.0 * n).astype(np.int64)
+        # arctanh(sin(lat)) == asinh(tan(lat)) on (-90, 90)
+        y_merc = np.arctanh(np.sin(np.radians(np.asarray(lats, dtype=np.float64))))
+        y = np.floor((1.0 - y_merc / np.pi) / 2.0 * n).astype(np.int64)
+        return (x, y)
+    
     def num2deg(self, x: int, y: int, zoom: int) -> Tuple[float, float, float, float]:
         """
         Convert tile coordinates to lat/lon bounds.
@@ -56,19 +92,16 @@ class TileSystem:
         Returns:
             (min_lon, min_lat, max_lon, max_lat)
         """
-        n = 2.0 ** zoom
-        min_lon = x / n * 360.0 - 180.0
-        max_lon = (x + 1) / n * 360.0 - 180.0
-        min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
-        max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
-        return (min_lon, min_lat, max_lon, max_lat)
+        return _tile_bounds(zoom, x, y)
     
     def get_tile_bounds(self, coord: TileCoord) -> Tuple[float, float, float, float]:
         """Get lat/lon bounds for tile coordinate."""
-        return self.num2deg(coord.x, coord.y, coord.z)
+        return _tile_bounds(coord.z, coord.x, coord.y)
     
-    def get_tile_polygon(self, coord: TileCoord) -> Polygon:
+    def get_tile_polygon(self, coord: TileCoord) -> "Polygon":
         """Get Shapely polygon for tile bounds."""
+        from shapely.geometry import Polygon
+        
         min_lon, min_lat, max_lon, max_lat = self.get_tile_bounds(coord)
         return Polygon([
             (min_lon, min_lat),
@@ -79,106 +112,177 @@ class TileSystem:
         ])
 
 
+@dataclass
+class RiskColumns:
+    """Columnar point records: float32 coordinate arrays plus per-row properties."""
+    lon: np.ndarray  # float32 longitudes
+    lat: np.ndarray  # float32 latitudes
+    records: List[Dict[str, Any]]  # Property dicts, one per point
+    
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "RiskColumns":
+        """
+        Build columns from row dicts with 'lon' and 'lat' keys.
+        
+        Args:
+            records: Point records
+            
+        Returns:
+            Columnar records
+        """
+        return cls(
+            lon=np.fromiter((r.get('lon', 0) for r in records), dtype=np.float32, count=len(records)),
+            lat=np.fromiter((r.get('lat', 0) for r in records), dtype=np.float32, count=len(records)),
+            records=records,
+        )
+    
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class RiskIndex:
+    """Spatial index over columnar point records, sorted by longitude."""
+    
+    def __init__(self, data: Union[RiskColumns, List[Dict[str, Any]]]):
+        if not isinstance(data, RiskColumns):
+            data = RiskColumns.from_records(data)
+        self.columns = data
+        
+        # Sort once so each tile query narrows by longitude with a binary search
+        self._order = np.argsort(data.lon, kind="stable")
+        self.lons = data.lon[self._order]
+    
+    def __len__(self) -> int:
+        return len(self.columns)
+    
+    def lon_candidates(self, min_lon: float, max_lon: float) -> np.ndarray:
+        """
+        Get indices of points within a longitude range (inclusive), in lon order.
+        
+        Args:
+            min_lon: Minimum longitude
+            max_lon: Maximum longitude
+            
+        Returns:
+            Row indices into the underlying columns
+        """
+        start = np.searchsorted(self.lons, min_lon, side="left")
+        stop = np.searchsorted(self.lons, max_lon, side="right")
+        return self._order[start:stop]
+
+
+# Point inputs accepted by the tile builders
+PointData = Union[RiskIndex, RiskColumns, List[Dict[str, Any]]]
+
+
 class VectorTileBuilder:
     """Builder for vector tiles with risk data."""
     
     def __init__(self, tile_system: TileSystem):
         self.tile_system = tile_system
     
-    def build_risk_tile(self, coord: TileCoord, risk_data: List[Dict[str, Any]]) -> bytes:
+    def build_risk_tile(self, coord: TileCoord, risk_data: PointData) -> bytes:
         """
         Build vector tile with risk data.
         
         Args:
             coord: Tile coordinate
-            risk_data: List of risk predictions for this tile
+            risk_data: Risk predictions as columns, a shared RiskIndex, or row dicts
             
         Returns:
-            Vector tile as bytes (simplified JSON for demo)
-        """
-        tile_bounds = self.tile_system.get_tile_bounds(coord)
-        min_lon, min_lat, max_lon, max_lat = tile_bounds
-        
-        # Filter risk data to tile bounds
-        tile_risk_data = []
-        for risk in risk_data:
-            # Simple bounds check (in production, use proper spatial indexing)
-            if (min_lon <= risk.get('lon', 0) <= max_lon and 
-                min_lat <= risk.get('lat', 0) <= max_lat):
-                tile_risk_data.append(risk)
-        
-        # Build simplified vector tile structure
-        vector_tile = {
-            "type": "FeatureCollection",
-            "features": []
-        }
-        
-        for risk in tile_risk_data:
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [risk.get('lon', 0), risk.get('lat', 0)]
-                },
-                "properties": {
-                    "grid_id": risk.get('grid_id', ''),
-                    "hazard_type": risk.get('hazard_type', ''),
-                    "p_risk": risk.get('p_risk', 0.0),
-                    "q10": risk.get('q10', 0.0),
-                    "q50": risk.get('q50', 0.0),
-                    "q90": risk.get('q90', 0.0),
-                    "model_version": risk.get('model_version', ''),
-                    "issued_at": risk.get('issued_at', ''),
-                }
-            }
-            vector_tile["features"].append(feature)
-        
-        return json.dumps(vector_tile, ensure_ascii=True).encode('utf-8')
+            Mapbox Vector Tile as bytes
+        """
+        return self._build_tile(coord, "risk", risk_data, lambda risk: {
+            "grid_id": risk.get('grid_id', ''),
+            "hazard_type": risk.get('hazard_type', ''),
+            "p_risk": risk.get('p_risk', 0.0),
+            "q10": risk.get('q10', 0.0),
+            "q50": risk.get('q50', 0.0),
+            "q90": risk.get('q90', 0.0),
+            "model_version": risk.get('model_version', ''),
+            "issued_at": risk.get('issued_at', ''),
+        })
     
-    def build_uncertainty_tile(self, coord: TileCoord, uncertainty_data: List[Dict[str, Any]]) -> bytes:
+    def build_uncertainty_tile(self, coord: TileCoord, uncertainty_data: PointData) -> bytes:
         """
         Build vector tile with uncertainty data.
         
         Args:
             coord: Tile coordinate
-            uncertainty_data: List of uncertainty predictions
+            uncertainty_data: Uncertainty predictions as columns, a shared RiskIndex, or row dicts
             
         Returns:
-            Vector tile as bytes
-        """
-        tile_bounds = self.tile_system.get_tile_bounds(coord)
-        min_lon, min_lat, max_lon, max_lat = tile_bounds
-        
-        # Filter uncertainty data to tile bounds
-        tile_uncertainty_data = []
-        for unc in uncertainty_data:
-            if (min_lon <= unc.get('lon', 0) <= max_lon and 
-                min_lat <= unc.get('lat', 0) <= max_lat):
-                tile_uncertainty_data.append(unc)
-        
-        vector_tile = {
-            "type": "FeatureCollection",
-            "features": []
-        }
-        
-        for unc in tile_uncertainty_data:
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [unc.get('lon', 0), unc.get('lat', 0)]
-                },
+            Mapbox Vector Tile as bytes
+        """
+        return self._build_tile(coord, "uncertainty", uncertainty_data, lambda unc: {
+            "grid_id": unc.get('grid_id', ''),
+            "hazard_type": unc.get('hazard_type', ''),
+            "uncertainty": unc.get('uncertainty', 0.0),
+            "confidence_interval": unc.get('confidence_interval', 0.0),
+            "model_version": unc.get('model_version', ''),
+        })
+    
+    def _build_tile(self, coord: TileCoord, name: str, data: PointData,
+                    properties: Callable[[Dict[str, Any]], Dict[str, Any]]) -> bytes:
+        """
+        Filter points to a tile and encode them as a single-layer Mapbox Vector Tile.
+        
+        Args:
+            coord: Tile coordinate
+            name: Layer name
+            data: Point data
+            properties: Maps a record to its feature properties
+            
+        Returns:
+            MVT protobuf bytes
+        """
+        if not isinstance(data, (RiskIndex, RiskColumns)):
+            data = RiskColumns.from_records(data)
+        
+        # Narrow by longitude first when an index is available
+        if isinstance(data, RiskIndex):
+            columns = data.columns
+            min_lon, _, max_lon, _ = self.tile_system.get_tile_bounds(coord)
+            rows = data.lon_candidates(min_lon, max_lon)
+        else:
+            columns = data
+            rows = np.arange(len(columns))
+        
+        lons = columns.lon[rows].astype(np.float64)
+        lats = columns.lat[rows].astype(np.float64)
+        
+        # Quantize to tile-local Web Mercator pixels (y grows downward)
+        n = 2.0 ** coord.z
+        px = ((lons + 180.0) / 360.0 * n - coord.x) * MVT_EXTENT
+        py = ((1.0 - np.arctanh(np.sin(np.radians(lats))) / np.pi) / 2.0 * n - coord.y) * MVT_EXTENT
+        px = np.rint(px).astype(np.int64)
+        py = np.rint(py).astype(np.int64)
+        
+        # Branchless inclusive bbox test on quantized coords: any term that is
+        # negative sets the sign bit of the OR chain
+        inside = (px | (MVT_EXTENT - px) | py | (MVT_EXTENT - py)) >= 0
+        
+        # Emit features in original row order
+        rows = rows[inside]
+        order = np.argsort(rows, kind="stable")
+        rows = rows[order].tolist()
+        px = px[inside][order].tolist()
+        py = py[inside][order].tolist()
+        
+        features = []
+        for x, y, i in zip(px, py, rows, strict=True):
+            features.append({
+                "geometry": f"POINT({x} {y})",
+                # MVT has no null value type
                 "properties": {
-                    "grid_id": unc.get('grid_id', ''),
-                    "hazard_type": unc.get('hazard_type', ''),
-                    "uncertainty": unc.get('uncertainty', 0.0),
-                    "confidence_interval": unc.get('confidence_interval', 0.0),
-                    "model_version": unc.get('model_version', ''),
-                }
-            }
-            vector_tile["features"].append(feature)
-        
-        return json.dumps(vector_tile, ensure_ascii=True).encode('utf-8')
+                    k: v for k, v in properties(columns.records[i]).items() if v is not None
+                },
+            })
+        
+        return mapbox_vector_tile.encode(
+            [{"name": name, "features": features}],
+            default_options={"extents": MVT_EXTENT, "y_coord_down": True},
+        )
 
 
 # Global tile system instance
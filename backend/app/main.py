@@ -1,20 +1,36 @@
 """
-FastAPI application factory with ASCII sanitization middleware.
+FastAPI application factory with ASCII-only JSON responses.
 """
 
-import json
-from typing import Any, Dict
-from fastapi import FastAPI, Request, Response
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from prometheus_fastapi_instrumentator import Instrumentator
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from app.config import settings
-from app.utils.sanitize import sanitize_dict
+from app.db.database import start_query_log, stop_query_log
+from app.redis import close_redis
+from app.utils.responses import (
+    ASCIIJSONResponse,
+    http_exception_handler,
+    validation_exception_handler,
+)
 from app.routes import auth, risk, assets, alerts, admin, health, feedback
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared connection pools on shutdown."""
+    yield
+    await close_redis()
+
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
@@ -25,12 +41,18 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/api/docs" if settings.debug else None,
         redoc_url="/api/redoc" if settings.debug else None,
+        default_response_class=ASCIIJSONResponse,
+        lifespan=lifespan,
     )
     
+    # Error responses use the same ASCII-only encoding as route responses
+    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    
     # Add middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins,
+        allow_origins=settings.get_cors_origins_list(),
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -38,48 +60,23 @@ def create_app() -> FastAPI:
     
     app.add_middleware(GZipMiddleware, minimum_size=1000)
     
-    # ASCII sanitization middleware
-    @app.middleware("http")
-    async def sanitize_response_middleware(request: Request, call_next):
-        response = await call_next(request)
-        
-        # Only sanitize JSON and text responses
-        if (response.headers.get("content-type", "").startswith("application/json") or
-            response.headers.get("content-type", "").startswith("text/")):
-            
-            # Read response body
-            body = b""
-            async for chunk in response.body_iterator:
-                body += chunk
-            
+    # Flag requests that repeat the same SQL (likely N+1 query loops)
+    if settings.db_query_log_detect_n1:
+        @app.middleware("http")
+        async def detect_n1_middleware(request: Request, call_next):
+            token = start_query_log()
             try:
-                # Parse and sanitize JSON
-                if response.headers.get("content-type", "").startswith("application/json"):
-                    data = json.loads(body.decode())
-                    sanitized_data = sanitize_dict(data)
-                    sanitized_body = json.dumps(sanitized_data, ensure_ascii=True)
-                else:
-                    # Sanitize text content
-                    from app.utils.sanitize import sanitize_text
-                    sanitized_body = sanitize_text(body.decode())
-                
-                # Create new response with sanitized content
-                return Response(
-                    content=sanitized_body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
-                )
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                # If parsing fails, return original response
-                return Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
-                )
-        
-        return response
+                return await call_next(request)
+            finally:
+                repeated = stop_query_log(token, settings.db_query_log_n1_threshold)
+                for statement, count in repeated.items():
+                    logger.warning(
+                        "possible N+1 in %s %s: %dx %s",
+                        request.method,
+                        request.url.path,
+                        count,
+                        " ".join(statement.split())[:200],
+                    )
     
     # Include routers
     app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
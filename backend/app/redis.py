@@ -0,0 +1,91 @@
+"""
+Shared Redis client and connection pool.
+"""
+
+from typing import Iterable, List, Optional
+import redis.asyncio as redis
+from app.config import get_settings
+
+settings = get_settings()
+
+# One blocking pool for the whole process; callers wait for a free
+# connection instead of opening new sockets when the pool is exhausted
+pool = redis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout_seconds,
+    health_check_interval=30,
+    # Cached responses are served as raw bytes, never decode replies
+    decode_responses=False,
+)
+
+redis_client = redis.Redis(connection_pool=pool)
+
+
+async def cache_mget(keys: List[str]) -> List[Optional[bytes]]:
+    """
+    Get several cache keys in one round trip.
+    
+    Uses a non-transactional pipeline rather than MGET so keys need not
+    share a hash slot.
+    
+    Args:
+        keys: Cache keys
+        
+    Returns:
+        Cached values in key order, None for misses
+    """
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.get(key)
+        return await pipe.execute()
+
+
+def risk_cache_index_key(grid_id: int) -> str:
+    """
+    Get the key of the set tracking cached risk responses for a grid cell.
+    
+    Args:
+        grid_id: Grid ID
+        
+    Returns:
+        Redis key of the index set
+    """
+    return f"idx:risk:{grid_id}"
+
+
+async def invalidate_risk_cache(
+    grid_ids: Iterable[int],
+    client: Optional[redis.Redis] = None,
+) -> int:
+    """
+    Drop every cached risk response for the given grid cells.
+    
+    Call after new hazard predictions for those cells are committed.
+    
+    Args:
+        grid_ids: Grid IDs whose predictions changed
+        client: Redis client to use; defaults to the shared client
+        
+    Returns:
+        Number of cached responses removed
+    """
+    client = client or redis_client
+    index_keys = [risk_cache_index_key(grid_id) for grid_id in set(grid_ids)]
+    if not index_keys:
+        return 0
+    
+    async with client.pipeline(transaction=False) as pipe:
+        for index_key in index_keys:
+            pipe.smembers(index_key)
+        members = await pipe.execute()
+    
+    cache_keys = [key for keys in members for key in keys]
+    await client.unlink(*cache_keys, *index_keys)
+    return len(cache_keys)
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and disconnect its pool."""
+    await redis_client.aclose()
+    await pool.disconnect()
@@ -2,22 +2,46 @@
 Admin routes for system management and monitoring.
 """
 
+import time
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text
-import redis.asyncio as redis
 
-from app.config import settings
 from app.db.models import User, HazardPrediction, Alert, Telemetry
 from app.db.database import get_db
+from app.redis import redis_client
 from app.routes.auth import get_current_active_user
+from app.utils.responses import ASCIIJSONResponse
 
 router = APIRouter()
 
-# Redis client for metrics
-redis_client = redis.from_url(settings.redis_url)
+# Parsed Redis INFO snapshot, refreshed at most every REDIS_INFO_TTL_SECONDS
+REDIS_INFO_TTL_SECONDS = 5.0
+_redis_info_cache: Dict[str, Any] = {"t": 0.0, "val": None}
+
+
+async def _get_redis_info() -> Dict[str, Any]:
+    """
+    Get Redis memory and client stats, cached in-process.
+    
+    Returns:
+        Merged INFO memory/clients sections
+    """
+    now = time.monotonic()
+    if _redis_info_cache["val"] is not None and now - _redis_info_cache["t"] < REDIS_INFO_TTL_SECONDS:
+        return _redis_info_cache["val"]
+    
+    # Fetch only the sections we report, in one round trip
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.info("memory")
+        pipe.info("clients")
+        memory_info, clients_info = await pipe.execute()
+    
+    _redis_info_cache["val"] = {**memory_info, **clients_info}
+    _redis_info_cache["t"] = now
+    return _redis_info_cache["val"]
 
 
 class ExperimentConfig(BaseModel):
@@ -78,7 +102,7 @@ async def retrain_models(
     }
 
 
-@router.get("/metrics")
+@router.get("/metrics", response_class=ASCIIJSONResponse)
 async def get_admin_metrics(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -97,14 +121,19 @@ async def get_admin_metrics(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    # Get database metrics
-    hazard_count = await db.execute(select(func.count(HazardPrediction.hazard_id)))
-    alert_count = await db.execute(select(func.count(Alert.id)))
-    telemetry_count = await db.execute(select(func.count(Telemetry.id)))
+    # Get database metrics in a single round trip
+    counts = await db.execute(
+        select(
+            select(func.count()).select_from(HazardPrediction).scalar_subquery(),
+            select(func.count()).select_from(Alert).scalar_subquery(),
+            select(func.count()).select_from(Telemetry).scalar_subquery(),
+        )
+    )
+    hazard_count, alert_count, telemetry_count = counts.one()
     
     # Get Redis metrics
     try:
-        redis_info = await redis_client.info()
+        redis_info = await _get_redis_info()
         redis_memory = redis_info.get('used_memory_human', 'Unknown')
         redis_connected_clients = redis_info.get('connected_clients', 0)
     except Exception:
@@ -134,11 +163,11 @@ async def get_admin_metrics(
         "alert_queue": 0
     }
     
-    return {
+    return ASCIIJSONResponse(content={
         "database": {
-            "hazard_predictions": hazard_count.scalar(),
-            "alerts": alert_count.scalar(),
-            "telemetry_records": telemetry_count.scalar()
+            "hazard_predictions": hazard_count,
+            "alerts": alert_count,
+            "telemetry_records": telemetry_count
         },
         "redis": {
             "memory_usage": redis_memory,
@@ -152,10 +181,10 @@ async def get_admin_metrics(
             "last_air_quality_update": "2024-01-01T00:00:00Z",
             "last_hydrology_update": "2024-01-01T00:00:00Z"
         }
-    }
+    })
 
 
-@router.get("/experiments")
+@router.get("/experiments", response_class=ASCIIJSONResponse)
 async def get_experiments(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -206,7 +235,7 @@ async def get_experiments(
         }
     ]
     
-    return experiments
+    return ASCIIJSONResponse(content=experiments)
 
 
 @router.post("/experiments/start")
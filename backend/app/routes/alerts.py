@@ -6,7 +6,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 import uuid
 
 from app.config import settings
@@ -14,6 +14,7 @@ from app.db.models import Alert, Site, Organization, User
 from app.db.database import get_db
 from app.routes.auth import get_current_active_user
 from app.utils.sanitize import sanitize_text
+from app.utils.responses import ASCIIJSONResponse
 
 router = APIRouter()
 
@@ -32,7 +33,7 @@ class AlertSubscriptionResponse(BaseModel):
     subscription_id: str
 
 
-@router.post("/subscribe", response_model=AlertSubscriptionResponse)
+@router.post("/subscribe", response_model=AlertSubscriptionResponse, response_class=ASCIIJSONResponse)
 async def subscribe_alerts(
     subscription: AlertSubscription,
     db: AsyncSession = Depends(get_db),
@@ -52,16 +53,22 @@ async def subscribe_alerts(
     if not current_user.org_id:
         raise HTTPException(status_code=400, detail="User must belong to an organization")
     
-    # Validate sites belong to user's organization
-    for site_id in subscription.site_ids:
-        result = await db.execute(
-            select(Site).where(
-                Site.id == site_id,
-                Site.org_id == current_user.org_id
-            )
+    # Parse site IDs once so asyncpg binds native UUIDs for every row
+    try:
+        site_ids = [uuid.UUID(site_id) for site_id in subscription.site_ids]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid site ID")
+    
+    # Validate sites belong to user's organization in one query
+    result = await db.execute(
+        select(Site.id).where(
+            Site.id.in_(site_ids),
+            Site.org_id == current_user.org_id
         )
-        site = result.scalar_one_or_none()
-        if not site:
+    )
+    found = set(result.scalars())
+    for site_id in site_ids:
+        if site_id not in found:
             raise HTTPException(status_code=404, detail=f"Site {site_id} not found")
     
     # Validate hazard type
@@ -81,26 +88,32 @@ async def subscribe_alerts(
     # Create alert subscriptions
     subscription_id = str(uuid.uuid4())
     
-    for site_id in subscription.site_ids:
-        for channel in subscription.channel:
-            alert = Alert(
-                org_id=current_user.org_id,
-                site_id=site_id,
-                hazard_type=subscription.hazard,
-                p_risk=0.0,  # Will be updated when risk is calculated
-                threshold=subscription.threshold,
-                channel=channel,
-                webhook_url=sanitize_text(subscription.webhook_url) if subscription.webhook_url else None,
-                status="pending"
-            )
-            db.add(alert)
+    webhook_url = sanitize_text(subscription.webhook_url) if subscription.webhook_url else None
+    
+    rows = [
+        {
+            "org_id": current_user.org_id,
+            "site_id": site_id,
+            "hazard_type": subscription.hazard,
+            "p_risk": 0.0,  # Will be updated when risk is calculated
+            "threshold": subscription.threshold,
+            "channel": channel,
+            "webhook_url": webhook_url,
+            "status": "pending",
+        }
+        for site_id in site_ids
+        for channel in subscription.channel
+    ]
+    
+    # Single executemany INSERT; column defaults (id, created_at) apply per row
+    await db.execute(insert(Alert), rows)
     
     await db.commit()
     
-    return AlertSubscriptionResponse(subscription_id=subscription_id)
+    return ASCIIJSONResponse(content={"subscription_id": subscription_id})
 
 
-@router.get("/")
+@router.get("/", response_class=ASCIIJSONResponse)
 async def list_alerts(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -116,24 +129,36 @@ async def list_alerts(
         List of alerts
     """
     if not current_user.org_id:
-        return []
+        return ASCIIJSONResponse(content=[])
     
-    result = await db.execute(
-        select(Alert).where(Alert.org_id == current_user.org_id)
+    # Plain column rows; no ORM instances or identity map bookkeeping
+    result = await db.stream(
+        select(
+            Alert.id,
+            Alert.site_id,
+            Alert.hazard_type,
+            Alert.status,
+            Alert.p_risk,
+            Alert.threshold,
+            Alert.channel,
+            Alert.sent_at,
+            Alert.created_at,
+        )
+        .where(Alert.org_id == current_user.org_id)
+        .execution_options(yield_per=1000)
     )
-    alerts = result.scalars().all()
     
-    return [
+    return ASCIIJSONResponse(content=[
         {
-            "id": str(alert.id),
-            "site_id": str(alert.site_id) if alert.site_id else None,
-            "hazard_type": alert.hazard_type,
-            "status": alert.status,
-            "p_risk": alert.p_risk,
-            "threshold": alert.threshold,
-            "channel": alert.channel,
-            "sent_at": alert.sent_at.isoformat() if alert.sent_at else None,
-            "created_at": alert.created_at.isoformat()
+            "id": str(row[0]),
+            "site_id": str(row[1]) if row[1] else None,
+            "hazard_type": row[2],
+            "status": row[3],
+            "p_risk": row[4],
+            "threshold": row[5],
+            "channel": row[6],
+            "sent_at": row[7].isoformat() if row[7] else None,
+            "created_at": row[8].isoformat()
         }
-        for alert in alerts
-    ]
+        async for row in result
+    ])
@@ -2,14 +2,17 @@
 Asset management routes for site uploads and risk queries.
 """
 
-from typing import List, Optional
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
 import csv
-import json
+import io
 import uuid
+import ijson
 
 from app.config import settings
 from app.db.models import Site, Organization, User
@@ -19,6 +22,52 @@ from app.utils.sanitize import sanitize_text
 
 router = APIRouter()
 
+# Sites per multi-row INSERT during uploads
+SITE_INSERT_BATCH_SIZE = 1000
+
+
+def _site_row(org_id: uuid.UUID, name: str, lat: float, lon: float, source: str) -> Dict[str, Any]:
+    """Build an insert row for a site, with the point built server-side."""
+    return {
+        "id": uuid.uuid4(),
+        "org_id": org_id,
+        "name": name,
+        "geom": func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326),
+        "meta": {"source": source},
+    }
+
+
+def _parse_csv_sites(file: IO[bytes]) -> Iterator[Tuple[str, float, float]]:
+    """Parse (name, lat, lon) sites row by row from a CSV upload."""
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding='utf-8', newline=''))
+    for index, row in enumerate(reader, 1):
+        name = sanitize_text(row.get('name', f'Site {index}'))
+        yield name, float(row.get('lat', 0)), float(row.get('lon', 0))
+
+
+def _parse_geojson_sites(file: IO[bytes]) -> Iterator[Tuple[str, float, float]]:
+    """Parse (name, lat, lon) sites feature by feature from a GeoJSON upload."""
+    for index, feature in enumerate(ijson.items(file, 'features.item', use_float=True), 1):
+        name = sanitize_text(feature.get('properties', {}).get('name', f'Site {index}'))
+        coords = feature.get('geometry', {}).get('coordinates', [0, 0])
+        yield name, coords[1], coords[0]
+
+
+def _next_batch(sites: Iterator[Tuple[str, float, float]]) -> List[Tuple[str, float, float]]:
+    """Read and parse up to one insert batch of sites (blocking file I/O)."""
+    return list(islice(sites, SITE_INSERT_BATCH_SIZE))
+
+
+async def _insert_sites(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Insert sites in one statement and return their IDs in input order.
+    
+    IDs are generated client-side in _site_row, since a multi-row
+    INSERT ... RETURNING does not guarantee row order.
+    """
+    await db.execute(insert(Site).values(rows))
+    return [str(row["id"]) for row in rows]
+
 
 class SiteRiskResponse(BaseModel):
     """Site risk response model."""
@@ -56,54 +105,31 @@ async def upload_assets(
     if not current_user.org_id:
         raise HTTPException(status_code=400, detail="User must belong to an organization")
     
-    content = await file.read()
     site_ids = []
     
     try:
         if file.filename.endswith('.csv'):
-            # Parse CSV
-            csv_content = content.decode('utf-8')
-            reader = csv.DictReader(csv_content.splitlines())
-            
-            for row in reader:
-                name = sanitize_text(row.get('name', f'Site {len(site_ids) + 1}'))
-                lat = float(row.get('lat', 0))
-                lon = float(row.get('lon', 0))
-                
-                # Create site
-                site = Site(
-                    org_id=current_user.org_id,
-                    name=name,
-                    geom=f"POINT({lon} {lat})",
-                    metadata={"source": "csv_upload"}
-                )
-                db.add(site)
-                await db.flush()
-                site_ids.append(str(site.id))
+            # Parse CSV row by row straight from the upload
+            sites = _parse_csv_sites(file.file)
+            source = "csv_upload"
         
         elif file.filename.endswith('.geojson'):
-            # Parse GeoJSON
-            geojson_data = json.loads(content.decode('utf-8'))
-            
-            for feature in geojson_data.get('features', []):
-                name = sanitize_text(feature.get('properties', {}).get('name', f'Site {len(site_ids) + 1}'))
-                coords = feature.get('geometry', {}).get('coordinates', [0, 0])
-                lon, lat = coords[0], coords[1]
-                
-                # Create site
-                site = Site(
-                    org_id=current_user.org_id,
-                    name=name,
-                    geom=f"POINT({lon} {lat})",
-                    metadata={"source": "geojson_upload"}
-                )
-                db.add(site)
-                await db.flush()
-                site_ids.append(str(site.id))
+            # Parse GeoJSON features incrementally
+            sites = _parse_geojson_sites(file.file)
+            source = "geojson_upload"
         
         else:
             raise HTTPException(status_code=400, detail="Unsupported file format")
         
+        # Reading the spooled upload blocks, so each batch is parsed in the
+        # threadpool and only the inserts run on the event loop
+        while batch := await run_in_threadpool(_next_batch, sites):
+            rows = [
+                _site_row(current_user.org_id, name, lat, lon, source)
+                for name, lat, lon in batch
+            ]
+            site_ids.extend(await _insert_sites(db, rows))
+        
         await db.commit()
         
         return {
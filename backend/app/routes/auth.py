@@ -4,27 +4,120 @@ Authentication routes for OTP-based login.
 
 import secrets
 import smtplib
+import time
+import uuid
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+import jwt
+from jwt.algorithms import get_default_algorithms
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import redis.asyncio as redis
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from app.config import settings
 from app.db.models import User
 from app.db.database import get_db
+from app.redis import redis_client
+from app.utils.responses import ASCIIJSONResponse
 from app.utils.sanitize import sanitize_text
 
 router = APIRouter()
 security = HTTPBearer()
 
-# Redis client for OTP storage
-redis_client = redis.from_url(settings.redis_url)
+# JWT codec and signing key, prepared once instead of on every request
+_jwt = jwt.PyJWT()
+_jwt_key = get_default_algorithms()[settings.jwt_algorithm].prepare_key(settings.jwt_secret)
+_jwt_algorithms = [settings.jwt_algorithm]
+
+# Verified tokens -> (cached until, user columns), so repeat requests skip
+# JWT verification and the user lookup. The cache is per process and only
+# this process's ORM writes invalidate it, so entries live for at most
+# auth_token_cache_ttl_seconds: user changes made by other workers, bulk
+# statements or other services take effect within that window
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+TOKEN_CACHE_EXPIRY_MARGIN_SECONDS = 5
+_token_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Deletes a key only while it still holds the given value
+_delete_if_equal = redis_client.register_script(
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then "
+    "return redis.call('DEL', KEYS[1]) end return 0"
+)
+
+
+def _evict_expired_tokens() -> None:
+    """Drop cached tokens whose cache entry has lapsed."""
+    now = time.time()
+    for token in [t for t, (until, _) in _token_cache.items() if until <= now]:
+        del _token_cache[token]
+
+
+def _cache_token(token: str, exp: float, user: User) -> None:
+    """
+    Cache a verified token and a snapshot of its user's columns.
+    
+    Args:
+        token: Encoded JWT
+        exp: Token expiry, Unix seconds
+        user: Authenticated user
+    """
+    if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+        _evict_expired_tokens()
+        if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+            # Still full, drop the oldest entry
+            del _token_cache[next(iter(_token_cache))]
+    
+    until = min(
+        exp - TOKEN_CACHE_EXPIRY_MARGIN_SECONDS,
+        time.time() + settings.auth_token_cache_ttl_seconds,
+    )
+    _token_cache[token] = (
+        until,
+        {column.name: getattr(user, column.name) for column in User.__table__.columns},
+    )
+
+
+def invalidate_cached_user(user_id: uuid.UUID) -> None:
+    """
+    Drop cached tokens for a user, e.g. after deactivation or a role change.
+    
+    Args:
+        user_id: User ID
+    """
+    for token in [t for t, (_, cols) in _token_cache.items() if cols["id"] == user_id]:
+        del _token_cache[token]
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    """Drop cached tokens when a flush changes a user's active flag or role."""
+    attrs = inspect(target).attrs
+    if attrs.is_active.history.has_changes() or attrs.role.history.has_changes():
+        invalidate_cached_user(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target: User) -> None:
+    """Drop cached tokens of a deleted user."""
+    invalidate_cached_user(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_user_write(orm_execute_state: ORMExecuteState) -> None:
+    """
+    Clear the token cache on bulk update()/delete() of users.
+    
+    Bulk statements bypass the mapper events and may touch any user, so
+    the whole (short-lived) cache is dropped.
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+        _token_cache.clear()
 
 
 class OTPRequest(BaseModel):
@@ -78,7 +171,7 @@ async def send_otp_email(email: str, code: str) -> bool:
         return False
 
 
-@router.post("/request_otp", response_model=dict)
+@router.post("/request_otp", response_model=dict, response_class=ASCIIJSONResponse)
 async def request_otp(otp_request: OTPRequest, db: AsyncSession = Depends(get_db)):
     """
     Request OTP code for email verification.
@@ -93,29 +186,37 @@ async def request_otp(otp_request: OTPRequest, db: AsyncSession = Depends(get_db
     email = sanitize_text(otp_request.email)
     
     # Generate 6-digit OTP
-    otp_code = str(secrets.randbelow(900000) + 100000)
+    otp_code = f"{secrets.randbelow(1_000_000):06d}"
     
-    # Store OTP in Redis with 5-minute expiry
+    # Store OTP in Redis with 5-minute expiry, unless one is still pending
     otp_key = f"otp:{email}"
-    await redis_client.setex(otp_key, 300, otp_code)  # 5 minutes
+    stored = await redis_client.set(otp_key, otp_code, ex=300, nx=True)  # 5 minutes
+    
+    if not stored:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Verification code already sent, please check your email"
+        )
     
     # Send OTP via email
     email_sent = await send_otp_email(email, otp_code)
     
     if not email_sent:
+        # Free the slot so the user can retry, unless a newer code took it
+        await _delete_if_equal(keys=[otp_key], args=[otp_code])
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to send verification code"
         )
     
-    return {
+    return ASCIIJSONResponse(content={
         "message": "Verification code sent to your email",
         "email": email,
         "expires_in": 300
-    }
+    })
 
 
-@router.post("/verify_otp", response_model=TokenResponse)
+@router.post("/verify_otp", response_model=TokenResponse, response_class=ASCIIJSONResponse)
 async def verify_otp(otp_verify: OTPVerify, db: AsyncSession = Depends(get_db)):
     """
     Verify OTP code and return JWT token.
@@ -130,9 +231,9 @@ async def verify_otp(otp_verify: OTPVerify, db: AsyncSession = Depends(get_db)):
     email = sanitize_text(otp_verify.email)
     code = sanitize_text(otp_verify.code)
     
-    # Verify OTP from Redis
+    # Fetch and consume the OTP in one round trip; codes are single-use
     otp_key = f"otp:{email}"
-    stored_code = await redis_client.get(otp_key)
+    stored_code = await redis_client.getdel(otp_key)
     
     if not stored_code or stored_code.decode() != code:
         raise HTTPException(
@@ -140,9 +241,6 @@ async def verify_otp(otp_verify: OTPVerify, db: AsyncSession = Depends(get_db)):
             detail="Invalid or expired verification code"
         )
     
-    # Remove OTP after successful verification
-    await redis_client.delete(otp_key)
-    
     # Get or create user
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
@@ -170,10 +268,13 @@ async def verify_otp(otp_verify: OTPVerify, db: AsyncSession = Depends(get_db)):
         expires_delta=access_token_expires
     )
     
-    return TokenResponse(
-        access_token=access_token,
-        expires_in=settings.jwt_access_token_expire_minutes * 60
-    )
+    # Returned directly; TokenResponse documents the shape without
+    # re-validating our own output
+    return ASCIIJSONResponse(content={
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": settings.jwt_access_token_expire_minutes * 60
+    })
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -185,7 +286,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=15)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    encoded_jwt = _jwt.encode(to_encode, _jwt_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
 
@@ -212,16 +313,27 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    token = credentials.credentials
+    cached = _token_cache.get(token)
+    if cached is not None:
+        until, user_columns = cached
+        if time.time() < until:
+            # Detached snapshot; not bound to this request's session
+            return User(**user_columns)
+        del _token_cache[token]
+    
     try:
-        payload = jwt.decode(
-            credentials.credentials, 
-            settings.jwt_secret, 
-            algorithms=[settings.jwt_algorithm]
+        payload = _jwt.decode(
+            token,
+            _jwt_key,
+            algorithms=_jwt_algorithms,
+            # exp keys the token cache, so tokens without one are rejected
+            options={"verify_aud": False, "require": ["exp"]},
         )
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise credentials_exception
     
     result = await db.execute(select(User).where(User.id == user_id))
@@ -230,6 +342,8 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
     
+    _cache_token(token, payload["exp"], user)
+    
     return user
 
 
@@ -2,11 +2,13 @@
 Feedback routes for model improvement.
 """
 
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import String, cast, select, tuple_
 
 from app.config import settings
 from app.db.models import Feedback, HazardPrediction, User
@@ -17,6 +19,23 @@ from app.utils.sanitize import sanitize_text
 router = APIRouter()
 
 
+def _parse_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Parse a feedback page cursor of the form "<created_at>,<id>".
+    
+    Args:
+        cursor: Cursor from a previous page's X-Next-Cursor header
+        
+    Returns:
+        Tuple of (created_at, id) of the last record already seen
+    """
+    created_at, _, feedback_id = cursor.rpartition(",")
+    try:
+        return datetime.fromisoformat(created_at), uuid.UUID(feedback_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 class FeedbackSubmission(BaseModel):
     """Feedback submission model."""
     hazard_id: str
@@ -51,11 +70,12 @@ async def submit_feedback(
     
     # Verify hazard prediction exists
     result = await db.execute(
-        select(HazardPrediction).where(HazardPrediction.hazard_id == feedback.hazard_id)
+        select(HazardPrediction.hazard_id)
+        .where(HazardPrediction.hazard_id == feedback.hazard_id)
+        .limit(1)
     )
-    hazard_pred = result.scalar_one_or_none()
     
-    if not hazard_pred:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Hazard prediction not found")
     
     # Create feedback record
@@ -77,17 +97,22 @@ async def submit_feedback(
 
 @router.get("/")
 async def get_feedback(
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 100,
-    offset: int = 0,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Get feedback records for the current user.
+    Get feedback records for the current user, newest first.
+    
+    Pages are keyset-paginated: when more records may follow, the
+    X-Next-Cursor response header holds the cursor for the next page.
     
     Args:
+        response: Response used to set the pagination header
+        cursor: Cursor from the previous page, if any
         limit: Maximum number of records to return
-        offset: Number of records to skip
         db: Database session
         current_user: Current authenticated user
         
@@ -97,21 +122,42 @@ async def get_feedback(
     if not settings.enable_feedback:
         return []
     
-    result = await db.execute(
-        select(Feedback)
-        .where(Feedback.user_id == current_user.id)
+    query = select(
+        cast(Feedback.id, String).label("id"),
+        cast(Feedback.hazard_id, String).label("hazard_id"),
+        Feedback.label,
+        Feedback.notes,
+        Feedback.created_at,
+    ).where(Feedback.user_id == current_user.id)
+    
+    # Seek past the last record seen instead of skipping OFFSET rows
+    if cursor:
+        query = query.where(
+            tuple_(Feedback.created_at, Feedback.id) < tuple_(*_parse_cursor(cursor))
+        )
+    
+    # Plain column rows streamed in batches; no ORM instances are built.
+    # UUIDs are rendered as text by Postgres, not converted per row here
+    result = await db.stream(
+        query
+        .order_by(Feedback.created_at.desc(), Feedback.id.desc())
         .limit(limit)
-        .offset(offset)
+        .execution_options(yield_per=100)
     )
-    feedback_records = result.scalars().all()
     
-    return [
+    records = [
         {
-            "id": str(feedback.id),
-            "hazard_id": str(feedback.hazard_id),
-            "label": feedback.label,
-            "notes": feedback.notes,
-            "created_at": feedback.created_at.isoformat()
+            "id": row.id,
+            "hazard_id": row.hazard_id,
+            "label": row.label,
+            "notes": row.notes,
+            "created_at": row.created_at.isoformat()
         }
-        for feedback in feedback_records
+        async for row in result
     ]
+    
+    if records and len(records) == limit:
+        last = records[-1]
+        response.headers["X-Next-Cursor"] = f"{last['created_at']},{last['id']}"
+    
+    return records
@@ -2,19 +2,54 @@
 Health check routes for monitoring and observability.
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import time
+from typing import Any, Dict
+from fastapi import APIRouter
 from sqlalchemy import text
-import redis.asyncio as redis
 from datetime import datetime
 
-from app.config import settings
-from app.db.database import get_db
+from app.db.database import engine
+from app.redis import redis_client
 
 router = APIRouter()
 
-# Redis client for health checks
-redis_client = redis.from_url(settings.redis_url)
+# Last dependency check results, reused for READINESS_CACHE_TTL_SECONDS so
+# frequent probes do not each hit Postgres and Redis
+READINESS_CACHE_TTL_SECONDS = 2.0
+_readiness_cache: Dict[str, Any] = {"t": 0.0, "val": None}
+
+
+async def _check_database() -> None:
+    """Run a trivial query on a pooled connection."""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _get_readiness_checks() -> Dict[str, str]:
+    """
+    Get database and Redis health, cached in-process.
+    
+    Returns:
+        Dict mapping dependency name to "healthy" or "unhealthy"
+    """
+    now = time.monotonic()
+    if _readiness_cache["val"] is not None and now - _readiness_cache["t"] < READINESS_CACHE_TTL_SECONDS:
+        return _readiness_cache["val"]
+    
+    # Check both connections concurrently
+    db_result, redis_result = await asyncio.gather(
+        _check_database(),
+        redis_client.ping(),
+        return_exceptions=True,
+    )
+    
+    _readiness_cache["val"] = {
+        "database": "unhealthy" if isinstance(db_result, BaseException) else "healthy",
+        "redis": "unhealthy" if isinstance(redis_result, BaseException) else "healthy",
+    }
+    _readiness_cache["t"] = now
+    return _readiness_cache["val"]
 
 
 @router.get("/healthz")
@@ -33,37 +68,19 @@ async def health_check():
 
 
 @router.get("/readyz")
-async def readiness_check(db: AsyncSession = Depends(get_db)):
+async def readiness_check():
     """
     Readiness check endpoint.
     
-    Args:
-        db: Database session
-        
     Returns:
         Readiness status
     """
-    try:
-        # Check database connection
-        await db.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception:
-        db_status = "unhealthy"
-    
-    try:
-        # Check Redis connection
-        await redis_client.ping()
-        redis_status = "healthy"
-    except Exception:
-        redis_status = "unhealthy"
+    checks = await _get_readiness_checks()
     
-    overall_status = "ready" if db_status == "healthy" and redis_status == "healthy" else "not_ready"
+    overall_status = "ready" if all(s == "healthy" for s in checks.values()) else "not_ready"
     
     return {
         "status": overall_status,
         "timestamp": datetime.utcnow().isoformat(),
-        "checks": {
-            "database": db_status,
-            "redis": redis_status
-        }
+        "checks": checks
     }
@@ -2,24 +2,93 @@
 Risk assessment routes for hazard predictions.
 """
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends, Query
+import re
+from typing import List, Optional, Dict, Any, Tuple
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, desc
-import redis.asyncio as redis
 
 from app.config import settings
 from app.db.models import HazardPrediction, User
 from app.db.database import get_db
+from app.redis import cache_mget, redis_client, risk_cache_index_key
 from app.geo.grid import grid_system
 from app.routes.auth import get_current_active_user
+from app.utils.responses import ascii_json_dumps
 from app.utils.sanitize import sanitize_text
 
 router = APIRouter()
 
-# Redis client for caching
-redis_client = redis.from_url(settings.redis_url)
+# Simplified geocoding for demo, as (name, result) pairs scanned in order
+# In production, use a proper geocoding service
+DEMO_LOCATIONS: Tuple[Tuple[str, Dict[str, Any]], ...] = tuple(
+    (name, {"point": {"lat": lat, "lon": lon}, "admin_areas": admin_areas})
+    for name, lat, lon, admin_areas in (
+        ("san francisco", 37.7749, -122.4194, ["California", "San Francisco County"]),
+        ("new york", 40.7128, -74.0060, ["New York", "New York County"]),
+        ("chicago", 41.8781, -87.6298, ["Illinois", "Cook County"]),
+        ("miami", 25.7617, -80.1918, ["Florida", "Miami-Dade County"]),
+        ("seattle", 47.6062, -122.3321, ["Washington", "King County"]),
+    )
+)
+
+# Default to San Francisco for demo
+DEFAULT_DEMO_LOCATION = DEMO_LOCATIONS[0][1]
+
+# All location names in one pattern, so a query is scanned once regardless
+# of how many demo locations there are
+_DEMO_LOCATION_RESULTS = dict(DEMO_LOCATIONS)
+_DEMO_LOCATION_RE = re.compile("|".join(re.escape(name) for name, _ in DEMO_LOCATIONS))
+
+GEOCODE_CACHE_TTL_SECONDS = 3600  # 1 hour cache
+
+# Supported hazard types in canonical order
+VALID_HAZARDS = ("flood", "heat", "pm25", "smoke")
+
+# Brief templates by risk bucket: low (<= 0.3), moderate (<= 0.5), high
+RISK_BRIEF_TEMPLATES = (
+    "Low risk conditions. All hazards below 30% probability. Normal operations recommended.",
+    "Moderate risk conditions present. Main hazard: {hazard} with {p_risk:.1%} probability. Stay informed.",
+    "High risk conditions detected. Primary concern: {hazard} with {p_risk:.1%} probability. Monitor conditions closely.",
+)
+
+
+def normalize_hazards(requested: List[str]) -> Tuple[str, ...]:
+    """
+    Reduce requested hazard types to the supported ones, in canonical order.
+    
+    Unsupported values are dropped rather than sanitized, so equivalent
+    requests in any order share one cache entry.
+    
+    Args:
+        requested: Hazard types from the request
+        
+    Returns:
+        Supported hazard types in VALID_HAZARDS order
+    """
+    requested = set(requested)
+    return tuple(h for h in VALID_HAZARDS if h in requested)
+
+
+def _hazards_key(hazards: Tuple[str, ...]) -> str:
+    """Compact cache-key part for normalized hazards (initials are unique)."""
+    return "".join(h[0] for h in hazards)
+
+
+def _geocode_demo(query: str) -> Dict[str, Any]:
+    """
+    Resolve a query against the demo locations.
+    
+    Args:
+        query: Sanitized address or location string
+        
+    Returns:
+        Point and administrative areas
+    """
+    match = _DEMO_LOCATION_RE.search(query.lower())
+    return _DEMO_LOCATION_RESULTS[match.group()] if match else DEFAULT_DEMO_LOCATION
 
 
 class RiskQuery(BaseModel):
@@ -59,62 +128,77 @@ class RiskResponse(BaseModel):
     sources: Optional[List[str]] = None
 
 
-@router.post("/query", response_model=RiskResponse)
-async def query_risk(
-    query: RiskQuery,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
+def _cache_risk_body(pipe, grid_id: int, cache_key: str, body: bytes) -> None:
     """
-    Query risk predictions for a location.
+    Queue a cached risk response on a pipeline and track it for invalidation.
+    
+    Args:
+        pipe: Redis pipeline
+        grid_id: Grid ID the response was computed for
+        cache_key: Cache key of the response
+        body: Serialized response
+    """
+    index_key = risk_cache_index_key(grid_id)
+    pipe.setex(cache_key, settings.prediction_cache_ttl_seconds, body)
+    pipe.sadd(index_key, cache_key)
+    pipe.expire(index_key, settings.prediction_cache_ttl_seconds)
+
+
+async def _risk_body(
+    db: AsyncSession,
+    grid_id: int,
+    hazards: Tuple[str, ...],
+    horizon_hours: int
+) -> bytes:
+    """
+    Get the serialized risk response for a grid cell, cached or computed.
     
     Args:
-        query: Risk query parameters
         db: Database session
-        current_user: Current authenticated user
+        grid_id: Grid ID
+        hazards: Normalized hazard types to include
+        horizon_hours: Prediction horizon in hours
         
     Returns:
-        Risk predictions and analysis
+        ASCII JSON bytes of a RiskResponse
     """
-    # Sanitize inputs
-    lat = query.lat
-    lon = query.lon
-    hazards = [sanitize_text(h) for h in query.hazards]
-    horizon_hours = query.horizon_hours
-    
-    # Get grid ID for location
-    grid_id = grid_system.point_to_grid_id(lat, lon)
-    
     # Check cache first
-    cache_key = f"risk:{grid_id}:{':'.join(hazards)}:{horizon_hours}"
-    cached_result = await redis_client.get(cache_key)
-    
-    if cached_result and not settings.debug:
-        import json
-        return RiskResponse(**json.loads(cached_result))
+    cache_key = f"risk:{grid_id}:{_hazards_key(hazards)}:{horizon_hours}"
+    if not settings.debug:
+        cached_result = await redis_client.get(cache_key)
+        if cached_result:
+            return cached_result
     
     # Query database for recent predictions
     horizon_minutes = horizon_hours * 60
     
-    predictions = []
-    for hazard in hazards:
-        if hazard not in ["flood", "heat", "smoke", "pm25"]:
-            continue
-            
-        result = await db.execute(
-            select(HazardPrediction)
-            .where(
-                and_(
-                    HazardPrediction.type == hazard,
-                    HazardPrediction.grid_id == grid_id,
-                    HazardPrediction.horizon_minutes <= horizon_minutes
-                )
+    # Latest prediction per hazard type in a single round trip, as plain
+    # column rows (served from the covering index, no ORM instances)
+    result = await db.execute(
+        select(
+            HazardPrediction.type,
+            HazardPrediction.p_risk,
+            HazardPrediction.q10,
+            HazardPrediction.q50,
+            HazardPrediction.q90,
+            HazardPrediction.model_version,
+            HazardPrediction.issued_at,
+        )
+        .where(
+            and_(
+                HazardPrediction.type.in_(hazards),
+                HazardPrediction.grid_id == grid_id,
+                HazardPrediction.horizon_minutes <= horizon_minutes
             )
-            .order_by(desc(HazardPrediction.issued_at))
-            .limit(1)
         )
-        
-        hazard_pred = result.scalar_one_or_none()
+        .order_by(HazardPrediction.type, desc(HazardPrediction.issued_at))
+        .distinct(HazardPrediction.type)
+    )
+    latest = {row.type: row for row in result.all()}
+    
+    predictions = []
+    for hazard in hazards:
+        hazard_pred = latest.get(hazard)
         
         if hazard_pred:
             predictions.append(RiskPrediction(
@@ -149,20 +233,16 @@ async def query_risk(
     
     # Generate brief (simplified for demo)
     brief = None
-    if predictions:
-        max_risk = max(p.p_risk for p in predictions)
-        if max_risk > 0.5:
-            brief = f"High risk conditions detected. Primary concern: {max(predictions, key=lambda x: x.p_risk).hazard} with {max_risk:.1%} probability. Monitor conditions closely."
-        elif max_risk > 0.3:
-            brief = f"Moderate risk conditions present. Main hazard: {max(predictions, key=lambda x: x.p_risk).hazard} with {max_risk:.1%} probability. Stay informed."
-        else:
-            brief = f"Low risk conditions. All hazards below 30% probability. Normal operations recommended."
+    top = max(predictions, key=lambda p: p.p_risk, default=None)
+    if top is not None:
+        bucket = 2 if top.p_risk > 0.5 else 1 if top.p_risk > 0.3 else 0
+        brief = RISK_BRIEF_TEMPLATES[bucket].format(hazard=top.hazard, p_risk=top.p_risk)
     
     # Sources
     sources = ["NOAA", "USGS", "EPA AirNow", "NASA FIRMS"]
     
     response = RiskResponse(
-        grid_id=grid_id,
+        grid_id=grid_system.format(grid_id),
         horizon=horizon_hours,
         predictions=predictions,
         top_drivers=top_drivers,
@@ -170,16 +250,43 @@ async def query_risk(
         sources=sources
     )
     
+    # Serialize once; the same bytes are cached and returned
+    body = ascii_json_dumps(response.model_dump(exclude_none=True))
+    
     # Cache result
     if not settings.debug:
-        import json
-        await redis_client.setex(
-            cache_key,
-            settings.prediction_cache_ttl_seconds,
-            json.dumps(response.dict(), ensure_ascii=True)
-        )
+        async with redis_client.pipeline(transaction=True) as pipe:
+            _cache_risk_body(pipe, grid_id, cache_key, body)
+            await pipe.execute()
     
-    return response
+    return body
+
+
+@router.post("/query", response_model=RiskResponse, response_model_exclude_none=True)
+async def query_risk(
+    query: RiskQuery,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Query risk predictions for a location.
+    
+    Args:
+        query: Risk query parameters
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Risk predictions and analysis
+    """
+    hazards = normalize_hazards(query.hazards)
+    
+    # Get grid ID for location
+    grid_id = grid_system.point_to_grid_id(query.lat, query.lon)
+    
+    # Cached bytes are already ASCII JSON; skip parsing and validation
+    body = await _risk_body(db, grid_id, hazards, query.horizon_hours)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/geocode")
@@ -205,44 +312,79 @@ async def geocode(
     cached_result = await redis_client.get(cache_key)
     
     if cached_result and not settings.debug:
-        import json
-        return json.loads(cached_result)
-    
-    # Simplified geocoding for demo
-    # In production, use a proper geocoding service
-    demo_locations = {
-        "san francisco": {"lat": 37.7749, "lon": -122.4194, "admin_areas": ["California", "San Francisco County"]},
-        "new york": {"lat": 40.7128, "lon": -74.0060, "admin_areas": ["New York", "New York County"]},
-        "chicago": {"lat": 41.8781, "lon": -87.6298, "admin_areas": ["Illinois", "Cook County"]},
-        "miami": {"lat": 25.7617, "lon": -80.1918, "admin_areas": ["Florida", "Miami-Dade County"]},
-        "seattle": {"lat": 47.6062, "lon": -122.3321, "admin_areas": ["Washington", "King County"]},
-    }
-    
-    query_lower = query.lower()
-    result = None
-    
-    for location, coords in demo_locations.items():
-        if location in query_lower:
-            result = {
-                "point": {"lat": coords["lat"], "lon": coords["lon"]},
-                "admin_areas": coords["admin_areas"]
-            }
-            break
-    
-    if not result:
-        # Default to San Francisco for demo
-        result = {
-            "point": {"lat": 37.7749, "lon": -122.4194},
-            "admin_areas": ["California", "San Francisco County"]
-        }
+        return Response(content=cached_result, media_type="application/json")
+    
+    body = ascii_json_dumps(_geocode_demo(query))
     
     # Cache result
     if not settings.debug:
-        import json
         await redis_client.setex(
             cache_key,
-            3600,  # 1 hour cache
-            json.dumps(result, ensure_ascii=True)
+            GEOCODE_CACHE_TTL_SECONDS,
+            body
         )
     
-    return result
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/by-address")
+async def risk_by_address(
+    address: str = Query(..., description="Address or location to assess"),
+    hazards: List[str] = Query(
+        default=["flood", "heat", "smoke", "pm25"],
+        description="Hazard types to query"
+    ),
+    horizon_hours: int = Query(default=24, ge=1, le=72, description="Prediction horizon in hours"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Geocode an address and query its risk predictions in one request.
+    
+    Args:
+        address: Address or location string
+        hazards: Hazard types to query
+        horizon_hours: Prediction horizon in hours
+        db: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Geocoded location and its risk predictions
+    """
+    # Sanitize inputs
+    address = sanitize_text(address)
+    hazards = normalize_hazards(hazards)
+    
+    geocode_key = f"geocode:{address}"
+    cache_key = f"risk:addr:{address}:{_hazards_key(hazards)}:{horizon_hours}"
+    
+    # Geocode and composite result in one round trip; a hit skips Postgres
+    location_body = None
+    if not settings.debug:
+        location_body, cached_result = await cache_mget([geocode_key, cache_key])
+        if cached_result:
+            return Response(content=cached_result, media_type="application/json")
+    
+    if location_body:
+        location = orjson.loads(location_body)
+    else:
+        location = _geocode_demo(address)
+    
+    grid_id = grid_system.point_to_grid_id(location["point"]["lat"], location["point"]["lon"])
+    risk_body = await _risk_body(db, grid_id, hazards, horizon_hours)
+    
+    # Compose from already-serialized parts instead of re-encoding them
+    body = b'{"location":%s,"risk":%s}' % (
+        location_body or ascii_json_dumps(location),
+        risk_body,
+    )
+    
+    # Cache result
+    if not settings.debug:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            if not location_body:
+                pipe.setex(geocode_key, GEOCODE_CACHE_TTL_SECONDS, ascii_json_dumps(location))
+            _cache_risk_body(pipe, grid_id, cache_key, body)
+            await pipe.execute()
+    
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,79 @@
+"""
+Identifier utilities.
+"""
+
+import base64
+import os
+import threading
+import time
+import uuid
+
+# rand_a (12 bits) and rand_b (62 bits) together, treated as one counter
+_UUID7_RAND_BITS = 74
+_UUID7_RAND_B_MASK = (1 << 62) - 1
+
+# Last timestamp and random field issued, so IDs from this process are
+# strictly increasing even within one millisecond
+_uuid7_lock = threading.Lock()
+_uuid7_last = (0, 0)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID version 7 (RFC 9562).
+    
+    The leading 48 bits are the Unix timestamp in milliseconds, so new keys
+    append to the right edge of B-tree indexes instead of scattering.
+    Within a millisecond (or if the clock steps back) the previous random
+    field is incremented instead, so IDs from one process are monotonic.
+    
+    Returns:
+        UUIDv7
+    """
+    global _uuid7_last
+    
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big") >> (80 - _UUID7_RAND_BITS)
+    
+    with _uuid7_lock:
+        last_ms, last_rand = _uuid7_last
+        if timestamp_ms <= last_ms:
+            timestamp_ms, rand = last_ms, last_rand + 1
+            if rand >> _UUID7_RAND_BITS:
+                # Random field exhausted; borrow the next millisecond
+                timestamp_ms, rand = last_ms + 1, 0
+        _uuid7_last = (timestamp_ms, rand)
+    
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76  # Version
+    value |= (rand >> 62) << 64  # rand_a (12 bits)
+    value |= 0b10 << 62  # Variant
+    value |= rand & _UUID7_RAND_B_MASK  # rand_b (62 bits)
+    
+    return uuid.UUID(int=value)
+
+
+def uuid_to_b64(value: uuid.UUID) -> str:
+    """
+    Encode a UUID as 22-character unpadded URL-safe base64 for compact cache keys.
+    
+    Args:
+        value: UUID to encode
+        
+    Returns:
+        Base64 string
+    """
+    return base64.urlsafe_b64encode(value.bytes).rstrip(b"=").decode("ascii")
+
+
+def b64_to_uuid(value: str) -> uuid.UUID:
+    """
+    Decode a UUID produced by uuid_to_b64.
+    
+    Args:
+        value: Base64 string
+        
+    Returns:
+        Decoded UUID
+    """
+    return uuid.UUID(bytes=base64.urlsafe_b64decode(value + "=="))
@@ -0,0 +1,76 @@
+"""
+Shared JSON response classes.
+"""
+
+import json
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively (UUID/datetime are native)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def ascii_json_dumps(content: Any) -> bytes:
+    """
+    Serialize content to compact, ASCII-only JSON.
+    
+    orjson handles the common all-ASCII case; payloads containing
+    non-ASCII text are re-encoded with escapes by the stdlib C encoder.
+    
+    Args:
+        content: JSON-serializable content
+        
+    Returns:
+        ASCII-encoded JSON bytes
+    """
+    body = orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+    if body.isascii():
+        return body
+    return json.dumps(
+        orjson.loads(body), ensure_ascii=True, separators=(",", ":")
+    ).encode("ascii")
+
+
+class ASCIIJSONResponse(ORJSONResponse):
+    """
+    Compact JSON response guaranteed to be ASCII-only.
+    
+    Used as the application's default response class so every route,
+    including error responses, is encoded once with no post-processing.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return ascii_json_dumps(content)
+
+
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> ASCIIJSONResponse:
+    """Render HTTP errors with the compact response class."""
+    return ASCIIJSONResponse(
+        content={"detail": exc.detail},
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
+    )
+
+
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ASCIIJSONResponse:
+    """Render request validation errors with the compact response class."""
+    return ASCIIJSONResponse(
+        content={"detail": jsonable_encoder(exc.errors())},
+        status_code=422,
+    )
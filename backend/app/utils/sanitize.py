@@ -10,6 +10,23 @@ import unicodedata
 from typing import Any, Dict, List, Union
 
 
+# Typographic dashes and quotes with ASCII equivalents
+_TYPOGRAPHIC_TABLE = {
+    0x2014: ' - ',  # em dash
+    0x2013: ' - ',  # en dash
+    0x201c: '"',  # left double quotation mark
+    0x201d: '"',  # right double quotation mark
+    0x2018: "'",  # left single quotation mark
+    0x2019: "'",  # right single quotation mark
+}
+
+# Non-printable ASCII left after whitespace has been normalized
+_ASCII_CONTROL_BYTES = bytes(range(32)) + b'\x7f'
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPACES_RE = re.compile(rb' +')
+
+
 def sanitize_text(text: str) -> str:
     """
     Sanitize text to contain only ASCII characters.
@@ -28,29 +45,25 @@ def sanitize_text(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
     
-    # Replace em dashes and en dashes with " - "
-    text = text.replace('\u2014', ' - ')  # em dash
-    text = text.replace('\u2013', ' - ')  # en dash
+    # Fast path: printable ASCII with no runs of spaces or edge spaces is
+    # already in sanitized form (all checks run in C)
+    if (text.isascii() and text.isprintable() and '  ' not in text
+            and not text.startswith(' ') and not text.endswith(' ')):
+        return text
     
-    # Replace smart quotes with straight quotes
-    text = text.replace('\u201c', '"')  # left double quotation mark
-    text = text.replace('\u201d', '"')  # right double quotation mark
-    text = text.replace('\u2018', "'")  # left single quotation mark
-    text = text.replace('\u2019', "'")  # right single quotation mark
+    # Replace em/en dashes with " - " and smart quotes with straight quotes
+    text = text.translate(_TYPOGRAPHIC_TABLE)
     
-    # Remove emojis and other non-ASCII characters
-    # Keep only printable ASCII characters (32-126)
-    sanitized = ''
-    for char in text:
-        if ord(char) < 128 and char.isprintable():
-            sanitized += char
-        elif char.isspace():
-            sanitized += ' '  # Replace non-ASCII whitespace with space
+    # Map all whitespace, including non-ASCII, to spaces before the ASCII
+    # codec would drop it
+    text = _WHITESPACE_RE.sub(' ', text)
     
-    # Clean up multiple spaces
-    sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+    # Remove emojis and other non-ASCII characters in the codec, then
+    # non-printable ASCII, both as C loops over bytes
+    data = text.encode('ascii', 'ignore').translate(None, _ASCII_CONTROL_BYTES)
     
-    return sanitized
+    # Clean up multiple spaces left by removed characters
+    return _SPACES_RE.sub(b' ', data).strip().decode('ascii')
 
 
 def sanitize_dict(obj: Any) -> Any:
@@ -107,28 +120,36 @@ def find_non_ascii_chars(text: str) -> List[str]:
     return non_ascii
 
 
-# Blocked character patterns for pre-commit hooks
+# Blocked character patterns for pre-commit hooks, as UTF-8 byte sequences
 BLOCKED_PATTERNS = [
-    r'\xE2\x80\x94',  # em dash
-    r'\xE2\x80\x93',  # en dash
-    r'[\xF0\x9F\x80-\xF0\x9F\xBF]',  # emoji range 1
-    r'[\xF0\x9F\x8C-\xF0\x9F\xA6]',  # emoji range 2
-    r'[\xF0\x9F\xAA-\xF0\x9F\xBF]',  # emoji range 3
+    rb'\xE2\x80\x94',  # em dash
+    rb'\xE2\x80\x93',  # en dash
+    rb'\xF0\x9F[\x80-\xBF][\x80-\xBF]',  # emoji range 1 (U+1F000-U+1FFFF)
+    rb'\xF0\x9F[\x8C-\xA6][\x80-\xBF]',  # emoji range 2 (U+1F300-U+1F9BF)
+    rb'\xF0\x9F[\xAA-\xBF][\x80-\xBF]',  # emoji range 3 (U+1FA80-U+1FFFF)
 ]
 
+_BLOCKED_PATTERNS_RE = [re.compile(pattern) for pattern in BLOCKED_PATTERNS]
+_ANY_BLOCKED_RE = re.compile(b'|'.join(BLOCKED_PATTERNS))
+
 
-def check_blocked_patterns(text: str) -> List[str]:
+def check_blocked_patterns(text: Union[str, bytes]) -> List[bytes]:
     """
     Check for blocked character patterns in text.
     
     Args:
-        text: Text to check
+        text: Text to check, as str or UTF-8 bytes
         
     Returns:
         List of blocked patterns found
     """
-    found_patterns = []
-    for pattern in BLOCKED_PATTERNS:
-        if re.search(pattern, text):
-            found_patterns.append(pattern)
-    return found_patterns
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    
+    # Single scan rejects clean input; patterns overlap, so only text that
+    # contains something blocked is checked pattern by pattern
+    if not _ANY_BLOCKED_RE.search(data):
+        return []
+    return [
+        pattern for pattern, compiled in zip(BLOCKED_PATTERNS, _BLOCKED_PATTERNS_RE, strict=True)
+        if compiled.search(data)
+    ]
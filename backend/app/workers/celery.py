@@ -30,23 +30,11 @@ celery_app.conf.update(
 
 # Beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
-    # Data ingestion tasks
-    "fetch-weather-data": {
-        "task": "app.workers.tasks.fetch_weather_data",
-        "schedule": crontab(minute="*/15"),  # Every 15 minutes
-    },
-    "fetch-air-quality-data": {
-        "task": "app.workers.tasks.fetch_air_quality_data",
-        "schedule": crontab(minute="*/10"),  # Every 10 minutes
-    },
-    "fetch-hydrology-data": {
-        "task": "app.workers.tasks.fetch_hydrology_data",
+    # Data ingestion: all providers fetched concurrently in one task
+    "fetch-all-sources": {
+        "task": "app.workers.tasks.fetch_all_sources",
         "schedule": crontab(minute="*/5"),  # Every 5 minutes
     },
-    "fetch-fire-data": {
-        "task": "app.workers.tasks.fetch_fire_data",
-        "schedule": crontab(minute="*/30"),  # Every 30 minutes
-    },
     
     # Model inference tasks
     "run-flood-inference": {
@@ -80,6 +68,12 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(hour=2, minute=0),  # Daily at 2 AM
     },
     
+    # Partition maintenance (daily)
+    "maintain-hazard-partitions": {
+        "task": "app.workers.tasks.maintain_hazard_partitions",
+        "schedule": crontab(hour=0, minute=5),  # Daily at 00:05
+    },
+    
     # Cleanup tasks
     "cleanup-old-data": {
         "task": "app.workers.tasks.cleanup_old_data",
@@ -95,6 +89,7 @@ celery_app.conf.task_routes = {
     "app.workers.tasks.process_alerts": {"queue": "alerts"},
     "app.workers.tasks.retrain_models": {"queue": "training"},
     "app.workers.tasks.cleanup_*": {"queue": "maintenance"},
+    "app.workers.tasks.maintain_*": {"queue": "maintenance"},
 }
 
 if __name__ == "__main__":
@@ -4,12 +4,164 @@ Celery tasks for Climate Risk Lens.
 
 import asyncio
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Any
+import httpx
 from celery import current_task
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
 from app.workers.celery import celery_app
 from app.utils.sanitize import sanitize_text
 
 
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """
+    Get the worker's shared HTTP client.
+    
+    Connections are kept alive and reused across tasks, so repeat
+    webhooks to the same host skip the TCP/TLS handshake.
+    
+    Returns:
+        Pooled HTTP client
+    """
+    from app.config import settings
+    
+    return httpx.Client(
+        timeout=settings.webhook_timeout_seconds,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+
+
+async def _fetch_weather() -> Dict[str, Any]:
+    """Fetch weather data from NOAA/NWS."""
+    # In production, this would call the actual weather API
+    # For demo, just log the fetch
+    print(f"Fetching weather data at {datetime.utcnow()}")
+    
+    # Simulate some work
+    await asyncio.sleep(2)
+    
+    return {
+        "status": "success",
+        "timestamp": datetime.utcnow().isoformat(),
+        "records_fetched": 100,
+        "source": "NOAA"
+    }
+
+
+async def _fetch_air_quality() -> Dict[str, Any]:
+    """Fetch air quality data from EPA AirNow and PurpleAir."""
+    print(f"Fetching air quality data at {datetime.utcnow()}")
+    
+    # Simulate some work
+    await asyncio.sleep(1)
+    
+    return {
+        "status": "success",
+        "timestamp": datetime.utcnow().isoformat(),
+        "records_fetched": 50,
+        "sources": ["EPA AirNow", "PurpleAir"]
+    }
+
+
+async def _fetch_hydrology() -> Dict[str, Any]:
+    """Fetch hydrology data from USGS."""
+    print(f"Fetching hydrology data at {datetime.utcnow()}")
+    
+    # Simulate some work
+    await asyncio.sleep(1.5)
+    
+    return {
+        "status": "success",
+        "timestamp": datetime.utcnow().isoformat(),
+        "records_fetched": 75,
+        "source": "USGS"
+    }
+
+
+async def _fetch_fire() -> Dict[str, Any]:
+    """Fetch fire detection data from NASA FIRMS."""
+    print(f"Fetching fire data at {datetime.utcnow()}")
+    
+    # Simulate some work
+    await asyncio.sleep(3)
+    
+    return {
+        "status": "success",
+        "timestamp": datetime.utcnow().isoformat(),
+        "records_fetched": 25,
+        "source": "NASA FIRMS"
+    }
+
+
+SOURCE_FETCHERS = {
+    "weather": _fetch_weather,
+    "air_quality": _fetch_air_quality,
+    "hydrology": _fetch_hydrology,
+    "fire": _fetch_fire,
+}
+
+
+async def _run_fetchers(*names: str) -> Dict[str, Any]:
+    """
+    Run source fetchers concurrently.
+    
+    Args:
+        names: Keys of SOURCE_FETCHERS to run
+        
+    Returns:
+        Dict mapping source name to its result or raised exception
+    """
+    results = await asyncio.gather(
+        *(SOURCE_FETCHERS[name]() for name in names),
+        return_exceptions=True,
+    )
+    return dict(zip(names, results, strict=True))
+
+
+def _fetch_source(name: str) -> Dict[str, Any]:
+    """Run a single source fetcher, re-raising its error."""
+    result = asyncio.run(_run_fetchers(name))[name]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+@celery_app.task(bind=True)
+def fetch_all_sources(self):
+    """
+    Fetch weather, air quality, hydrology and fire data concurrently.
+    
+    One worker slot waits on all providers at once instead of one task
+    per provider; a failing source is reported without discarding the
+    others.
+    
+    Returns:
+        Dict with per-source fetch results
+    """
+    try:
+        results = asyncio.run(_run_fetchers(*SOURCE_FETCHERS))
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=60, max_retries=3)
+    
+    errors = {
+        name: str(result) for name, result in results.items()
+        if isinstance(result, BaseException)
+    }
+    if len(errors) == len(results):
+        raise self.retry(exc=RuntimeError(f"All sources failed: {errors}"), countdown=60, max_retries=3)
+    
+    return {
+        "status": "partial" if errors else "success",
+        "timestamp": datetime.utcnow().isoformat(),
+        "sources": {
+            name: result for name, result in results.items()
+            if not isinstance(result, BaseException)
+        },
+        "errors": errors
+    }
+
+
 @celery_app.task(bind=True)
 def fetch_weather_data(self):
     """
@@ -19,20 +171,7 @@ def fetch_weather_data(self):
         Dict with fetch results
     """
     try:
-        # In production, this would call the actual weather API
-        # For demo, just log the task
-        print(f"Fetching weather data at {datetime.utcnow()}")
-        
-        # Simulate some work
-        import time
-        time.sleep(2)
-        
-        return {
-            "status": "success",
-            "timestamp": datetime.utcnow().isoformat(),
-            "records_fetched": 100,
-            "source": "NOAA"
-        }
+        return _fetch_source("weather")
     except Exception as exc:
         # Retry the task
         raise self.retry(exc=exc, countdown=60, max_retries=3)
@@ -47,18 +186,7 @@ def fetch_air_quality_data(self):
         Dict with fetch results
     """
     try:
-        print(f"Fetching air quality data at {datetime.utcnow()}")
-        
-        # Simulate some work
-        import time
-        time.sleep(1)
-        
-        return {
-            "status": "success",
-            "timestamp": datetime.utcnow().isoformat(),
-            "records_fetched": 50,
-            "sources": ["EPA AirNow", "PurpleAir"]
-        }
+        return _fetch_source("air_quality")
     except Exception as exc:
         raise self.retry(exc=exc, countdown=60, max_retries=3)
 
@@ -72,18 +200,7 @@ def fetch_hydrology_data(self):
         Dict with fetch results
     """
     try:
-        print(f"Fetching hydrology data at {datetime.utcnow()}")
-        
-        # Simulate some work
-        import time
-        time.sleep(1.5)
-        
-        return {
-            "status": "success",
-            "timestamp": datetime.utcnow().isoformat(),
-            "records_fetched": 75,
-            "source": "USGS"
-        }
+        return _fetch_source("hydrology")
     except Exception as exc:
         raise self.retry(exc=exc, countdown=60, max_retries=3)
 
@@ -97,18 +214,7 @@ def fetch_fire_data(self):
         Dict with fetch results
     """
     try:
-        print(f"Fetching fire data at {datetime.utcnow()}")
-        
-        # Simulate some work
-        import time
-        time.sleep(3)
-        
-        return {
-            "status": "success",
-            "timestamp": datetime.utcnow().isoformat(),
-            "records_fetched": 25,
-            "source": "NASA FIRMS"
-        }
+        return _fetch_source("fire")
     except Exception as exc:
         raise self.retry(exc=exc, countdown=60, max_retries=3)
 
@@ -291,6 +397,52 @@ def cleanup_old_data(self):
         raise self.retry(exc=exc, countdown=300, max_retries=2)
 
 
+@celery_app.task(bind=True)
+def maintain_hazard_partitions(self):
+    """
+    Provision upcoming hazards partitions and drop expired ones.
+    
+    Returns:
+        Dict with maintenance results
+    """
+    from app.config import settings
+    from app.db.database import AsyncSessionLocal
+    from app.db.partitions import ensure_hazard_partitions, drop_hazard_partitions_before
+    
+    async def _maintain():
+        today = datetime.utcnow().date()
+        async with AsyncSessionLocal() as session:
+            created = await ensure_hazard_partitions(
+                session, today, settings.hazard_partition_premake_days + 1
+            )
+            dropped = await drop_hazard_partitions_before(
+                session, today - timedelta(days=settings.hazard_retention_days)
+            )
+        return created, dropped
+    
+    try:
+        created, dropped = asyncio.run(_maintain())
+        
+        return {
+            "status": "success",
+            "timestamp": datetime.utcnow().isoformat(),
+            "partitions_ensured": created,
+            "partitions_dropped": dropped
+        }
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=300, max_retries=2)
+
+
+def _is_retryable_webhook_error(exc: BaseException) -> bool:
+    """Retry connection failures, timeouts, throttling and server errors."""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
 @celery_app.task
 def send_webhook_notification(webhook_url: str, payload: Dict[str, Any]):
     """
@@ -304,8 +456,6 @@ def send_webhook_notification(webhook_url: str, payload: Dict[str, Any]):
         Dict with notification results
     """
     try:
-        import requests
-        
         # Sanitize payload
         sanitized_payload = {}
         for key, value in payload.items():
@@ -314,14 +464,23 @@ def send_webhook_notification(webhook_url: str, payload: Dict[str, Any]):
             else:
                 sanitized_payload[key] = value
         
-        response = requests.post(
-            webhook_url,
-            json=sanitized_payload,
-            timeout=30,
-            headers={"Content-Type": "application/json"}
-        )
+        from app.config import settings
         
-        response.raise_for_status()
+        # Transient failures are retried with exponential backoff on the
+        # same pooled connection; client errors fail immediately
+        for attempt in Retrying(
+            stop=stop_after_attempt(settings.webhook_retry_attempts),
+            wait=wait_exponential(multiplier=0.5, max=10),
+            retry=retry_if_exception(_is_retryable_webhook_error),
+            reraise=True,
+        ):
+            with attempt:
+                response = _get_http_client().post(
+                    webhook_url,
+                    json=sanitized_payload,
+                    headers={"Content-Type": "application/json"}
+                )
+                response.raise_for_status()
         
         return {
             "status": "success",
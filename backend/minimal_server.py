@@ -3,16 +3,121 @@
 Minimal Climate Risk Lens server without complex dependencies.
 """
 
-from fastapi import FastAPI, HTTPException
+from typing import Any, Dict, Tuple
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from datetime import datetime
-import json
+import orjson
+import ormsgpack
+
+# Naive datetimes are UTC and rendered as ISO 8601 with a "Z" suffix
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# Opt-in binary encoding for clients sending this Accept header
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=ORJSON_OPTIONS)
+
+
+def _timestamp_slot(payload: Dict[str, Any], depth: int = 1) -> Tuple[bytes, bytes]:
+    """
+    Pre-serialize a payload, leaving a slot for a trailing "timestamp" key.
+    
+    Args:
+        payload: Static part of the response
+        depth: Nesting level of the object that receives the timestamp;
+            each enclosing object must end with the one nested in it
+        
+    Returns:
+        Tuple of (prefix, suffix) bytes to join around a serialized timestamp
+    """
+    body = orjson.dumps(payload)
+    return body[:-depth] + b',"timestamp":', body[-depth:]
+
+
+def _json_with_timestamp(slot: Tuple[bytes, bytes], status_code: int = 200) -> Response:
+    """Fill a pre-serialized payload's timestamp slot with the current time."""
+    prefix, suffix = slot
+    timestamp = orjson.dumps(datetime.utcnow(), option=ORJSON_OPTIONS)
+    return Response(
+        content=prefix + timestamp + suffix,
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+def _wants_msgpack(request: Request) -> bool:
+    """Whether the client asked for msgpack instead of JSON."""
+    return MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _msgpack_response(body: bytes) -> Response:
+    """Wrap a msgpack body; Vary tells caches the encoding follows Accept."""
+    return Response(content=body, media_type=MSGPACK_MEDIA_TYPE, headers={"Vary": "Accept"})
+
+
+# Static response bodies, serialized once at import
+_ROOT_SLOT = _timestamp_slot({
+    "message": "Climate Risk Lens API",
+    "version": "0.1.0",
+    "status": "running",
+    "endpoints": {
+        "health": "/health",
+        "docs": "/docs",
+        "risk": "/api/v1/risk",
+        "assets": "/api/v1/assets"
+    }
+})
+
+_HEALTH_SLOT = _timestamp_slot({
+    "status": "healthy",
+    "version": "0.1.0",
+    "services": {
+        "api": "healthy",
+        "database": "not_connected",
+        "redis": "not_connected"
+    }
+})
+
+_RISK_DATA = {
+    "flood_risk": 0.3,
+    "heat_risk": 0.4,
+    "smoke_risk": 0.2
+}
+
+_RISK_SLOT = _timestamp_slot({
+    "message": "Climate risk data endpoint",
+    "data": _RISK_DATA
+}, depth=2)
+
+_ERROR_SLOT = _timestamp_slot({
+    "error": "Internal server error",
+    "message": "An unexpected error occurred"
+})
+
+_ASSETS_PAYLOAD = {
+    "message": "Assets endpoint",
+    "assets": [
+        {"id": 1, "name": "Demo Site 1", "risk_level": "medium"},
+        {"id": 2, "name": "Demo Site 2", "risk_level": "low"}
+    ]
+}
+
+_ASSETS_BYTES = orjson.dumps(_ASSETS_PAYLOAD)
+_ASSETS_MSGPACK = ormsgpack.packb(_ASSETS_PAYLOAD)
+
 
 app = FastAPI(
     title="Climate Risk Lens API",
     description="A production-grade geospatial platform for forecasting local climate hazards",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -24,75 +129,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.get("/")
+# Handlers return Response objects, which FastAPI sends as-is: no
+# jsonable_encoder pass and no response validation. response_class only
+# documents the media type
+_MSGPACK_ALTERNATIVE = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+
+@app.get("/", response_class=ORJSONResponse)
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": "Climate Risk Lens API",
-        "version": "0.1.0",
-        "status": "running",
-        "timestamp": datetime.utcnow().isoformat(),
-        "endpoints": {
-            "health": "/health",
-            "docs": "/docs",
-            "risk": "/api/v1/risk",
-            "assets": "/api/v1/assets"
-        }
-    }
+    return _json_with_timestamp(_ROOT_SLOT)
 
-@app.get("/health")
+@app.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "0.1.0",
-        "services": {
-            "api": "healthy",
-            "database": "not_connected",
-            "redis": "not_connected"
-        }
-    }
+    return _json_with_timestamp(_HEALTH_SLOT)
 
-@app.get("/api/v1/risk")
-async def get_risk_data():
+@app.get("/api/v1/risk", response_class=ORJSONResponse, responses=_MSGPACK_ALTERNATIVE)
+async def get_risk_data(request: Request):
     """Get climate risk data (demo endpoint)."""
-    return {
-        "message": "Climate risk data endpoint",
-        "data": {
-            "flood_risk": 0.3,
-            "heat_risk": 0.4,
-            "smoke_risk": 0.2,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    }
+    if _wants_msgpack(request):
+        return _msgpack_response(ormsgpack.packb(
+            {
+                "message": "Climate risk data endpoint",
+                "data": {**_RISK_DATA, "timestamp": datetime.utcnow()}
+            },
+            option=ormsgpack.OPT_NAIVE_UTC
+        ))
+    response = _json_with_timestamp(_RISK_SLOT)
+    response.headers["Vary"] = "Accept"
+    return response
 
-@app.get("/api/v1/assets")
-async def get_assets():
+@app.get("/api/v1/assets", response_class=ORJSONResponse, responses=_MSGPACK_ALTERNATIVE)
+async def get_assets(request: Request):
     """Get assets endpoint (demo)."""
-    return {
-        "message": "Assets endpoint",
-        "assets": [
-            {"id": 1, "name": "Demo Site 1", "risk_level": "medium"},
-            {"id": 2, "name": "Demo Site 2", "risk_level": "low"}
-        ]
-    }
+    if _wants_msgpack(request):
+        return _msgpack_response(_ASSETS_MSGPACK)
+    return Response(content=_ASSETS_BYTES, media_type="application/json", headers={"Vary": "Accept"})
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler with ASCII sanitization."""
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal server error",
-            "message": "An unexpected error occurred",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    )
+    return _json_with_timestamp(_ERROR_SLOT, status_code=500)
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     print("Starting Climate Risk Lens API...")
     print("API Documentation: http://localhost:8000/docs")
     print("Health Check: http://localhost:8000/health")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        # uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
@@ -4,6 +4,7 @@ Simple test to verify basic functionality.
 """
 
 import asyncio
+import sys
 from fastapi import FastAPI
 import uvicorn
 
@@ -19,4 +20,11 @@ async def health():
 
 if __name__ == "__main__":
     print("Starting Climate Risk Lens API on http://localhost:8002")
-    uvicorn.run(app, host="127.0.0.1", port=8002, log_level="info")
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=8002,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="info",
+    )
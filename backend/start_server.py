@@ -3,9 +3,22 @@
 Simple server startup script for development.
 """
 
+import os
+import sys
 import uvicorn
-from app.main import create_app
+from app.config import settings
 
 if __name__ == "__main__":
-    app = create_app()
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # Reload (debug only) is single-process; otherwise run one worker per
+    # core unless API_WORKERS says otherwise. Both need an import string
+    workers = 1 if settings.debug else settings.api_workers or os.cpu_count() or 1
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=settings.debug,
+        workers=workers,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=settings.debug,
+    )
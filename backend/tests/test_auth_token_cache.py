@@ -0,0 +1,85 @@
+"""
+Tests for the verified-token cache in the auth routes.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.orm import Session
+
+from app.db.models import Feedback, Organization, User
+from app.routes import auth
+
+
+@pytest.fixture
+def session():
+    """Sync SQLite session with just the tables a user touches."""
+    engine = create_engine("sqlite://")
+    for model in (Organization, User, Feedback):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+    auth._token_cache.clear()
+
+
+@pytest.fixture
+def user(session):
+    """A committed user with a cached token."""
+    user = User(email="analyst@example.com", role="analyst")
+    session.add(user)
+    session.commit()
+    auth._cache_token("token", time.time() + 600, user)
+    return user
+
+
+def test_unrelated_change_keeps_cached_token(session, user):
+    """Editing other columns leaves cached tokens alone."""
+    user.email = "renamed@example.com"
+    session.commit()
+
+    assert "token" in auth._token_cache
+
+
+@pytest.mark.parametrize("column,value", [("is_active", False), ("role", "admin")])
+def test_access_change_invalidates_cached_token(session, user, column, value):
+    """Deactivating a user or changing their role drops cached tokens."""
+    setattr(user, column, value)
+    session.commit()
+
+    assert "token" not in auth._token_cache
+
+
+def test_deleting_user_invalidates_cached_token(session, user):
+    """Deleting a user drops cached tokens."""
+    session.delete(user)
+    session.commit()
+
+    assert "token" not in auth._token_cache
+
+
+def test_bulk_update_invalidates_cached_tokens(session, user):
+    """Bulk update() statements bypass mapper events but still clear the cache."""
+    session.execute(update(User).where(User.id == user.id).values(is_active=False))
+    session.commit()
+
+    assert "token" not in auth._token_cache
+
+
+def test_bulk_delete_invalidates_cached_tokens(session, user):
+    """Bulk delete() statements clear the cache."""
+    session.execute(delete(User).where(User.id == user.id))
+    session.commit()
+
+    assert "token" not in auth._token_cache
+
+
+def test_cached_token_lifetime_is_bounded_by_ttl(user, monkeypatch):
+    """Entries expire after the cache TTL even when the token lives longer."""
+    until, _ = auth._token_cache["token"]
+    assert until <= time.time() + auth.settings.auth_token_cache_ttl_seconds
+
+    monkeypatch.setattr(auth.time, "time", lambda: until)
+    auth._evict_expired_tokens()
+
+    assert "token" not in auth._token_cache
@@ -0,0 +1,38 @@
+"""
+Tests for feedback keyset pagination cursors.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.routes.feedback import _parse_cursor
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 7, 1, 12, 30, 15),
+    datetime(2024, 7, 1, 12, 30, 15, 123456),
+])
+def test_parse_cursor_round_trips_next_cursor_header(created_at):
+    """A cursor built like the X-Next-Cursor header parses back to its key."""
+    feedback_id = uuid.uuid4()
+    cursor = f"{created_at.isoformat()},{feedback_id}"
+
+    assert _parse_cursor(cursor) == (created_at, feedback_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not-a-cursor",
+    f"2024-07-01T12:30:15,{'0' * 8}",
+    f"yesterday,{uuid.uuid4()}",
+    "2024-07-01T12:30:15,",
+])
+def test_parse_cursor_rejects_malformed_cursors(cursor):
+    """Malformed cursors are a 400, not a server error."""
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,70 @@
+"""
+Tests for the geospatial grid system.
+"""
+
+import pytest
+
+from app.geo.grid import GridSystem
+
+INDEX_PAIRS = [
+    (0, 0),
+    (1, -1),
+    (-1, 1),
+    (-1, -1),
+    (367, -1102),
+    (-811, 1620),
+    (2**31 - 1, -(2**31)),
+    (-(2**31), 2**31 - 1),
+]
+
+
+@pytest.mark.parametrize("lat_idx,lon_idx", INDEX_PAIRS)
+def test_encode_decode_round_trip(lat_idx, lon_idx):
+    """Decoding an encoded grid ID returns the original signed indices."""
+    assert GridSystem.decode(GridSystem.encode(lat_idx, lon_idx)) == (lat_idx, lon_idx)
+
+
+def test_encoded_ids_are_unique():
+    """Distinct index pairs never share a grid ID."""
+    ids = {GridSystem.encode(lat, lon) for lat in range(-3, 4) for lon in range(-3, 4)}
+    assert len(ids) == 49
+
+
+@pytest.mark.parametrize("lat_idx,lon_idx", INDEX_PAIRS)
+def test_format_parse_round_trip(lat_idx, lon_idx):
+    """The legacy "{lat}_{lon}" string form round-trips through parse."""
+    grid = GridSystem()
+    grid_id = grid.encode(lat_idx, lon_idx)
+
+    assert grid.format(grid_id) == f"{lat_idx}_{lon_idx}"
+    assert grid.parse(grid.format(grid_id)) == grid_id
+
+
+def test_parse_rejects_malformed_ids():
+    """Malformed grid ID strings raise ValueError."""
+    with pytest.raises(ValueError):
+        GridSystem().parse("12-34")
+
+
+def test_point_maps_into_its_grid_cell():
+    """A point's grid cell contains that point."""
+    grid = GridSystem()
+    lat, lon = 37.7749, -122.4194
+    grid_id = grid.point_to_grid_id(lat, lon)
+
+    min_lon, min_lat, max_lon, max_lat = grid.grid_id_to_bounds(grid_id)
+    assert min_lat <= lat < max_lat
+    assert min_lon <= lon < max_lon
+
+
+def test_polygon_cache_is_keyed_on_cell_size():
+    """Grid systems with different cell sizes get their own polygons."""
+    pytest.importorskip("shapely")
+    grid_id = GridSystem.encode(10, -20)
+
+    small = GridSystem(grid_size_km=1.0).grid_id_to_polygon(grid_id)
+    large = GridSystem(grid_size_km=2.0).grid_id_to_polygon(grid_id)
+
+    assert small is GridSystem(grid_size_km=1.0).grid_id_to_polygon(grid_id)
+    assert small.bounds == GridSystem(grid_size_km=1.0).grid_id_to_bounds(grid_id)
+    assert large.bounds == GridSystem(grid_size_km=2.0).grid_id_to_bounds(grid_id)
@@ -0,0 +1,42 @@
+"""
+Tests for identifier utilities.
+"""
+
+import time
+import uuid
+
+from app.utils.ids import b64_to_uuid, uuid7, uuid_to_b64
+
+
+def test_uuid7_version_and_variant_bits():
+    """Every ID carries version 7 and the RFC 9562 variant."""
+    for value in (uuid7() for _ in range(2000)):
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert (value.int >> 76) & 0xF == 0x7
+        assert (value.int >> 62) & 0b11 == 0b10
+
+
+def test_uuid7_is_monotonic():
+    """Sequential IDs sort in generation order, even within a millisecond."""
+    values = [uuid7() for _ in range(1000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_leads_with_millisecond_timestamp():
+    """The top 48 bits are the generation time in Unix milliseconds."""
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+
+    assert before <= value.int >> 80 <= after + 1
+
+
+def test_b64_round_trip():
+    """uuid_to_b64 and b64_to_uuid are inverses."""
+    value = uuid7()
+    encoded = uuid_to_b64(value)
+
+    assert len(encoded) == 22
+    assert b64_to_uuid(encoded) == value
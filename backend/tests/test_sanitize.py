@@ -0,0 +1,74 @@
+"""
+Tests for ASCII-only text sanitization.
+"""
+
+import random
+import re
+
+import pytest
+
+from app.utils.sanitize import sanitize_text
+
+
+def _reference_sanitize_text(text: str) -> str:
+    """Original per-character implementation the fast version must match."""
+    for old, new in [('\u2014', ' - '), ('\u2013', ' - '), ('\u201c', '"'),
+                     ('\u201d', '"'), ('\u2018', "'"), ('\u2019', "'")]:
+        text = text.replace(old, new)
+    sanitized = ''
+    for char in text:
+        if ord(char) < 128 and char.isprintable():
+            sanitized += char
+        elif char.isspace():
+            sanitized += ' '
+    return re.sub(r'\s+', ' ', sanitized).strip()
+
+
+# Characters that exercise every branch: plain and control ASCII, ASCII and
+# non-ASCII whitespace, typographic dashes and quotes, accents and emoji
+_ALPHABET = (
+    list('abcXYZ019 .,-"\'') + ['\t', '\n', '\r', '\x00', '\x1b', '\x1c', '\x7f']
+    + ['\u00a0', '\u2003', '\u3000', '\u2028', '\u0085']
+    + ['\u2014', '\u2013', '\u201c', '\u201d', '\u2018', '\u2019']
+    + ['\u00e9', '\u00fc', '\u4e2d', '\U0001f30a', '\U0001f525', '\ufeff']
+)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "plain ascii",
+    "  leading and trailing  ",
+    "double  space",
+    "Flood risk \u2014 high",
+    "\u201cquoted\u201d and \u2018single\u2019",
+    "Wildfire \U0001f525 smoke\U0001f32b\ufe0f",
+    "caf\u00e9\u00a0na\u00efve",
+    "tabs\tand\nnewlines\r\n",
+    "\x00control\x7fbytes\x1b",
+])
+def test_sanitize_text_matches_reference(text):
+    """Known inputs sanitize exactly as the original implementation did."""
+    assert sanitize_text(text) == _reference_sanitize_text(text)
+
+
+def test_sanitize_text_matches_reference_on_random_text():
+    """Random mixes of tricky characters sanitize as the original did."""
+    rng = random.Random(1234)
+    for _ in range(5000):
+        text = ''.join(rng.choices(_ALPHABET, k=rng.randint(0, 24)))
+        assert sanitize_text(text) == _reference_sanitize_text(text), repr(text)
+
+
+def test_sanitize_text_output_is_idempotent_ascii():
+    """Sanitized text is printable ASCII and a fixed point of sanitize_text."""
+    text = "  Smoke \u2014 \u201cunhealthy\u201d\u00a0\U0001f637  "
+    sanitized = sanitize_text(text)
+
+    assert sanitized == 'Smoke - "unhealthy"'
+    assert sanitized.isascii() and sanitized.isprintable()
+    assert sanitize_text(sanitized) == sanitized
+
+
+def test_sanitize_text_stringifies_non_strings():
+    """Non-string input is converted with str()."""
+    assert sanitize_text(42) == "42"
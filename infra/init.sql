@@ -13,18 +13,19 @@ GRANT ALL PRIVILEGES ON DATABASE mlflow TO postgres;
 
 -- Create a simple grid for demo purposes
 CREATE TABLE IF NOT EXISTS demo_grid (
-    grid_id VARCHAR(50) PRIMARY KEY,
+    grid_id BIGINT PRIMARY KEY,
     geom GEOMETRY(POLYGON, 4326),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Insert some demo grid cells around San Francisco
+-- Grid IDs pack (lat_idx << 32) | (lon_idx & 0xFFFFFFFF) into a BIGINT
 INSERT INTO demo_grid (grid_id, geom) VALUES
-('37_-122', ST_MakeEnvelope(-122.5, 37.5, -122.4, 37.6, 4326)),
-('37_-121', ST_MakeEnvelope(-122.4, 37.5, -122.3, 37.6, 4326)),
-('37_-123', ST_MakeEnvelope(-122.6, 37.5, -122.5, 37.6, 4326)),
-('38_-122', ST_MakeEnvelope(-122.5, 37.6, -122.4, 37.7, 4326)),
-('36_-122', ST_MakeEnvelope(-122.5, 37.4, -122.4, 37.5, 4326))
+((37::BIGINT << 32) | (-122 & 4294967295), ST_MakeEnvelope(-122.5, 37.5, -122.4, 37.6, 4326)),
+((37::BIGINT << 32) | (-121 & 4294967295), ST_MakeEnvelope(-122.4, 37.5, -122.3, 37.6, 4326)),
+((37::BIGINT << 32) | (-123 & 4294967295), ST_MakeEnvelope(-122.6, 37.5, -122.5, 37.6, 4326)),
+((38::BIGINT << 32) | (-122 & 4294967295), ST_MakeEnvelope(-122.5, 37.6, -122.4, 37.7, 4326)),
+((36::BIGINT << 32) | (-122 & 4294967295), ST_MakeEnvelope(-122.5, 37.4, -122.4, 37.5, 4326))
 ON CONFLICT (grid_id) DO NOTHING;
 
 -- Create indexes
@@ -32,13 +33,13 @@ CREATE INDEX IF NOT EXISTS idx_demo_grid_geom ON demo_grid USING GIST (geom);
 
 -- Create a function to get grid ID from lat/lon
 CREATE OR REPLACE FUNCTION get_grid_id(lat FLOAT, lon FLOAT)
-RETURNS VARCHAR(50) AS $$
+RETURNS BIGINT AS $$
 DECLARE
-    grid_lat INTEGER;
-    grid_lon INTEGER;
+    grid_lat BIGINT;
+    grid_lon BIGINT;
 BEGIN
     grid_lat := FLOOR(lat);
     grid_lon := FLOOR(lon);
-    RETURN grid_lat || '_' || grid_lon;
+    RETURN (grid_lat << 32) | (grid_lon & 4294967295);
 END;
 $$ LANGUAGE plpgsql;
@@ -2,6 +2,7 @@
 Ensemble meta-learner for combining multiple hazard models.
 """
 
+import math
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -73,6 +74,117 @@ class MetaLearner(nn.Module):
         return output
 
 
+class StackedMetaLearner(nn.Module):
+    """
+    A stack of identically shaped meta-learners evaluated together.
+    
+    Holds one weight slice per model and runs all of them with a single
+    batched matmul per layer instead of one small matmul per model.
+    """
+    
+    def __init__(
+        self,
+        num_models: int,
+        input_size: int,
+        hidden_size: int = 64,
+        num_layers: int = 2,
+        dropout: float = 0.1,
+        names: Optional[List[str]] = None
+    ):
+        super().__init__()
+        
+        self.num_models = num_models
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        
+        # Model names, in slice order; legacy checkpoints key one MetaLearner per name
+        self.names = list(names) if names is not None else [str(i) for i in range(num_models)]
+        
+        # Input projection, one (input_size, hidden_size) slice per model
+        self.input_weight = nn.Parameter(torch.empty(num_models, input_size, hidden_size))
+        self.input_bias = nn.Parameter(torch.empty(num_models, hidden_size))
+        
+        # Hidden layers
+        self.hidden_weights = nn.ParameterList([
+            nn.Parameter(torch.empty(num_models, hidden_size, hidden_size))
+            for _ in range(num_layers - 1)
+        ])
+        self.hidden_biases = nn.ParameterList([
+            nn.Parameter(torch.empty(num_models, hidden_size))
+            for _ in range(num_layers - 1)
+        ])
+        
+        # Output projection
+        self.output_weight = nn.Parameter(torch.empty(num_models, hidden_size, 1))
+        self.output_bias = nn.Parameter(torch.empty(num_models, 1))
+        
+        # Dropout
+        self.dropout = nn.Dropout(dropout)
+        
+        self.reset_parameters()
+        self._register_load_state_dict_pre_hook(self._stack_legacy_weights)
+    
+    def _stack_legacy_weights(self, state_dict: Dict[str, torch.Tensor], prefix: str, *args) -> None:
+        """Load-state-dict pre-hook stacking legacy per-model MetaLearner weights."""
+        layers = [("input_projection", "input_weight", "input_bias")]
+        layers += [
+            (f"hidden_layers.{j}.0", f"hidden_weights.{j}", f"hidden_biases.{j}")
+            for j in range(len(self.hidden_weights))
+        ]
+        layers += [("output_projection", "output_weight", "output_bias")]
+        
+        for legacy, weight, bias in layers:
+            keys = [f"{prefix}{name}.{legacy}" for name in self.names]
+            if all(f"{key}.weight" in state_dict and f"{key}.bias" in state_dict for key in keys):
+                # nn.Linear stores (out, in); the stack holds (in, out) slices
+                state_dict[f"{prefix}{weight}"] = torch.stack(
+                    [state_dict.pop(f"{key}.weight").t() for key in keys]
+                )
+                state_dict[f"{prefix}{bias}"] = torch.stack(
+                    [state_dict.pop(f"{key}.bias") for key in keys]
+                )
+    
+    def reset_parameters(self):
+        """Initialize every slice the way nn.Linear initializes its weights."""
+        weights = [self.input_weight, *self.hidden_weights, self.output_weight]
+        biases = [self.input_bias, *self.hidden_biases, self.output_bias]
+        for weight, bias in zip(weights, biases):
+            bound = 1 / math.sqrt(weight.size(1))
+            nn.init.uniform_(weight, -bound, bound)
+            nn.init.uniform_(bias, -bound, bound)
+    
+    def forward(self, x: torch.Tensor, index: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """
+        Forward pass through all meta-learners at once.
+        
+        Args:
+            x: Input features of shape (batch_size, num_selected, input_size)
+            index: Optional indices of the models to apply, one per
+                input slot; defaults to all models in order
+            
+        Returns:
+            Meta-learner outputs of shape (batch_size, num_selected, 1)
+        """
+        def select(param: torch.Tensor) -> torch.Tensor:
+            return param if index is None else param.index_select(0, index)
+        
+        # Input projection
+        x = torch.einsum("bhi,hij->bhj", x, select(self.input_weight)) + select(self.input_bias)
+        x = F.relu(x)
+        x = self.dropout(x)
+        
+        # Hidden layers
+        for weight, bias in zip(self.hidden_weights, self.hidden_biases):
+            x = torch.einsum("bhi,hij->bhj", x, select(weight)) + select(bias)
+            x = F.relu(x)
+            x = self.dropout(x)
+        
+        # Output projection
+        output = torch.einsum("bhi,hij->bhj", x, select(self.output_weight)) + select(self.output_bias)
+        
+        return output
+
+
 class EnsembleModel(nn.Module):
     """
     Ensemble model that combines multiple hazard predictions.
@@ -94,16 +206,16 @@ class EnsembleModel(nn.Module):
         self.hazard_models = nn.ModuleDict(hazard_models)
         self.feature_size = feature_size
         
-        # Meta-learner for each hazard
-        self.meta_learners = nn.ModuleDict({
-            hazard: MetaLearner(
-                input_size=feature_size,
-                hidden_size=hidden_size,
-                num_layers=num_layers,
-                dropout=dropout
-            )
-            for hazard in hazard_models.keys()
-        })
+        # Meta-learner for each hazard, stacked so they run as one batched call
+        self.hazards = list(hazard_models.keys())
+        self.meta_learners = StackedMetaLearner(
+            num_models=len(self.hazards),
+            input_size=feature_size,
+            hidden_size=hidden_size,
+            num_layers=num_layers,
+            dropout=dropout,
+            names=self.hazards
+        )
         
         # Global meta-learner for cross-hazard interactions
         self.global_meta_learner = MetaLearner(
@@ -132,46 +244,48 @@ class EnsembleModel(nn.Module):
         Returns:
             Dictionary with ensemble predictions
         """
-        batch_size = next(iter(x.values())).size(0)
-        device = next(iter(x.values())).device
+        first_input = next(iter(x.values()))
+        batch_size, device = first_input.size(0), first_input.device
         
-        # Get predictions from individual hazard models
+        # Get predictions from individual hazard models, collecting the
+        # risk probability of each (the meta-learning feature) as we go
         hazard_predictions = {}
-        for hazard, model in self.hazard_models.items():
+        present = []
+        risk_probs = []
+        for i, (hazard, model) in enumerate(self.hazard_models.items()):
             if hazard in x:
                 pred = model(x[hazard])
                 hazard_predictions[hazard] = pred
+                present.append(i)
+                risk_probs.append(pred['risk_prob'])
         
-        # Extract features for meta-learning
-        meta_features = []
-        for hazard, pred in hazard_predictions.items():
-            # Use risk probability as feature
-            risk_feat = pred['risk_prob'].unsqueeze(-1)
-            meta_features.append(risk_feat)
-        
-        # Concatenate features
-        if meta_features:
-            combined_features = torch.cat(meta_features, dim=-1)
+        # Features for meta-learning, one column per available hazard
+        if risk_probs:
+            combined_features = torch.stack(risk_probs, dim=-1)
         else:
             # Fallback if no predictions
             combined_features = torch.zeros(batch_size, self.feature_size, device=device)
         
-        # Apply meta-learners
+        # Apply meta-learners for all available hazards in one batched call
         meta_outputs = {}
-        for hazard, meta_learner in self.meta_learners.items():
-            if hazard in hazard_predictions:
-                # Use individual hazard features
-                hazard_feat = hazard_predictions[hazard]['risk_prob'].unsqueeze(-1)
-                meta_output = meta_learner(hazard_feat)
-                meta_outputs[hazard] = meta_output
+        meta_mean = None
+        if present:
+            # Individual hazard features, shape (batch, hazards, 1)
+            hazard_feats = combined_features.unsqueeze(-1)
+            index = None
+            if len(present) < len(self.hazards):
+                index = torch.tensor(present, device=device)
+            stacked_output = self.meta_learners(hazard_feats, index)
+            meta_mean = stacked_output.mean(dim=-2)
+            for slot, i in enumerate(present):
+                meta_outputs[self.hazards[i]] = stacked_output[:, slot]
         
         # Global meta-learner for cross-hazard interactions
         global_output = self.global_meta_learner(combined_features)
         
         # Combine meta-learner outputs
-        if meta_outputs:
-            meta_combined = torch.cat(list(meta_outputs.values()), dim=-1)
-            final_output = (meta_combined.mean(dim=-1, keepdim=True) + global_output) / 2
+        if meta_mean is not None:
+            final_output = (meta_mean + global_output) / 2
         else:
             final_output = global_output
         
@@ -207,6 +321,23 @@ class CalibrationLayer(nn.Module):
         self.num_bins = num_bins
         self.bin_edges = nn.Parameter(torch.linspace(0, 1, num_bins + 1))
         self.bin_values = nn.Parameter(torch.linspace(0, 1, num_bins))
+        
+        # Reduced-precision copy of bin_values for inference, built by
+        # freeze_for_inference(); not saved with the state dict
+        self.register_buffer("bin_values_lut", None, persistent=False)
+    
+    @torch.no_grad()
+    def freeze_for_inference(self, dtype: torch.dtype = torch.bfloat16):
+        """
+        Snapshot bin_values into a compact lookup table for inference.
+        
+        Bin edges stay in full precision so inputs land in the same bins.
+        Call again after further training to refresh the table.
+        
+        Args:
+            dtype: Storage dtype of the lookup table
+        """
+        self.bin_values_lut = self.bin_values.detach().to(dtype)
     
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """
@@ -218,10 +349,13 @@ class CalibrationLayer(nn.Module):
         Returns:
             Calibrated predictions
         """
-        # Find bin indices
-        bin_indices = torch.bucketize(x, self.bin_edges[1:-1])
+        # Find bin indices (same semantics as torch.bucketize)
+        bin_indices = torch.searchsorted(self.bin_edges[1:-1], x)
+        
+        # Get calibrated values, from the compact table when frozen
+        if self.bin_values_lut is not None and not self.training:
+            return self.bin_values_lut[bin_indices].to(x.dtype)
         
-        # Get calibrated values
         calibrated = self.bin_values[bin_indices]
         
         return calibrated
@@ -44,52 +44,89 @@ class SmokeEncoder(nn.Module):
         # Dropout
         self.dropout = nn.Dropout(dropout)
     
-    def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]:
+    def forward(
+        self,
+        x: torch.Tensor,
+        lengths: Optional[torch.Tensor] = None
+    ) -> Tuple[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]:
         """
         Forward pass through encoder.
         
         Args:
             x: Input tensor of shape (batch_size, seq_len, input_size)
+            lengths: Optional valid length of each sequence; padded steps
+                are packed away so the LSTM does not compute over them
             
         Returns:
-            Encoded sequence and hidden states
+            Encoded sequence and (h, c) states of shape
+            (num_layers, batch_size, hidden_size), ready to seed the decoder
         """
+        seq_len = x.size(1)
+        
         # Input projection
         x = self.input_projection(x)
         x = self.dropout(x)
         
         # LSTM encoding
-        lstm_out, hidden = self.lstm(x)
+        if lengths is None:
+            lstm_out, hidden = self.lstm(x)
+        else:
+            packed = nn.utils.rnn.pack_padded_sequence(
+                x, lengths.cpu(), batch_first=True, enforce_sorted=False
+            )
+            lstm_out, hidden = self.lstm(packed)
+            lstm_out, _ = nn.utils.rnn.pad_packed_sequence(
+                lstm_out, batch_first=True, total_length=seq_len
+            )
         
         # Output projection
         encoded = self.output_projection(lstm_out)
         
+        # Sum the forward and backward directions of each layer so the states
+        # match the unidirectional decoder's (num_layers, batch, hidden) shape
+        hidden = tuple(
+            state.view(self.num_layers, 2, *state.shape[1:]).sum(dim=1)
+            for state in hidden
+        )
+        
         return encoded, hidden
 
 
 class SmokeDecoder(nn.Module):
-    """Decoder for smoke prediction with attention mechanism."""
+    """
+    Decoder for smoke prediction with attention mechanism.
+    
+    Decodes all target steps in one pass: a learned query per horizon step
+    attends over the encoder output, and the LSTM runs over the attended
+    sequence in a single call rather than one step at a time.
+    """
     
     def __init__(
         self,
         hidden_size: int = 128,
         output_size: int = 1,
         num_layers: int = 2,
-        dropout: float = 0.1
+        dropout: float = 0.1,
+        max_target_length: int = 24
     ):
         super().__init__()
         
         self.hidden_size = hidden_size
         self.output_size = output_size
         self.num_layers = num_layers
+        self.max_target_length = max_target_length
         
-        # Attention mechanism
-        self.attention = nn.MultiheadAttention(
-            embed_dim=hidden_size,
-            num_heads=4,
-            dropout=dropout,
-            batch_first=True
-        )
+        # Learned query for each step of the prediction horizon
+        self.step_queries = nn.Parameter(torch.randn(max_target_length, hidden_size) * 0.02)
+        
+        # Attention mechanism, run through F.scaled_dot_product_attention so
+        # fused (flash / memory-efficient) kernels are used where available
+        self.num_heads = 4
+        self.head_dim = hidden_size // self.num_heads
+        self.attention_dropout = dropout
+        self.q_proj = nn.Linear(hidden_size, hidden_size)
+        self.kv_proj = nn.Linear(hidden_size, hidden_size * 2)
+        self.attn_out_proj = nn.Linear(hidden_size, hidden_size)
         
         # LSTM decoder
         self.lstm = nn.LSTM(
@@ -110,7 +147,8 @@ class SmokeDecoder(nn.Module):
         self, 
         encoder_output: torch.Tensor, 
         hidden: Tuple[torch.Tensor, torch.Tensor],
-        target_length: int
+        target_length: int,
+        lengths: Optional[torch.Tensor] = None
     ) -> torch.Tensor:
         """
         Forward pass through decoder.
@@ -119,35 +157,51 @@ class SmokeDecoder(nn.Module):
             encoder_output: Encoded sequence from encoder
             hidden: Hidden states from encoder
             target_length: Length of target sequence
+            lengths: Optional valid length of each encoded sequence; padded
+                encoder steps are masked out of the attention
             
         Returns:
             Decoded sequence
         """
-        batch_size = encoder_output.size(0)
+        if target_length > self.max_target_length:
+            raise ValueError(
+                f"target_length {target_length} exceeds max_target_length {self.max_target_length}"
+            )
         
-        # Initialize decoder input
-        decoder_input = torch.zeros(batch_size, 1, self.hidden_size, device=encoder_output.device)
+        batch_size, source_length, _ = encoder_output.size()
+        
+        # Queries are shared by the whole batch, so project them once:
+        # (target_length, hidden) -> (batch, heads, target_length, head_dim)
+        q = self.q_proj(self.step_queries[:target_length])
+        q = q.view(1, target_length, self.num_heads, self.head_dim).transpose(1, 2)
+        q = q.expand(batch_size, -1, -1, -1)
+        
+        # Keys and values from one fused projection of the encoder output
+        k, v = self.kv_proj(encoder_output).view(
+            batch_size, source_length, 2, self.num_heads, self.head_dim
+        ).permute(2, 0, 3, 1, 4)
+        
+        # Key-padding mask, (batch, 1, 1, source_length) with True = attend
+        attn_mask = None
+        if lengths is not None:
+            positions = torch.arange(source_length, device=encoder_output.device)
+            attn_mask = positions < lengths.to(encoder_output.device).unsqueeze(1)
+            attn_mask = attn_mask.view(batch_size, 1, 1, source_length)
+        
+        # Apply attention for all steps at once
+        attn_output = F.scaled_dot_product_attention(
+            q, k, v,
+            attn_mask=attn_mask,
+            dropout_p=self.attention_dropout if self.training else 0.0
+        )
+        attn_output = attn_output.transpose(1, 2).reshape(batch_size, target_length, self.hidden_size)
+        attn_output = self.attn_out_proj(attn_output)
         
-        outputs = []
+        # LSTM decoding over the whole horizon
+        lstm_out, _ = self.lstm(attn_output, hidden)
         
-        for _ in range(target_length):
-            # Apply attention
-            attn_output, _ = self.attention(
-                decoder_input, encoder_output, encoder_output
-            )
-            
-            # LSTM decoding
-            lstm_out, hidden = self.lstm(attn_output, hidden)
-            
-            # Output projection
-            output = self.output_projection(lstm_out)
-            outputs.append(output)
-            
-            # Use output as next input
-            decoder_input = lstm_out
-        
-        # Concatenate outputs
-        decoded = torch.cat(outputs, dim=1)
+        # Output projection
+        decoded = self.output_projection(lstm_out)
         
         return decoded
 
@@ -155,11 +209,12 @@ class SmokeDecoder(nn.Module):
 class WindFieldProcessor(nn.Module):
     """Process wind field data for smoke advection."""
     
-    def __init__(self, wind_size: int = 4, hidden_size: int = 64):
+    def __init__(self, wind_size: int = 4, hidden_size: int = 64, pool_size: Optional[int] = 8):
         super().__init__()
         
         self.wind_size = wind_size  # u, v, speed, direction
         self.hidden_size = hidden_size
+        self.pool_size = pool_size  # Max spatial size fed to the advection conv
         
         # Wind field processing
         self.wind_conv = nn.Conv2d(wind_size, hidden_size, kernel_size=3, padding=1)
@@ -168,6 +223,9 @@ class WindFieldProcessor(nn.Module):
         # Advection features
         self.advection_conv = nn.Conv2d(hidden_size, hidden_size, kernel_size=3, padding=1)
         self.advection_norm = nn.BatchNorm2d(hidden_size)
+        
+        # NHWC conv weights to match the channels-last input below
+        self.to(memory_format=torch.channels_last)
     
     def forward(self, wind_data: torch.Tensor) -> torch.Tensor:
         """
@@ -177,19 +235,29 @@ class WindFieldProcessor(nn.Module):
             wind_data: Wind field tensor of shape (batch, seq_len, height, width, wind_size)
             
         Returns:
-            Processed wind features
+            Processed wind features of shape (batch, seq_len, height', width', hidden),
+            spatially pooled to at most pool_size x pool_size
         """
         batch_size, seq_len, height, width, _ = wind_data.size()
         
-        # Reshape for convolution
-        wind_reshaped = wind_data.view(batch_size * seq_len, height, width, self.wind_size)
+        # Reshape for convolution; the permuted view is already channels-last
+        wind_reshaped = wind_data.reshape(batch_size * seq_len, height, width, self.wind_size)
         wind_reshaped = wind_reshaped.permute(0, 3, 1, 2)  # (batch*seq, wind_size, height, width)
+        wind_reshaped = wind_reshaped.contiguous(memory_format=torch.channels_last)
         
         # Process wind field
         wind_features = F.relu(self.wind_norm(self.wind_conv(wind_reshaped)))
         
+        # Shrink the grid before the second conv; callers only keep the spatial mean
+        if self.pool_size is not None and (height > self.pool_size or width > self.pool_size):
+            wind_features = F.adaptive_avg_pool2d(
+                wind_features, (min(height, self.pool_size), min(width, self.pool_size))
+            )
+            height, width = wind_features.shape[-2:]
+        
         # Advection features
         advection_features = F.relu(self.advection_norm(self.advection_conv(wind_features)))
+        advection_features = advection_features.contiguous(memory_format=torch.channels_last)
         
         # Reshape back
         advection_features = advection_features.permute(0, 2, 3, 1)  # (batch*seq, height, width, hidden)
@@ -211,26 +279,39 @@ class FireDetectionProcessor(nn.Module):
         self.fire_embedding = nn.Linear(fire_size, hidden_size)
         self.fire_norm = nn.LayerNorm(hidden_size)
     
-    def forward(self, fire_data: torch.Tensor) -> torch.Tensor:
+    def forward(
+        self,
+        fire_data: torch.Tensor,
+        fire_mask: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
         """
-        Process fire detection data.
+        Process fire detection data, pooled over detections.
+        
+        Detections are averaged before the embedding, so the projection,
+        LayerNorm and ReLU run once per timestep rather than once per fire.
+        The embedding is linear, so the projected mean is unchanged, but
+        LayerNorm and ReLU now act on the pooled vector instead of being
+        averaged per detection. Outputs therefore differ from the
+        per-detection version, and checkpoints trained with it need
+        retraining rather than loading as-is.
         
         Args:
             fire_data: Fire detection tensor of shape (batch, seq_len, num_fires, fire_size)
+            fire_mask: Optional boolean tensor of shape (batch, seq_len, num_fires),
+                True for real detections and False for padding
             
         Returns:
-            Processed fire features
+            Pooled fire features of shape (batch, seq_len, hidden)
         """
-        batch_size, seq_len, num_fires, _ = fire_data.size()
+        # Mean over (valid) detections, shape (batch, seq_len, fire_size)
+        if fire_mask is None:
+            fire_pooled = fire_data.mean(dim=2)
+        else:
+            weights = fire_mask.unsqueeze(-1).to(fire_data.dtype)
+            fire_pooled = (fire_data * weights).sum(dim=2) / weights.sum(dim=2).clamp(min=1)
         
-        # Reshape for processing
-        fire_reshaped = fire_data.view(batch_size * seq_len * num_fires, self.fire_size)
-        
-        # Process fire detections
-        fire_features = F.relu(self.fire_norm(self.fire_embedding(fire_reshaped)))
-        
-        # Reshape back
-        fire_features = fire_features.view(batch_size, seq_len, num_fires, self.hidden_size)
+        # Process pooled detections
+        fire_features = F.relu(self.fire_norm(self.fire_embedding(fire_pooled)))
         
         return fire_features
 
@@ -267,8 +348,11 @@ class SmokeSeqModel(nn.Module):
         # Fire detection processor
         self.fire_processor = FireDetectionProcessor(fire_size, hidden_size)
         
-        # Feature fusion
-        self.feature_fusion = nn.Linear(hidden_size * 3, hidden_size)  # pm25 + wind + fire
+        # Feature fusion: one projection per source, summed, which equals a
+        # single Linear over the concatenation without materializing it
+        self.fuse_pm25 = nn.Linear(pm25_size, hidden_size)
+        self.fuse_wind = nn.Linear(hidden_size, hidden_size, bias=False)
+        self.fuse_fire = nn.Linear(hidden_size, hidden_size, bias=False)
         
         # Encoder
         self.encoder = SmokeEncoder(
@@ -278,12 +362,13 @@ class SmokeSeqModel(nn.Module):
             dropout=dropout
         )
         
-        # Decoder
+        # Decoder, emitting hidden features for the quantile heads
         self.decoder = SmokeDecoder(
             hidden_size=hidden_size,
-            output_size=1,
+            output_size=hidden_size,
             num_layers=num_layers,
-            dropout=dropout
+            dropout=dropout,
+            max_target_length=prediction_horizon
         )
         
         # Output heads for different quantiles
@@ -299,7 +384,9 @@ class SmokeSeqModel(nn.Module):
         self, 
         pm25_data: torch.Tensor,
         wind_data: torch.Tensor,
-        fire_data: torch.Tensor
+        fire_data: torch.Tensor,
+        fire_mask: Optional[torch.Tensor] = None,
+        lengths: Optional[torch.Tensor] = None
     ) -> Dict[str, torch.Tensor]:
         """
         Forward pass through smoke prediction model.
@@ -308,6 +395,8 @@ class SmokeSeqModel(nn.Module):
             pm25_data: PM2.5 data of shape (batch, seq_len, pm25_size)
             wind_data: Wind field data of shape (batch, seq_len, height, width, wind_size)
             fire_data: Fire detection data of shape (batch, seq_len, num_fires, fire_size)
+            fire_mask: Optional mask of valid detections, shape (batch, seq_len, num_fires)
+            lengths: Optional valid length of each input sequence, shape (batch,)
             
         Returns:
             Dictionary with risk probability and quantiles
@@ -319,30 +408,29 @@ class SmokeSeqModel(nn.Module):
         # Average over spatial dimensions
         wind_features = wind_features.mean(dim=(2, 3))  # (batch, seq_len, hidden)
         
-        # Process fire detections
-        fire_features = self.fire_processor(fire_data)
-        # Average over fire detections
-        fire_features = fire_features.mean(dim=2)  # (batch, seq_len, hidden)
+        # Process fire detections, pooled over detections
+        fire_features = self.fire_processor(fire_data, fire_mask)  # (batch, seq_len, hidden)
         
         # Fuse features
-        fused_features = torch.cat([pm25_data, wind_features, fire_features], dim=-1)
-        fused_features = self.feature_fusion(fused_features)
+        fused_features = (
+            self.fuse_pm25(pm25_data)
+            + self.fuse_wind(wind_features)
+            + self.fuse_fire(fire_features)
+        )
         
         # Encode sequence
-        encoded, hidden = self.encoder(fused_features)
+        encoded, hidden = self.encoder(fused_features, lengths)
         
         # Decode for prediction horizon
-        decoded = self.decoder(encoded, hidden, self.prediction_horizon)
+        decoded = self.decoder(encoded, hidden, self.prediction_horizon, lengths)
         
         # Get quantile predictions
-        quantiles = []
-        for head in self.quantile_heads:
-            quantile = self.quantile_activation(head(decoded))
-            quantiles.append(quantile)
+        quantile_logits = [head(decoded) for head in self.quantile_heads]
+        quantiles = [self.quantile_activation(logit) for logit in quantile_logits]
         
-        # Calculate risk probability from PM2.5 levels
+        # Calculate risk probability from the median PM2.5 level
         # Risk increases with PM2.5 concentration
-        risk_prob = self.risk_activation(decoded)
+        risk_prob = self.risk_activation(quantile_logits[1])
         
         return {
             'risk_prob': risk_prob.mean(dim=1),  # Average over prediction horizon
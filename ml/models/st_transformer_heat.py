@@ -8,6 +8,57 @@ import torch.nn.functional as F
 from typing import Dict, List, Optional, Tuple
 import numpy as np
 
+# APEX's fused LayerNorm when installed (same parameters as nn.LayerNorm)
+try:
+    from apex.normalization import FusedLayerNorm as LayerNorm
+except ImportError:
+    from torch.nn import LayerNorm
+
+
+def _merge_qkv_weights(state_dict: Dict[str, torch.Tensor], prefix: str, *args) -> None:
+    """Load-state-dict pre-hook folding legacy q/k/v_linear weights into qkv."""
+    for param in ("weight", "bias"):
+        keys = [f"{prefix}{name}_linear.{param}" for name in ("q", "k", "v")]
+        if all(key in state_dict for key in keys):
+            state_dict[f"{prefix}qkv.{param}"] = torch.cat(
+                [state_dict.pop(key) for key in keys], dim=0
+            )
+
+
+def _as_attention_mask(
+    mask: Optional[torch.Tensor],
+    batch_shape: Optional[torch.Size] = None
+) -> Optional[torch.Tensor]:
+    """
+    Normalize an attention mask for F.scaled_dot_product_attention on
+    4-D (flattened batch, heads, query, key) inputs.
+    
+    Boolean masks (True = attend) are used as-is; other masks follow the
+    legacy convention where 0 means masked. A (query, key) mask broadcasts
+    as is. A (batch, query, key) mask holds one mask per sample along the
+    first of batch_shape; it is expanded over the remaining batch dims and
+    flattened to (prod(batch_shape), 1, query, key). 4-D masks are taken to
+    be in that flattened form already.
+    
+    Args:
+        mask: Attention mask, or None
+        batch_shape: Leading (batch) dims of the attention input
+        
+    Returns:
+        Boolean mask broadcastable to the SDPA attention scores, or None
+    """
+    if mask is None:
+        return None
+    if mask.dtype != torch.bool:
+        mask = mask != 0
+    if mask.dim() == 3:
+        if batch_shape is None:
+            batch_shape = mask.shape[:1]
+        query_key = mask.shape[-2:]
+        mask = mask.view(mask.size(0), *([1] * (len(batch_shape) - 1)), *query_key)
+        mask = mask.expand(*batch_shape, *query_key).reshape(-1, 1, *query_key)
+    return mask
+
 
 class SpatialAttention(nn.Module):
     """Spatial attention mechanism for geographic features."""
@@ -21,11 +72,10 @@ class SpatialAttention(nn.Module):
         
         assert hidden_size % num_heads == 0, "Hidden size must be divisible by num_heads"
         
-        # Linear projections
-        self.q_linear = nn.Linear(hidden_size, hidden_size)
-        self.k_linear = nn.Linear(hidden_size, hidden_size)
-        self.v_linear = nn.Linear(hidden_size, hidden_size)
+        # Linear projections, Q/K/V fused into one GEMM
+        self.qkv = nn.Linear(hidden_size, 3 * hidden_size)
         self.out_linear = nn.Linear(hidden_size, hidden_size)
+        self._register_load_state_dict_pre_hook(_merge_qkv_weights)
         
         # Spatial position encoding
         self.spatial_encoding = nn.Parameter(torch.randn(1, 1, hidden_size))
@@ -35,43 +85,34 @@ class SpatialAttention(nn.Module):
         Forward pass through spatial attention.
         
         Args:
-            x: Input tensor of shape (batch_size, num_locations, hidden_size)
-            spatial_mask: Optional spatial adjacency mask
+            x: Input tensor of shape (..., num_locations, hidden_size); all
+                leading dimensions are treated as batch dimensions
+            spatial_mask: Optional spatial adjacency mask, boolean with
+                True = attend (0/1 masks are also accepted); see
+                _as_attention_mask for the accepted shapes
             
         Returns:
             Output tensor with spatial attention applied
         """
-        batch_size, num_locations, _ = x.size()
+        *batch_shape, num_locations, _ = x.size()
         
         # Add spatial encoding
         x = x + self.spatial_encoding
         
-        # Linear projections
-        Q = self.q_linear(x)
-        K = self.k_linear(x)
-        V = self.v_linear(x)
-        
-        # Reshape for multi-head attention
-        Q = Q.view(batch_size, num_locations, self.num_heads, self.head_size).transpose(1, 2)
-        K = K.view(batch_size, num_locations, self.num_heads, self.head_size).transpose(1, 2)
-        V = V.view(batch_size, num_locations, self.num_heads, self.head_size).transpose(1, 2)
-        
-        # Scaled dot-product attention
-        scores = torch.matmul(Q, K.transpose(-2, -1)) / np.sqrt(self.head_size)
-        
-        # Apply spatial mask if provided
-        if spatial_mask is not None:
-            scores = scores.masked_fill(spatial_mask == 0, -1e9)
+        # Fused Q/K/V projection with the batch dims flattened, so SDPA gets
+        # the 4-D (batch, heads, num_locations, head_size) inputs its fused
+        # kernels need; reshape is a view when the projection output is contiguous
+        Q, K, V = self.qkv(x).reshape(
+            -1, num_locations, 3, self.num_heads, self.head_size
+        ).permute(2, 0, 3, 1, 4)
         
-        attention_weights = F.softmax(scores, dim=-1)
-        
-        # Apply attention to values
-        context = torch.matmul(attention_weights, V)
-        
-        # Reshape and project output
-        context = context.transpose(1, 2).contiguous().view(
-            batch_size, num_locations, self.hidden_size
+        # Scaled dot-product attention (fused kernel)
+        context = F.scaled_dot_product_attention(
+            Q, K, V, attn_mask=_as_attention_mask(spatial_mask, torch.Size(batch_shape))
         )
+        
+        # Merge heads, restore the batch dims and project output
+        context = context.transpose(1, 2).reshape(*batch_shape, num_locations, self.hidden_size)
         output = self.out_linear(context)
         
         return output
@@ -80,18 +121,18 @@ class SpatialAttention(nn.Module):
 class TemporalAttention(nn.Module):
     """Temporal attention mechanism for time series features."""
     
-    def __init__(self, hidden_size: int, num_heads: int = 4):
+    def __init__(self, hidden_size: int, num_heads: int = 4, causal: bool = False):
         super().__init__()
         
         self.hidden_size = hidden_size
         self.num_heads = num_heads
         self.head_size = hidden_size // num_heads
+        self.causal = causal  # Each step attends only to itself and earlier steps
         
-        # Linear projections
-        self.q_linear = nn.Linear(hidden_size, hidden_size)
-        self.k_linear = nn.Linear(hidden_size, hidden_size)
-        self.v_linear = nn.Linear(hidden_size, hidden_size)
+        # Linear projections, Q/K/V fused into one GEMM
+        self.qkv = nn.Linear(hidden_size, 3 * hidden_size)
         self.out_linear = nn.Linear(hidden_size, hidden_size)
+        self._register_load_state_dict_pre_hook(_merge_qkv_weights)
         
         # Positional encoding
         self.pos_encoding = PositionalEncoding(hidden_size)
@@ -101,43 +142,41 @@ class TemporalAttention(nn.Module):
         Forward pass through temporal attention.
         
         Args:
-            x: Input tensor of shape (batch_size, seq_len, hidden_size)
-            temporal_mask: Optional temporal mask
+            x: Input tensor of shape (..., seq_len, hidden_size); all leading
+                dimensions are treated as batch dimensions
+            temporal_mask: Optional temporal mask, boolean with True = attend
+                (0/1 masks are also accepted); see _as_attention_mask for
+                the accepted shapes
             
         Returns:
             Output tensor with temporal attention applied
         """
-        batch_size, seq_len, _ = x.size()
+        *batch_shape, seq_len, _ = x.size()
         
         # Add positional encoding
         x = self.pos_encoding(x)
         
-        # Linear projections
-        Q = self.q_linear(x)
-        K = self.k_linear(x)
-        V = self.v_linear(x)
-        
-        # Reshape for multi-head attention
-        Q = Q.view(batch_size, seq_len, self.num_heads, self.head_size).transpose(1, 2)
-        K = K.view(batch_size, seq_len, self.num_heads, self.head_size).transpose(1, 2)
-        V = V.view(batch_size, seq_len, self.num_heads, self.head_size).transpose(1, 2)
-        
-        # Scaled dot-product attention
-        scores = torch.matmul(Q, K.transpose(-2, -1)) / np.sqrt(self.head_size)
-        
-        # Apply temporal mask if provided
-        if temporal_mask is not None:
-            scores = scores.masked_fill(temporal_mask == 0, -1e9)
-        
-        attention_weights = F.softmax(scores, dim=-1)
-        
-        # Apply attention to values
-        context = torch.matmul(attention_weights, V)
-        
-        # Reshape and project output
-        context = context.transpose(1, 2).contiguous().view(
-            batch_size, seq_len, self.hidden_size
+        # Fused Q/K/V projection with the batch dims flattened, so SDPA gets
+        # the 4-D (batch, heads, seq_len, head_size) inputs its fused kernels
+        # need; reshape is a view when the projection output is contiguous
+        Q, K, V = self.qkv(x).reshape(
+            -1, seq_len, 3, self.num_heads, self.head_size
+        ).permute(2, 0, 3, 1, 4)
+        
+        # Scaled dot-product attention (fused kernel). A plain causal mask
+        # goes through is_causal so no dense triangle is built
+        attn_mask = _as_attention_mask(temporal_mask, torch.Size(batch_shape))
+        is_causal = self.causal and attn_mask is None
+        if self.causal and attn_mask is not None:
+            attn_mask = attn_mask & torch.ones(
+                seq_len, seq_len, dtype=torch.bool, device=x.device
+            ).tril()
+        context = F.scaled_dot_product_attention(
+            Q, K, V, attn_mask=attn_mask, is_causal=is_causal
         )
+        
+        # Merge heads, restore the batch dims and project output
+        context = context.transpose(1, 2).reshape(*batch_shape, seq_len, self.hidden_size)
         output = self.out_linear(context)
         
         return output
@@ -158,12 +197,12 @@ class PositionalEncoding(nn.Module):
         pe[:, 0::2] = torch.sin(position * div_term)
         pe[:, 1::2] = torch.cos(position * div_term)
         
-        pe = pe.unsqueeze(0)
+        pe = pe.unsqueeze(0).contiguous()  # (1, max_len, hidden)
         self.register_buffer('pe', pe)
     
     def forward(self, x: torch.Tensor) -> torch.Tensor:
-        """Add positional encoding to input."""
-        return x + self.pe[:, :x.size(1), :]
+        """Add positional encoding along the second-to-last (sequence) dim."""
+        return x + self.pe[:, :x.size(-2)].to(x.dtype)
 
 
 class SpatiotemporalTransformer(nn.Module):
@@ -180,7 +219,8 @@ class SpatiotemporalTransformer(nn.Module):
         hidden_size: int = 64,
         num_heads: int = 4,
         num_layers: int = 3,
-        dropout: float = 0.1
+        dropout: float = 0.1,
+        causal_temporal: bool = False
     ):
         super().__init__()
         
@@ -198,16 +238,16 @@ class SpatiotemporalTransformer(nn.Module):
         
         # Temporal attention layers
         self.temporal_attention = nn.ModuleList([
-            TemporalAttention(hidden_size, num_heads)
+            TemporalAttention(hidden_size, num_heads, causal=causal_temporal)
             for _ in range(num_layers)
         ])
         
         # Layer normalization
         self.spatial_norms = nn.ModuleList([
-            nn.LayerNorm(hidden_size) for _ in range(num_layers)
+            LayerNorm(hidden_size) for _ in range(num_layers)
         ])
         self.temporal_norms = nn.ModuleList([
-            nn.LayerNorm(hidden_size) for _ in range(num_layers)
+            LayerNorm(hidden_size) for _ in range(num_layers)
         ])
         
         # Feed-forward networks
@@ -238,49 +278,46 @@ class SpatiotemporalTransformer(nn.Module):
         
         Args:
             x: Input tensor of shape (batch_size, seq_len, num_locations, feature_size)
-            spatial_mask: Optional spatial adjacency mask
-            temporal_mask: Optional temporal mask
+            spatial_mask: Optional spatial adjacency mask, (num_locations, num_locations)
+                or per sample (batch_size, num_locations, num_locations)
+            temporal_mask: Optional temporal mask, (seq_len, seq_len) or per sample
+                (batch_size, seq_len, seq_len)
             
         Returns:
             Output tensor of shape (batch_size, seq_len, num_locations, 1)
         """
-        batch_size, seq_len, num_locations, _ = x.size()
-        
-        # Reshape for processing
-        x = x.view(batch_size * seq_len, num_locations, self.feature_size)
+        # x stays (batch, seq, locations, hidden) throughout; the attention
+        # modules treat all leading dims as batch, so switching between
+        # spatial and temporal attention is a transpose view, not a copy
         
         # Input projection
         x = self.input_projection(x)
         
+        batch_size, seq_len, num_locations, _ = x.size()
+        
+        # Normalize masks once for all layers, flattened to the batch dims
+        # each attention sees: (batch, seq) spatially, (batch, locations) temporally
+        spatial_mask = _as_attention_mask(spatial_mask, torch.Size((batch_size, seq_len)))
+        temporal_mask = _as_attention_mask(temporal_mask, torch.Size((batch_size, num_locations)))
+        
         # Apply spatiotemporal attention layers
         for i in range(len(self.spatial_attention)):
-            # Spatial attention
+            # Spatial attention over locations
             spatial_out = self.spatial_attention[i](x, spatial_mask)
             x = self.spatial_norms[i](x + self.dropout(spatial_out))
             
-            # Temporal attention (reshape for temporal processing)
-            x_temp = x.view(batch_size, seq_len, num_locations, self.hidden_size)
-            x_temp = x_temp.transpose(1, 2)  # (batch, locations, seq, hidden)
-            x_temp = x_temp.contiguous().view(batch_size * num_locations, seq_len, self.hidden_size)
-            
+            # Temporal attention over time steps
+            x_temp = x.transpose(1, 2)  # (batch, locations, seq, hidden) view
             temporal_out = self.temporal_attention[i](x_temp, temporal_mask)
-            x_temp = self.temporal_norms[i](x_temp + self.dropout(temporal_out))
-            
-            # Reshape back
-            x_temp = x_temp.view(batch_size, num_locations, seq_len, self.hidden_size)
-            x_temp = x_temp.transpose(1, 2)  # (batch, seq, locations, hidden)
-            x = x_temp.contiguous().view(batch_size * seq_len, num_locations, self.hidden_size)
+            x = self.temporal_norms[i](x_temp + self.dropout(temporal_out)).transpose(1, 2)
             
             # Feed-forward network
             ff_out = self.feed_forward[i](x)
             x = x + self.dropout(ff_out)
         
-        # Output projection
+        # Output projection, shape (batch, seq, locations, 1)
         output = self.output_projection(x)
         
-        # Reshape to original format
-        output = output.view(batch_size, seq_len, num_locations, 1)
-        
         return output
 
 
@@ -298,7 +335,8 @@ class HeatRiskModel(nn.Module):
         hidden_size: int = 64,
         num_heads: int = 4,
         num_layers: int = 3,
-        dropout: float = 0.1
+        dropout: float = 0.1,
+        compile: bool = False
     ):
         super().__init__()
         
@@ -314,6 +352,13 @@ class HeatRiskModel(nn.Module):
             dropout=dropout
         )
         
+        # Compile the transformer for inference. Module.compile() keeps the
+        # state dict keys unchanged and the model picklable (torch.save of the
+        # whole model reloads it uncompiled); compilation happens on the
+        # first call, so call .eval() before running the model
+        if compile:
+            self.st_transformer.compile(mode="reduce-overhead", fullgraph=True)
+        
         # Output heads for different quantiles
         self.risk_head = nn.Linear(hidden_size, 1)
         self.quantile_heads = nn.ModuleList([
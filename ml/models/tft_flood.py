@@ -4,11 +4,49 @@ Temporal Fusion Transformer for flood risk prediction.
 
 import torch
 import torch.nn as nn
-import torch.nn.functional as F
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional
 import numpy as np
 
 
+def _merge_qkv_weights(state_dict: Dict[str, torch.Tensor], prefix: str, *args) -> None:
+    """Load-state-dict pre-hook folding legacy q/k/v_linear weights into qkv."""
+    for param in ("weight", "bias"):
+        keys = [f"{prefix}{name}_linear.{param}" for name in ("q", "k", "v")]
+        if all(key in state_dict for key in keys):
+            state_dict[f"{prefix}qkv.{param}"] = torch.cat(
+                [state_dict.pop(key) for key in keys], dim=0
+            )
+
+
+# Old per-layer ModuleList parameter names -> nn.TransformerEncoder names
+_LEGACY_ENCODER_KEYS = {
+    "attention_layers.{}.qkv.weight": "encoder.layers.{}.self_attn.in_proj_weight",
+    "attention_layers.{}.qkv.bias": "encoder.layers.{}.self_attn.in_proj_bias",
+    "attention_layers.{}.out_linear.weight": "encoder.layers.{}.self_attn.out_proj.weight",
+    "attention_layers.{}.out_linear.bias": "encoder.layers.{}.self_attn.out_proj.bias",
+    "feed_forward.{}.linear1.weight": "encoder.layers.{}.linear1.weight",
+    "feed_forward.{}.linear1.bias": "encoder.layers.{}.linear1.bias",
+    "feed_forward.{}.linear2.weight": "encoder.layers.{}.linear2.weight",
+    "feed_forward.{}.linear2.bias": "encoder.layers.{}.linear2.bias",
+    "layer_norms1.{}.weight": "encoder.layers.{}.norm1.weight",
+    "layer_norms1.{}.bias": "encoder.layers.{}.norm1.bias",
+    "layer_norms2.{}.weight": "encoder.layers.{}.norm2.weight",
+    "layer_norms2.{}.bias": "encoder.layers.{}.norm2.bias",
+}
+
+
+def _remap_legacy_encoder_weights(state_dict: Dict[str, torch.Tensor], prefix: str, *args) -> None:
+    """Load-state-dict pre-hook mapping the old per-layer ModuleLists onto encoder."""
+    i = 0
+    while f"{prefix}attention_layers.{i}.out_linear.weight" in state_dict:
+        _merge_qkv_weights(state_dict, f"{prefix}attention_layers.{i}.")
+        for old, new in _LEGACY_ENCODER_KEYS.items():
+            key = prefix + old.format(i)
+            if key in state_dict:
+                state_dict[prefix + new.format(i)] = state_dict.pop(key)
+        i += 1
+
+
 class TemporalFusionTransformer(nn.Module):
     """
     Temporal Fusion Transformer for flood risk prediction.
@@ -41,39 +79,41 @@ class TemporalFusionTransformer(nn.Module):
         # Positional encoding
         self.pos_encoding = PositionalEncoding(hidden_size, dropout)
         
-        # Multi-head attention layers
-        self.attention_layers = nn.ModuleList([
-            MultiHeadAttention(hidden_size, num_heads, dropout)
-            for _ in range(num_layers)
-        ])
-        
-        # Feed-forward networks
-        self.feed_forward = nn.ModuleList([
-            FeedForward(hidden_size, hidden_size * 4, dropout)
-            for _ in range(num_layers)
-        ])
-        
-        # Layer normalization
-        self.layer_norms1 = nn.ModuleList([
-            nn.LayerNorm(hidden_size) for _ in range(num_layers)
-        ])
-        self.layer_norms2 = nn.ModuleList([
-            nn.LayerNorm(hidden_size) for _ in range(num_layers)
-        ])
+        # Transformer layers (attention + feed-forward, post-norm), run by
+        # PyTorch's encoder so inference can take its fused fast path
+        self.encoder = nn.TransformerEncoder(
+            nn.TransformerEncoderLayer(
+                d_model=hidden_size,
+                nhead=num_heads,
+                dim_feedforward=hidden_size * 4,
+                dropout=dropout,
+                activation="relu",
+                batch_first=True,
+                norm_first=False
+            ),
+            num_layers=num_layers
+        )
+        self._register_load_state_dict_pre_hook(_remap_legacy_encoder_weights)
         
         # Output projection
         self.output_projection = nn.Linear(hidden_size, output_size)
-        
-        # Dropout
-        self.dropout_layer = nn.Dropout(dropout)
     
-    def forward(self, x: torch.Tensor, mask: Optional[torch.Tensor] = None) -> torch.Tensor:
+    def forward(
+        self,
+        x: torch.Tensor,
+        mask: Optional[torch.Tensor] = None,
+        padding_mask: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
         """
         Forward pass through TFT.
         
         Args:
             x: Input tensor of shape (batch_size, seq_len, input_size)
-            mask: Optional attention mask
+            mask: Optional attention mask of shape (seq_len, seq_len) or
+                (batch_size, seq_len, seq_len), boolean with True = attend
+                (0/1 masks are also accepted)
+            padding_mask: Optional (batch_size, seq_len) boolean mask,
+                True for real time steps and False for padding
             
         Returns:
             Output tensor of shape (batch_size, seq_len, output_size)
@@ -84,15 +124,19 @@ class TemporalFusionTransformer(nn.Module):
         # Add positional encoding
         x = self.pos_encoding(x)
         
+        # nn.TransformerEncoder masks use True = blocked, with per-sample
+        # attention masks repeated per head
+        if mask is not None:
+            if mask.dtype != torch.bool:
+                mask = mask != 0
+            if mask.dim() == 3:
+                mask = mask.repeat_interleave(self.num_heads, dim=0)
+            mask = ~mask
+        if padding_mask is not None:
+            padding_mask = ~padding_mask
+        
         # Apply transformer layers
-        for i in range(self.num_layers):
-            # Multi-head attention
-            attn_output, _ = self.attention_layers[i](x, x, x, mask)
-            x = self.layer_norms1[i](x + self.dropout_layer(attn_output))
-            
-            # Feed-forward network
-            ff_output = self.feed_forward[i](x)
-            x = self.layer_norms2[i](x + self.dropout_layer(ff_output))
+        x = self.encoder(x, mask=mask, src_key_padding_mask=padding_mask)
         
         # Output projection
         output = self.output_projection(x)
@@ -100,96 +144,6 @@ class TemporalFusionTransformer(nn.Module):
         return output
 
 
-class MultiHeadAttention(nn.Module):
-    """Multi-head attention mechanism."""
-    
-    def __init__(self, hidden_size: int, num_heads: int, dropout: float = 0.1):
-        super().__init__()
-        
-        self.hidden_size = hidden_size
-        self.num_heads = num_heads
-        self.head_size = hidden_size // num_heads
-        
-        assert hidden_size % num_heads == 0, "Hidden size must be divisible by num_heads"
-        
-        # Linear projections for Q, K, V
-        self.q_linear = nn.Linear(hidden_size, hidden_size)
-        self.k_linear = nn.Linear(hidden_size, hidden_size)
-        self.v_linear = nn.Linear(hidden_size, hidden_size)
-        
-        # Output projection
-        self.out_linear = nn.Linear(hidden_size, hidden_size)
-        
-        # Dropout
-        self.dropout = nn.Dropout(dropout)
-    
-    def forward(
-        self, 
-        query: torch.Tensor, 
-        key: torch.Tensor, 
-        value: torch.Tensor,
-        mask: Optional[torch.Tensor] = None
-    ) -> Tuple[torch.Tensor, torch.Tensor]:
-        """
-        Forward pass through multi-head attention.
-        
-        Args:
-            query: Query tensor
-            key: Key tensor
-            value: Value tensor
-            mask: Optional attention mask
-            
-        Returns:
-            Output tensor and attention weights
-        """
-        batch_size, seq_len, _ = query.size()
-        
-        # Linear projections
-        Q = self.q_linear(query)
-        K = self.k_linear(key)
-        V = self.v_linear(value)
-        
-        # Reshape for multi-head attention
-        Q = Q.view(batch_size, seq_len, self.num_heads, self.head_size).transpose(1, 2)
-        K = K.view(batch_size, seq_len, self.num_heads, self.head_size).transpose(1, 2)
-        V = V.view(batch_size, seq_len, self.num_heads, self.head_size).transpose(1, 2)
-        
-        # Scaled dot-product attention
-        scores = torch.matmul(Q, K.transpose(-2, -1)) / np.sqrt(self.head_size)
-        
-        if mask is not None:
-            scores = scores.masked_fill(mask == 0, -1e9)
-        
-        attention_weights = F.softmax(scores, dim=-1)
-        attention_weights = self.dropout(attention_weights)
-        
-        # Apply attention to values
-        context = torch.matmul(attention_weights, V)
-        
-        # Reshape and project output
-        context = context.transpose(1, 2).contiguous().view(
-            batch_size, seq_len, self.hidden_size
-        )
-        output = self.out_linear(context)
-        
-        return output, attention_weights
-
-
-class FeedForward(nn.Module):
-    """Feed-forward network."""
-    
-    def __init__(self, input_size: int, hidden_size: int, dropout: float = 0.1):
-        super().__init__()
-        
-        self.linear1 = nn.Linear(input_size, hidden_size)
-        self.linear2 = nn.Linear(hidden_size, input_size)
-        self.dropout = nn.Dropout(dropout)
-    
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        """Forward pass through feed-forward network."""
-        return self.linear2(self.dropout(F.relu(self.linear1(x))))
-
-
 class PositionalEncoding(nn.Module):
     """Positional encoding for transformer."""
     
@@ -208,12 +162,21 @@ class PositionalEncoding(nn.Module):
         pe[:, 0::2] = torch.sin(position * div_term)
         pe[:, 1::2] = torch.cos(position * div_term)
         
-        pe = pe.unsqueeze(0).transpose(0, 1)
+        # Shape (1, max_len, hidden) to broadcast over batch-first inputs
+        pe = pe.unsqueeze(0).contiguous()
         self.register_buffer('pe', pe)
+        self._register_load_state_dict_pre_hook(self._transpose_legacy_pe)
+    
+    @staticmethod
+    def _transpose_legacy_pe(state_dict: Dict[str, torch.Tensor], prefix: str, *args) -> None:
+        """Load-state-dict pre-hook converting the old (max_len, 1, hidden) buffer."""
+        pe = state_dict.get(f"{prefix}pe")
+        if pe is not None and pe.dim() == 3 and pe.size(1) == 1:
+            state_dict[f"{prefix}pe"] = pe.transpose(0, 1)
     
     def forward(self, x: torch.Tensor) -> torch.Tensor:
-        """Add positional encoding to input."""
-        x = x + self.pe[:x.size(0), :]
+        """Add positional encoding along the sequence dim of (batch, seq, hidden) input."""
+        x = x + self.pe[:, :x.size(1)].to(x.dtype)
         return self.dropout(x)
 
 
@@ -232,7 +195,8 @@ class FloodRiskModel(nn.Module):
         hidden_size: int = 64,
         num_heads: int = 4,
         num_layers: int = 3,
-        dropout: float = 0.1
+        dropout: float = 0.1,
+        compile: bool = False
     ):
         super().__init__()
         
@@ -250,6 +214,14 @@ class FloodRiskModel(nn.Module):
             output_size=hidden_size
         )
         
+        # Compile the encoder for inference. Module.compile() keeps the
+        # state dict keys unchanged and the model picklable (torch.save of the
+        # whole model reloads it uncompiled); compilation happens on the
+        # first call, so call .eval() before running the model
+        if compile:
+            # fullgraph=False: the encoder's fast-path checks may graph-break
+            self.tft_encoder.compile(mode="reduce-overhead", fullgraph=False)
+        
         # Decoder for prediction horizon
         self.decoder = nn.LSTM(
             input_size=hidden_size,
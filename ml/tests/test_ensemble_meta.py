@@ -0,0 +1,42 @@
+"""
+Tests for the ensemble meta-learners.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ml.models.ensemble_meta import MetaLearner, StackedMetaLearner  # noqa: E402
+
+HAZARDS = ["flood", "heat", "smoke"]
+INPUT, HIDDEN, LAYERS = 4, 8, 3
+
+
+def test_legacy_meta_learner_weights_load_into_stack():
+    """Per-hazard MetaLearner checkpoints load into the stacked tensors."""
+    torch.manual_seed(0)
+    legacy = torch.nn.ModuleDict({
+        hazard: MetaLearner(INPUT, HIDDEN, LAYERS) for hazard in HAZARDS
+    }).eval()
+    stacked = StackedMetaLearner(len(HAZARDS), INPUT, HIDDEN, LAYERS, names=HAZARDS).eval()
+
+    stacked.load_state_dict(legacy.state_dict())
+
+    x = torch.randn(5, len(HAZARDS), INPUT)
+    with torch.no_grad():
+        output = stacked(x)
+        expected = torch.stack(
+            [legacy[hazard](x[:, i]) for i, hazard in enumerate(HAZARDS)], dim=1
+        )
+    torch.testing.assert_close(output, expected)
+
+
+def test_stacked_state_dict_round_trips():
+    """Checkpoints in the stacked layout load unchanged."""
+    source = StackedMetaLearner(len(HAZARDS), INPUT, HIDDEN, LAYERS, names=HAZARDS)
+    target = StackedMetaLearner(len(HAZARDS), INPUT, HIDDEN, LAYERS, names=HAZARDS)
+
+    target.load_state_dict(source.state_dict())
+
+    for name, tensor in source.state_dict().items():
+        torch.testing.assert_close(target.state_dict()[name], tensor)
@@ -0,0 +1,67 @@
+"""
+Tests for ONNX export and the inference backends.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ml.models.smoke_seq import SmokeSeqModel  # noqa: E402
+from ml.utils.onnx_backend import (  # noqa: E402
+    SMOKE_OUTPUT_NAMES,
+    ONNXBackend,
+    TorchBackend,
+    export_smoke_model,
+    quantize_onnx_int8,
+)
+
+
+@pytest.fixture
+def smoke_model():
+    torch.manual_seed(0)
+    return SmokeSeqModel(hidden_size=16, num_layers=2, prediction_horizon=6).eval()
+
+
+def _smoke_inputs(batch):
+    return (torch.randn(batch, 5, 1), torch.randn(batch, 5, 8, 8, 4), torch.randn(batch, 5, 4, 3))
+
+
+def test_torch_backend_runs_model_in_eval_mode(smoke_model):
+    """TorchBackend returns the model's outputs without tracking gradients."""
+    backend = TorchBackend(smoke_model.train())
+    output = backend(*_smoke_inputs(2))
+
+    assert not backend.model.training
+    assert set(output) == set(SMOKE_OUTPUT_NAMES)
+    assert not output["risk_prob"].requires_grad
+
+
+def test_exported_smoke_model_matches_torch(smoke_model, tmp_path):
+    """The ONNX export has a dynamic batch and matches the PyTorch outputs."""
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    onnx_path = export_smoke_model(smoke_model, _smoke_inputs(2), tmp_path / "smoke.onnx")
+
+    inputs = _smoke_inputs(3)
+    expected = TorchBackend(smoke_model)(*inputs)
+    output = ONNXBackend(onnx_path, providers=["CPUExecutionProvider"])(*inputs)
+
+    assert list(output) == SMOKE_OUTPUT_NAMES
+    for name in SMOKE_OUTPUT_NAMES:
+        torch.testing.assert_close(output[name], expected[name], atol=1e-4, rtol=1e-4)
+
+
+def test_quantized_onnx_smoke_model_runs(smoke_model, tmp_path):
+    """INT8 weight quantization keeps the exported model runnable and close."""
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    onnx_path = export_smoke_model(smoke_model, _smoke_inputs(2), tmp_path / "smoke.onnx")
+    int8_path = quantize_onnx_int8(onnx_path, tmp_path / "smoke.int8.onnx")
+
+    inputs = _smoke_inputs(2)
+    expected = TorchBackend(smoke_model)(*inputs)
+    output = ONNXBackend(int8_path, providers=["CPUExecutionProvider"])(*inputs)
+
+    assert int8_path.exists()
+    for name in SMOKE_OUTPUT_NAMES:
+        torch.testing.assert_close(output[name], expected[name], atol=0.05, rtol=0.0)
@@ -0,0 +1,84 @@
+"""
+Tests for the quantization and inference-loading utilities.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ml.models.smoke_seq import SmokeSeqModel  # noqa: E402
+from ml.models.tft_flood import FloodRiskModel  # noqa: E402
+from ml.utils.quantization import (  # noqa: E402
+    convert_qat,
+    load_for_inference,
+    prepare_qat,
+    quantize_dynamic_int8,
+)
+
+FEATURES, SEQ = 6, 48
+
+
+@pytest.fixture
+def flood_inputs():
+    torch.manual_seed(0)
+    return torch.randn(2, SEQ, FEATURES)
+
+
+def test_dynamic_int8_flood_model_runs(flood_inputs):
+    """Dynamic INT8 keeps the encoder's Linears in float and stays close to FP32."""
+    torch.manual_seed(0)
+    model = FloodRiskModel(FEATURES).eval()
+    with torch.no_grad():
+        expected = model(flood_inputs)
+
+    quantized = quantize_dynamic_int8(model)
+    with torch.no_grad():
+        output = quantized(flood_inputs)
+
+    assert type(quantized.tft_encoder.encoder.layers[0].linear1) is torch.nn.Linear
+    assert type(quantized.risk_head) is not torch.nn.Linear
+    for key, value in expected.items():
+        torch.testing.assert_close(output[key], value, atol=0.05, rtol=0.0)
+
+
+def test_dynamic_int8_honours_skip(flood_inputs):
+    """Layers named in skip are left in floating point."""
+    quantized = quantize_dynamic_int8(FloodRiskModel(FEATURES).eval(), skip=["risk_head"])
+
+    assert type(quantized.risk_head) is torch.nn.Linear
+
+
+def test_qat_flood_model_converts_and_runs(flood_inputs):
+    """A QAT-prepared flood model trains a step, converts and runs inference."""
+    model = prepare_qat(FloodRiskModel(FEATURES))
+    model(flood_inputs)["risk_prob"].sum().backward()
+
+    convert_qat(model)
+    with torch.no_grad():
+        output = model(flood_inputs)
+
+    assert output["risk_prob"].shape == (2, 1)
+    assert type(model.tft_encoder.encoder.layers[0].linear1) is torch.nn.Linear
+
+
+def test_load_for_inference_quantizes_smoke_model(tmp_path):
+    """A smoke checkpoint loads, quantizes its Linear/LSTM layers and runs."""
+    torch.manual_seed(0)
+    model = SmokeSeqModel(hidden_size=16, num_layers=2, prediction_horizon=6).eval()
+    checkpoint = tmp_path / "smoke.pt"
+    torch.save(model.state_dict(), checkpoint)
+    inputs = (torch.randn(2, 5, 1), torch.randn(2, 5, 8, 8, 4), torch.randn(2, 5, 4, 3))
+    with torch.no_grad():
+        expected = model(*inputs)
+
+    quantized = load_for_inference(
+        SmokeSeqModel(hidden_size=16, num_layers=2, prediction_horizon=6),
+        checkpoint_path=checkpoint,
+        quantize=True
+    )
+    with torch.no_grad():
+        output = quantized(*inputs)
+
+    assert type(quantized.encoder.lstm) is not torch.nn.LSTM
+    for key, value in expected.items():
+        torch.testing.assert_close(output[key], value, atol=0.05, rtol=0.0)
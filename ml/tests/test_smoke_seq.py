@@ -0,0 +1,80 @@
+"""
+Tests for the smoke sequence model.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ml.models.smoke_seq import SmokeDecoder, SmokeSeqModel  # noqa: E402
+
+HIDDEN, LAYERS, HORIZON = 16, 2, 6
+SEQ, GRID, FIRES = 5, 8, 4
+
+
+def _smoke_inputs(batch=2):
+    torch.manual_seed(0)
+    return (
+        torch.randn(batch, SEQ, 1),
+        torch.randn(batch, SEQ, GRID, GRID, 4),
+        torch.randn(batch, SEQ, FIRES, 3),
+    )
+
+
+def test_decoder_ignores_padded_encoder_steps():
+    """Encoder rows past each sequence's length do not affect the output."""
+    torch.manual_seed(0)
+    decoder = SmokeDecoder(hidden_size=HIDDEN, num_layers=LAYERS, max_target_length=HORIZON).eval()
+    encoded = torch.randn(2, 5, HIDDEN)
+    hidden = (torch.randn(LAYERS, 2, HIDDEN), torch.randn(LAYERS, 2, HIDDEN))
+    lengths = torch.tensor([5, 3])
+
+    perturbed = encoded.clone()
+    perturbed[1, 3:] = torch.randn(2, HIDDEN)
+
+    with torch.no_grad():
+        output = decoder(encoded, hidden, HORIZON, lengths)
+        output_perturbed = decoder(perturbed, hidden, HORIZON, lengths)
+        output_trimmed = decoder(
+            encoded[1:, :3], (hidden[0][:, 1:], hidden[1][:, 1:]), HORIZON
+        )
+
+    assert output.shape == (2, HORIZON, 1)
+    torch.testing.assert_close(output, output_perturbed)
+    torch.testing.assert_close(output[1:], output_trimmed)
+
+
+@pytest.mark.parametrize("num_layers", [1, LAYERS])
+def test_model_forward_end_to_end(num_layers):
+    """The bidirectional encoder state seeds the decoder for any depth."""
+    model = SmokeSeqModel(
+        hidden_size=HIDDEN, num_layers=num_layers, prediction_horizon=HORIZON
+    ).eval()
+
+    with torch.no_grad():
+        output = model(*_smoke_inputs())
+
+    assert set(output) == {"risk_prob", "q10", "q50", "q90"}
+    for value in output.values():
+        assert value.shape == (2, 1)
+        assert torch.isfinite(value).all()
+
+
+def test_model_forward_with_lengths_and_fire_mask():
+    """Padded inputs with masked detections run through the full model."""
+    model = SmokeSeqModel(hidden_size=HIDDEN, num_layers=LAYERS, prediction_horizon=HORIZON).eval()
+    fire_mask = torch.ones(2, SEQ, FIRES, dtype=torch.bool)
+    fire_mask[1, :, 2:] = False
+
+    with torch.no_grad():
+        output = model(*_smoke_inputs(), fire_mask=fire_mask, lengths=torch.tensor([SEQ, 3]))
+
+    assert output["risk_prob"].shape == (2, 1)
+
+
+def test_encoder_state_matches_decoder_shape():
+    """Encoder (h, c) states are summed over directions to (num_layers, batch, hidden)."""
+    model = SmokeSeqModel(hidden_size=HIDDEN, num_layers=LAYERS, prediction_horizon=HORIZON)
+    _, (h, c) = model.encoder(torch.randn(2, SEQ, HIDDEN))
+
+    assert h.shape == c.shape == (LAYERS, 2, HIDDEN)
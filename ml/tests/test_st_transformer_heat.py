@@ -0,0 +1,103 @@
+"""
+Tests for the spatiotemporal heat transformer.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ml.models.st_transformer_heat import (  # noqa: E402
+    HeatRiskModel,
+    SpatialAttention,
+    SpatiotemporalTransformer,
+    TemporalAttention,
+    _as_attention_mask,
+)
+
+BATCH, SEQ, LOCATIONS, HIDDEN = 2, 3, 5, 8
+
+
+def test_per_sample_mask_expands_over_flattened_batch():
+    """A (batch, n, n) mask is repeated per sample, not per seq step."""
+    mask = torch.zeros(BATCH, LOCATIONS, LOCATIONS)
+    mask[1] = 1
+
+    flat = _as_attention_mask(mask, torch.Size((BATCH, SEQ)))
+
+    assert flat.shape == (BATCH * SEQ, 1, LOCATIONS, LOCATIONS)
+    assert flat.dtype == torch.bool
+    assert not flat[:SEQ].any()
+    assert flat[SEQ:].all()
+
+
+def test_spatial_attention_per_sample_mask_matches_unbatched():
+    """Each sample's output only depends on that sample's mask."""
+    torch.manual_seed(0)
+    attention = SpatialAttention(HIDDEN, num_heads=2).eval()
+    x = torch.randn(BATCH, SEQ, LOCATIONS, HIDDEN)
+    mask = torch.rand(BATCH, LOCATIONS, LOCATIONS) > 0.5
+    mask |= torch.eye(LOCATIONS, dtype=torch.bool)
+
+    with torch.no_grad():
+        output = attention(x, mask)
+        expected = torch.stack([attention(x[b], mask[b]) for b in range(BATCH)])
+
+    assert output.shape == (BATCH, SEQ, LOCATIONS, HIDDEN)
+    torch.testing.assert_close(output, expected)
+
+
+def test_temporal_attention_accepts_transposed_input():
+    """Temporal attention runs on the (batch, locations, seq) transpose view."""
+    torch.manual_seed(0)
+    attention = TemporalAttention(HIDDEN, num_heads=2, causal=True).eval()
+    x = torch.randn(BATCH, SEQ, LOCATIONS, HIDDEN)
+    mask = torch.ones(BATCH, SEQ, SEQ, dtype=torch.bool)
+
+    with torch.no_grad():
+        masked = attention(x.transpose(1, 2), mask)
+        unmasked = attention(x.transpose(1, 2).contiguous())
+
+    assert masked.shape == (BATCH, LOCATIONS, SEQ, HIDDEN)
+    torch.testing.assert_close(masked, unmasked)
+
+
+def test_transformer_output_shape_with_per_sample_masks():
+    """Masks are flattened per attention axis when batch differs from seq."""
+    model = SpatiotemporalTransformer(feature_size=4, hidden_size=HIDDEN, num_heads=2, num_layers=2)
+    x = torch.randn(BATCH, SEQ, LOCATIONS, 4)
+    spatial_mask = torch.ones(BATCH, LOCATIONS, LOCATIONS)
+    temporal_mask = torch.ones(BATCH, SEQ, SEQ)
+
+    output = model(x, spatial_mask, temporal_mask)
+
+    assert output.shape == (BATCH, SEQ, LOCATIONS, 1)
+
+
+@pytest.mark.parametrize("attention_cls", [SpatialAttention, TemporalAttention])
+def test_legacy_split_qkv_weights_merge_on_load(attention_cls):
+    """Checkpoints with separate q/k/v_linear weights load into the fused qkv."""
+    torch.manual_seed(0)
+    source = attention_cls(HIDDEN, num_heads=2).eval()
+    target = attention_cls(HIDDEN, num_heads=2).eval()
+    legacy = source.state_dict()
+    for param in ("weight", "bias"):
+        q, k, v = legacy.pop(f"qkv.{param}").chunk(3, dim=0)
+        legacy.update({f"q_linear.{param}": q, f"k_linear.{param}": k, f"v_linear.{param}": v})
+
+    target.load_state_dict(legacy)
+
+    x = torch.randn(BATCH, SEQ, LOCATIONS, HIDDEN)
+    with torch.no_grad():
+        torch.testing.assert_close(target(x), source(x))
+
+
+def test_compiled_model_can_be_pickled(tmp_path):
+    """torch.save of a whole compile=True model works and reloads uncompiled."""
+    model = HeatRiskModel(feature_size=4, hidden_size=HIDDEN, num_heads=2, num_layers=1, compile=True)
+    path = tmp_path / "heat.pt"
+
+    torch.save(model, path)
+    loaded = torch.load(path, weights_only=False)
+
+    assert loaded.st_transformer._compiled_call_impl is None
+    assert loaded.state_dict().keys() == model.state_dict().keys()
@@ -0,0 +1,67 @@
+"""
+Tests for the flood Temporal Fusion Transformer.
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from ml.models.tft_flood import (  # noqa: E402
+    FloodRiskModel,
+    _LEGACY_ENCODER_KEYS,
+    PositionalEncoding,
+    TemporalFusionTransformer,
+)
+
+INPUT, HIDDEN, HEADS, LAYERS = 5, 16, 4, 2
+
+
+def _legacy_state_dict(model):
+    """Rewrite a model's state dict into the pre-TransformerEncoder layout."""
+    state_dict = model.state_dict()
+    for i in range(LAYERS):
+        for old, new in _LEGACY_ENCODER_KEYS.items():
+            state_dict[old.format(i)] = state_dict.pop(new.format(i))
+        for param in ("weight", "bias"):
+            q, k, v = state_dict.pop(f"attention_layers.{i}.qkv.{param}").chunk(3, dim=0)
+            state_dict[f"attention_layers.{i}.q_linear.{param}"] = q
+            state_dict[f"attention_layers.{i}.k_linear.{param}"] = k
+            state_dict[f"attention_layers.{i}.v_linear.{param}"] = v
+    return state_dict
+
+
+def test_legacy_layer_weights_remap_onto_encoder():
+    """Per-layer ModuleList checkpoints with split q/k/v load into the encoder."""
+    torch.manual_seed(0)
+    source = TemporalFusionTransformer(INPUT, HIDDEN, HEADS, LAYERS).eval()
+    target = TemporalFusionTransformer(INPUT, HIDDEN, HEADS, LAYERS).eval()
+    legacy = _legacy_state_dict(source)
+    assert not any(key.startswith("encoder.") for key in legacy)
+
+    target.load_state_dict(legacy)
+
+    x = torch.randn(2, 7, INPUT)
+    with torch.no_grad():
+        torch.testing.assert_close(target(x), source(x))
+
+
+def test_legacy_positional_encoding_is_transposed():
+    """The old (max_len, 1, hidden) pe buffer loads as (1, max_len, hidden)."""
+    encoding = PositionalEncoding(HIDDEN, dropout=0.0)
+    pe = encoding.pe.clone()
+
+    encoding.load_state_dict({"pe": pe.transpose(0, 1).contiguous()})
+
+    torch.testing.assert_close(encoding.pe, pe)
+
+
+def test_compiled_model_can_be_pickled(tmp_path):
+    """torch.save of a whole compile=True model works and reloads uncompiled."""
+    model = FloodRiskModel(INPUT, hidden_size=HIDDEN, num_heads=HEADS, num_layers=LAYERS, compile=True)
+    path = tmp_path / "flood.pt"
+
+    torch.save(model, path)
+    loaded = torch.load(path, weights_only=False)
+
+    assert loaded.tft_encoder._compiled_call_impl is None
+    assert loaded.state_dict().keys() == model.state_dict().keys()
@@ -0,0 +1,148 @@
+"""
+ONNX export and ONNX Runtime serving for Climate Risk Lens models.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+SMOKE_INPUT_NAMES = ["pm25_data", "wind_data", "fire_data"]
+SMOKE_OUTPUT_NAMES = ["risk_prob", "q10", "q50", "q90"]
+
+
+class Backend(ABC):
+    """
+    Inference backend with the same call signature as the model's forward.
+    
+    Returns a dictionary of output tensors keyed by output name.
+    """
+    
+    @abstractmethod
+    def __call__(self, *inputs: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """Run inference on the model inputs."""
+
+
+class TorchBackend(Backend):
+    """Run a PyTorch model directly."""
+    
+    def __init__(self, model: nn.Module):
+        self.model = model.eval()
+    
+    @torch.inference_mode()
+    def __call__(self, *inputs: torch.Tensor) -> Dict[str, torch.Tensor]:
+        return self.model(*inputs)
+
+
+class ONNXBackend(Backend):
+    """Run an exported ONNX model with ONNX Runtime."""
+    
+    def __init__(self, onnx_path: Union[str, Path], providers: Optional[List[str]] = None):
+        """
+        Create an ONNX Runtime session with full graph optimizations.
+        
+        Args:
+            onnx_path: Path to the exported model
+            providers: Execution providers in priority order; defaults to
+                CUDA when available, then CPU
+        """
+        import onnxruntime as ort
+        
+        if providers is None:
+            available = ort.get_available_providers()
+            providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        self.session = ort.InferenceSession(str(onnx_path), sess_options=options, providers=providers)
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.output_names = [o.name for o in self.session.get_outputs()]
+    
+    def __call__(self, *inputs: torch.Tensor) -> Dict[str, torch.Tensor]:
+        feeds = {
+            name: tensor.detach().cpu().numpy().astype(np.float32, copy=False)
+            for name, tensor in zip(self.input_names, inputs)
+        }
+        outputs = self.session.run(self.output_names, feeds)
+        return {name: torch.from_numpy(value) for name, value in zip(self.output_names, outputs)}
+
+
+def export_onnx(
+    model: nn.Module,
+    sample_inputs: Tuple[torch.Tensor, ...],
+    onnx_path: Union[str, Path],
+    input_names: Sequence[str],
+    output_names: Sequence[str],
+    opset_version: int = 17
+) -> Path:
+    """
+    Export a model to ONNX with a dynamic batch dimension.
+    
+    Args:
+        model: Trained model
+        sample_inputs: Example inputs used for tracing
+        onnx_path: Output path
+        input_names: Names for the model inputs
+        output_names: Names for the model outputs, in return order
+        opset_version: ONNX opset
+        
+    Returns:
+        Path to the exported model
+    """
+    onnx_path = Path(onnx_path)
+    dynamic_axes = {name: {0: "batch"} for name in [*input_names, *output_names]}
+    
+    model.eval()
+    torch.onnx.export(
+        model,
+        sample_inputs,
+        str(onnx_path),
+        input_names=list(input_names),
+        output_names=list(output_names),
+        dynamic_axes=dynamic_axes,
+        opset_version=opset_version,
+        do_constant_folding=True
+    )
+    
+    return onnx_path
+
+
+def export_smoke_model(
+    model: nn.Module,
+    sample_inputs: Tuple[torch.Tensor, torch.Tensor, torch.Tensor],
+    onnx_path: Union[str, Path] = "smoke.onnx"
+) -> Path:
+    """
+    Export a SmokeSeqModel to ONNX.
+    
+    Args:
+        model: Trained SmokeSeqModel
+        sample_inputs: Example (pm25_data, wind_data, fire_data)
+        onnx_path: Output path
+        
+    Returns:
+        Path to the exported model
+    """
+    return export_onnx(model, sample_inputs, onnx_path, SMOKE_INPUT_NAMES, SMOKE_OUTPUT_NAMES)
+
+
+def quantize_onnx_int8(onnx_path: Union[str, Path], output_path: Union[str, Path]) -> Path:
+    """
+    Dynamically quantize an exported model's weights to INT8 for CPU serving.
+    
+    Args:
+        onnx_path: FP32 ONNX model
+        output_path: Where to write the quantized model
+        
+    Returns:
+        Path to the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantize_dynamic(str(onnx_path), str(output_path), weight_type=QuantType.QInt8)
+    
+    return Path(output_path)
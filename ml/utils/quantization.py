@@ -0,0 +1,155 @@
+"""
+Quantization and compilation utilities for serving Climate Risk Lens models.
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional, Set, Tuple, Type, Union
+import torch
+import torch.nn as nn
+
+
+# Layers replaced by INT8 dynamic-quantized equivalents
+DYNAMIC_QUANT_LAYERS: Set[Type[nn.Module]] = {nn.Linear, nn.LSTM}
+
+# Modules that read their child Linears' weights directly (e.g. the fused
+# nn.TransformerEncoder fast path), so those Linears must stay plain nn.Linear
+FLOAT_LINEAR_PARENTS: Tuple[Type[nn.Module], ...] = (
+    nn.TransformerEncoderLayer,
+    nn.TransformerDecoderLayer,
+)
+
+
+def _float_linear_names(model: nn.Module) -> Set[str]:
+    """Get qualified names of Linear layers owned by FLOAT_LINEAR_PARENTS."""
+    return {
+        f"{name}.{child_name}" if name else child_name
+        for name, module in model.named_modules()
+        if isinstance(module, FLOAT_LINEAR_PARENTS)
+        for child_name, child in module.named_children()
+        if type(child) is nn.Linear
+    }
+
+
+def quantize_dynamic_int8(model: nn.Module, skip: Iterable[str] = ()) -> nn.Module:
+    """
+    Apply dynamic INT8 quantization to a model's Linear and LSTM layers.
+    
+    Weights are quantized ahead of time and activations on the fly, so no
+    calibration data is needed. Layers built from raw parameters (such as
+    StackedMetaLearner) and the feed-forward Linears of PyTorch Transformer
+    layers are left in floating point.
+    
+    Args:
+        model: Trained model in eval mode
+        skip: Qualified names of further layers to keep in floating point
+        
+    Returns:
+        Quantized copy of the model
+    """
+    qconfig_spec = {
+        layer: torch.ao.quantization.default_dynamic_qconfig
+        for layer in DYNAMIC_QUANT_LAYERS
+    }
+    # Name entries override type entries; a None qconfig keeps the layer as is
+    qconfig_spec.update({name: None for name in _float_linear_names(model) | set(skip)})
+    
+    return torch.ao.quantization.quantize_dynamic(model, qconfig_spec, dtype=torch.qint8)
+
+
+def prepare_qat(
+    model: nn.Module,
+    backend: str = "x86",
+    skip: Iterable[str] = ()
+) -> nn.Module:
+    """
+    Prepare a model for quantization-aware fine-tuning.
+    
+    Each nn.Linear leaf is wrapped in QuantStub/DeQuantStub and swapped
+    for a fake-quantized QAT Linear, so fine-tuning learns weights that
+    hold up once converted to INT8. Everything else (LSTMs, attention,
+    the feed-forward Linears of PyTorch Transformer layers, calibration
+    lookups) stays in floating point, which lets a CalibrationLayer absorb
+    any remaining systematic quantization bias.
+    
+    Args:
+        model: Trained FP32 model, e.g. CalibratedEnsembleModel
+        backend: Quantized engine to target ("x86", "fbgemm" or "qnnpack")
+        skip: Qualified names of Linear layers to keep in floating point
+        
+    Returns:
+        The same model, prepared in place and set to train mode
+    """
+    skip = set(skip) | _float_linear_names(model)
+    qconfig = torch.ao.quantization.get_default_qat_qconfig(backend)
+    
+    linear_names = [
+        name for name, module in model.named_modules()
+        if type(module) is nn.Linear and name and name not in skip
+    ]
+    for name in linear_names:
+        parent_name, _, child_name = name.rpartition(".")
+        parent = model.get_submodule(parent_name)
+        wrapper = torch.ao.quantization.QuantWrapper(getattr(parent, child_name))
+        wrapper.qconfig = qconfig
+        setattr(parent, child_name, wrapper)
+    
+    model.train()
+    torch.ao.quantization.prepare_qat(model, inplace=True)
+    
+    return model
+
+
+def convert_qat(model: nn.Module) -> nn.Module:
+    """
+    Convert a QAT fine-tuned model to INT8 for inference.
+    
+    Args:
+        model: Model prepared with prepare_qat() and fine-tuned
+        
+    Returns:
+        The same model, converted in place and set to eval mode
+    """
+    model.eval()
+    torch.ao.quantization.convert(model, inplace=True)
+    
+    return model
+
+
+def load_for_inference(
+    model: nn.Module,
+    checkpoint_path: Optional[Union[str, Path]] = None,
+    quantize: bool = False,
+    compile: bool = False
+) -> nn.Module:
+    """
+    Prepare a model for inference.
+    
+    Training stays in FP32; quantization is only applied here, after the
+    trained weights are loaded.
+    
+    Args:
+        model: Model instance, e.g. EnsembleModel or SmokeSeqModel
+        checkpoint_path: Optional state dict to load
+        quantize: Whether to apply dynamic INT8 quantization (CPU)
+        compile: Whether to wrap the model with torch.compile, specialized
+            to fixed input shapes; the first call per shape pays the
+            compilation cost
+        
+    Returns:
+        Model ready for inference
+    """
+    if checkpoint_path is not None:
+        state_dict = torch.load(checkpoint_path, map_location="cpu")
+        model.load_state_dict(state_dict)
+    
+    model.eval()
+    
+    if quantize:
+        model = quantize_dynamic_int8(model)
+    
+    if compile:
+        # Dict inputs/outputs (EnsembleModel) fall back to Python between
+        # compiled tensor subgraphs rather than failing
+        model = torch.compile(model, mode="reduce-overhead", dynamic=False, fullgraph=False)
+    
+    return model
@@ -16,6 +16,7 @@ sys.path.append(str(project_root / "backend"))
 
 from app.db.database import AsyncSessionLocal
 from app.db.models import HazardPrediction
+from app.geo.grid import grid_system
 from app.geo.tiles import vector_tile_builder, tile_system
 from sqlalchemy import select
 
@@ -71,7 +72,7 @@ async def build_tiles():
                             if is_grid_in_tile(grid_id, tile_bounds):
                                 for pred in preds:
                                     tile_predictions.append({
-                                        'grid_id': pred.grid_id,
+                                        'grid_id': grid_system.format(pred.grid_id),
                                         'hazard_type': pred.type,
                                         'p_risk': pred.p_risk,
                                         'q10': pred.q10,
@@ -89,9 +90,9 @@ async def build_tiles():
                         tile_data = vector_tile_builder.build_risk_tile(coord, tile_predictions)
                         
                         # Save tile (in production, save to MinIO or file system)
-                        tile_path = Path(f"tiles/{zoom}/{tile_x}/{tile_y}.json")
+                        tile_path = Path(f"tiles/{zoom}/{tile_x}/{tile_y}.pbf")
                         tile_path.parent.mkdir(parents=True, exist_ok=True)
-                        tile_path.write_text(tile_data.decode('utf-8'))
+                        tile_path.write_bytes(tile_data)
                         
                         tiles_generated += 1
             
@@ -102,26 +103,19 @@ async def build_tiles():
             raise
 
 
-def is_grid_in_tile(grid_id: str, tile_bounds: tuple) -> bool:
+def is_grid_in_tile(grid_id: int, tile_bounds: tuple) -> bool:
     """
     Check if a grid cell intersects with a tile.
     
     Args:
-        grid_id: Grid ID string
+        grid_id: Grid ID
         tile_bounds: Tile bounds (min_lon, min_lat, max_lon, max_lat)
         
     Returns:
         True if grid intersects with tile
     """
     try:
-        # Parse grid ID
-        grid_lat, grid_lon = map(int, grid_id.split("_"))
-        
-        # Convert to approximate coordinates
-        grid_min_lat = grid_lat
-        grid_max_lat = grid_lat + 1
-        grid_min_lon = grid_lon
-        grid_max_lon = grid_lon + 1
+        grid_min_lon, grid_min_lat, grid_max_lon, grid_max_lat = grid_system.grid_id_to_bounds(grid_id)
         
         # Check intersection
         min_lon, min_lat, max_lon, max_lat = tile_bounds
@@ -163,9 +157,9 @@ async def generate_demo_tiles():
     tile_data = vector_tile_builder.build_risk_tile(coord, demo_predictions)
     
     # Save demo tile
-    tile_path = Path("tiles/demo.json")
+    tile_path = Path("tiles/demo.pbf")
     tile_path.parent.mkdir(parents=True, exist_ok=True)
-    tile_path.write_text(tile_data.decode('utf-8'))
+    tile_path.write_bytes(tile_data)
     
     print(f"✓ Generated demo tile with {len(demo_predictions)} predictions")
 
@@ -16,6 +16,9 @@ sys.path.append(str(project_root / "backend"))
 
 from app.db.database import AsyncSessionLocal
 from app.db.models import User, Organization, Site, HazardPrediction, Telemetry
+from app.db.partitions import ensure_hazard_partitions
+from app.redis import invalidate_risk_cache
+from app.utils.ids import uuid7
 from app.geo.grid import grid_system
 from sqlalchemy import text
 
@@ -25,6 +28,9 @@ async def seed_demo_data():
     
     async with AsyncSessionLocal() as session:
         try:
+            # Make sure today's hazards partition exists
+            await ensure_hazard_partitions(session, datetime.utcnow().date(), 1)
+            
             # Create demo organization
             org = Organization(
                 id=uuid.uuid4(),
@@ -63,7 +69,7 @@ async def seed_demo_data():
                     org_id=org.id,
                     name=site_data["name"],
                     geom=f"POINT({site_data['lon']} {site_data['lat']})",
-                    metadata={"demo": True, "city": "San Francisco"}
+                    meta={"demo": True, "city": "San Francisco"}
                 )
                 session.add(site)
                 sites.append(site)
@@ -72,25 +78,29 @@ async def seed_demo_data():
             
             # Create demo hazard predictions
             hazards = ["flood", "heat", "smoke", "pm25"]
-            grid_ids = ["37_-122", "37_-121", "37_-123", "38_-122", "36_-122"]
+            grid_ids = [
+                grid_system.encode(lat_idx, lon_idx)
+                for lat_idx, lon_idx in [(37, -122), (37, -121), (37, -123), (38, -122), (36, -122)]
+            ]
             
+            predictions = []
             for grid_id in grid_ids:
                 for hazard in hazards:
                     for hours_ahead in [6, 12, 24, 48, 72]:
-                        prediction = HazardPrediction(
-                            hazard_id=uuid.uuid4(),
-                            type=hazard,
-                            issued_at=datetime.utcnow(),
-                            horizon_minutes=hours_ahead * 60,
-                            grid_id=grid_id,
-                            p_risk=random.uniform(0.1, 0.8),
-                            q10=random.uniform(0.05, 0.3),
-                            q50=random.uniform(0.2, 0.6),
-                            q90=random.uniform(0.4, 0.9),
-                            model_version="demo-model-v1",
-                            data_time=datetime.utcnow() - timedelta(minutes=15)
-                        )
-                        session.add(prediction)
+                        predictions.append({
+                            "hazard_id": uuid7(),
+                            "type": hazard,
+                            "issued_at": datetime.utcnow(),
+                            "horizon_minutes": hours_ahead * 60,
+                            "grid_id": grid_id,
+                            "p_risk": random.uniform(0.1, 0.8),
+                            "q10": random.uniform(0.05, 0.3),
+                            "q50": random.uniform(0.2, 0.6),
+                            "q90": random.uniform(0.4, 0.9),
+                            "model_version": "demo-model-v1",
+                            "data_time": datetime.utcnow() - timedelta(minutes=15)
+                        })
+            await HazardPrediction.bulk_insert(session, predictions)
             
             # Create demo telemetry data
             sources = ["NOAA", "USGS", "EPA AirNow", "NASA FIRMS"]
@@ -98,7 +108,7 @@ async def seed_demo_data():
             for source in sources:
                 for i in range(10):
                     telemetry = Telemetry(
-                        id=uuid.uuid4(),
+                        id=uuid7(),
                         source=source,
                         ts=datetime.utcnow() - timedelta(minutes=i*5),
                         geom=f"POINT({-122.4194 + random.uniform(-0.1, 0.1)} {37.7749 + random.uniform(-0.1, 0.1)})",
@@ -115,6 +125,12 @@ async def seed_demo_data():
             # Commit all changes
             await session.commit()
             
+            # Cached risk responses for the seeded cells are now stale
+            try:
+                await invalidate_risk_cache(grid_ids)
+            except Exception as e:
+                print(f"Warning: could not invalidate risk cache: {e}")
+            
             print("✓ Demo data seeded successfully!")
             print(f"  - Organization: {org.name}")
             print(f"  - User: {user.email}")